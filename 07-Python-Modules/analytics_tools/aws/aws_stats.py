@@ -1,6 +1,166 @@
-# analytics_tools/stats.py
+# analytics_tools/aws/aws_stats.py
+"""
+Statistics of a numeric column over every object under an S3 prefix.
+
+    from analytics_tools.aws import aws_stats
+    stats = aws_stats.bucket_stats("rides", "fares/2024/", column="fare", workers=32)
+    stats.mean, stats.std, stats.quantile(0.99)
+
+Objects are listed with a paginator and read concurrently by a bounded
+thread pool, so throughput grows with `workers` instead of being limited
+by the latency of one request at a time. Each object is reduced to a
+mergeable RunningStats (see analytics_tools.stats) while it is read, and
+the partial results are merged as they complete:
+
+- Parquet: ranged GETs through a seekable file object. The footer is read
+  first, then only the requested column's chunks, row group by row group.
+- CSV (optionally .gz): streamed from the response body in chunks.
+- anything else: one number per line, streamed.
+
+The boto3 client can be passed in, e.g. for MinIO or moto in tests:
+
+    client = boto3.client("s3", endpoint_url="http://localhost:9000")
+    aws_stats.bucket_stats("bucket", "prefix/", "fare", client=client)
+"""
+
+import io
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+from analytics_tools.stats import RunningStats, calculate_mean
+
+DEFAULT_WORKERS = 16
+READ_BUFFER = 1 << 20    # bytes per ranged GET for small reads (footer, headers)
+CSV_CHUNK_ROWS = 100_000
+
+
 def aws_calculate_mean(data):
-    return sum(data) / len(data)
+    return calculate_mean(data)
+
+
+def aws_total_mean(partials):
+    """
+    Mean over shards: `partials` are RunningStats of each shard, or the shards' values.
+    Like calculate_mean(), raise ZeroDivisionError if there are no values.
+    """
+    total = RunningStats(quantiles=False)
+    for partial in partials:
+        total.merge(partial if isinstance(partial, RunningStats) else RunningStats(quantiles=False).update(partial))
+    if total.count == 0:
+        raise ZeroDivisionError("mean of no data")
+    return total.mean
+
+
+# ---------- S3 access ----------
+def make_client(workers=DEFAULT_WORKERS, **client_kwargs):
+    """An S3 client with a connection per worker (boto3 clients are thread-safe)."""
+    import boto3
+    from botocore.config import Config
+    return boto3.client("s3", config=Config(max_pool_connections=max(workers, 10)), **client_kwargs)
+
+
+def list_objects(client, bucket, prefix=""):
+    """Yield (key, size) of the non-empty objects under `prefix`."""
+    for page in client.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix):
+        for item in page.get("Contents", []):
+            if item["Size"] > 0:
+                yield item["Key"], item["Size"]
+
+
+class S3RangeFile(io.RawIOBase):
+    """Seekable read-only file over an S3 object; every read is a ranged GET."""
+
+    def __init__(self, client, bucket, key, size=None):
+        self.client, self.bucket, self.key = client, bucket, key
+        self.size = size if size is not None else client.head_object(Bucket=bucket, Key=key)["ContentLength"]
+        self.position = 0
+        self.requests = 0  # ranged GETs made
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence]
+        self.position = max(0, base + offset)
+        return self.position
+
+    def readinto(self, buffer):
+        end = min(self.position + len(buffer), self.size)
+        if end <= self.position:
+            return 0
+        response = self.client.get_object(Bucket=self.bucket, Key=self.key,
+                                          Range=f"bytes={self.position}-{end - 1}")
+        data = response["Body"].read()
+        self.requests += 1
+        buffer[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+
+# ---------- Per-object reducers ----------
+def parquet_stats(client, bucket, key, size, column, quantiles=True):
+    import pyarrow.parquet as pq
+
+    stats = RunningStats(quantiles)
+    with io.BufferedReader(S3RangeFile(client, bucket, key, size), READ_BUFFER) as f:
+        parquet = pq.ParquetFile(f)  # reads the footer only
+        for group in range(parquet.num_row_groups):
+            values = parquet.read_row_group(group, columns=[column]).column(0)
+            stats.update(values.to_numpy(zero_copy_only=False).astype(np.float64))
+    return stats
+
+
+def csv_stats(client, bucket, key, column, quantiles=True):
+    import pandas as pd
+
+    stats = RunningStats(quantiles)
+    body = client.get_object(Bucket=bucket, Key=key)["Body"]
+    compression = "gzip" if key.endswith(".gz") else None
+    with pd.read_csv(body, usecols=[column], chunksize=CSV_CHUNK_ROWS, compression=compression) as reader:
+        for chunk in reader:
+            stats.update(pd.to_numeric(chunk[column], errors="coerce").to_numpy(np.float64))
+    return stats
+
+
+def lines_stats(client, bucket, key, quantiles=True):
+    stats = RunningStats(quantiles)
+    lines = client.get_object(Bucket=bucket, Key=key)["Body"].iter_lines()
+    stats.update(float(line) for line in lines if line.strip())
+    return stats
+
+
+def object_stats(client, bucket, key, size, column, quantiles=True):
+    name = key.lower()
+    if name.endswith(".parquet"):
+        return parquet_stats(client, bucket, key, size, column, quantiles)
+    if name.endswith((".csv", ".csv.gz")):
+        return csv_stats(client, bucket, key, column, quantiles)
+    return lines_stats(client, bucket, key, quantiles)
+
 
-def aws_total_mean(data):
-    return sum(data) / len(data)
\ No newline at end of file
+# ---------- Whole prefix ----------
+def bucket_stats(bucket, prefix="", column=None, client=None, workers=DEFAULT_WORKERS, quantiles=True,
+                 per_object=None):
+    """
+    RunningStats of `column` over all objects under `prefix`, read by
+    `workers` threads. Pass a dict as `per_object` to also get each
+    object's own stats (they are merged into the total either way).
+    """
+    client = client or make_client(workers)
+    total = RunningStats(quantiles)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(object_stats, client, bucket, key, size, column, quantiles): key
+                   for key, size in list_objects(client, bucket, prefix)}
+        for future in as_completed(futures):
+            stats = future.result()
+            if per_object is not None:
+                per_object[futures[future]] = stats
+            total.merge(stats)
+    return total
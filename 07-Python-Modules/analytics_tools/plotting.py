@@ -1,3 +1,154 @@
 # analytics_tools/plotting.py
+"""
+Chart specs from pre-aggregated data, and a cache of built figures.
+
+    spec = bar_chart(counts.index, counts.values, "Rides per Hour", x_title="Hour")
+    cache = ChartCache(max_bytes=64 << 20)
+    fig = cache.figure((dataset_version, (start, end), "rides_by_hour"),
+                       lambda: bar_chart(*query_rides_by_hour(), "Rides per Hour"))
+
+The builders take small, already aggregated series (counts per hour,
+histogram bins, top-N lists) and return Plotly figure JSON as plain dicts,
+which is much cheaper than running plotly.express on a frame. ChartCache
+keeps the built plotly Figures in an LRU keyed by (dataset version,
+filter, chart id), evicting the least recently used ones when the total
+JSON size goes over max_bytes. On a hit neither the aggregation nor the
+figure is computed again. A new dataset version (new upload, new ingest
+generation) gives new keys, so stale figures simply age out.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+MAX_CACHE_BYTES = 64 << 20
+
+
+# ---------- Spec builders (Plotly figure JSON) ----------
+def values(data):
+    """JSON-ready list from a list, NumPy array or pandas Series/Index (dates become ISO strings)."""
+    if getattr(getattr(data, "dtype", None), "kind", None) == "M":
+        return [str(value) for value in data]
+    if hasattr(data, "tolist"):
+        return data.tolist()
+    return list(data)
+
+
+def layout(title, x_title=None, y_title=None):
+    return {"title": {"text": title}, "xaxis": {"title": {"text": x_title}}, "yaxis": {"title": {"text": y_title}}}
+
+
+def bar_chart(x, y, title, x_title=None, y_title=None, horizontal=False, widths=None, errors=None):
+    """
+    Bars of y per x; horizontal bars are sorted so the largest is on top.
+    `errors` draws one-sided error bars up to y + error (e.g. a count's upper bound).
+    """
+    trace = {"type": "bar", "x": values(x), "y": values(y)}
+    extra = {}
+    if horizontal:
+        trace = {"type": "bar", "x": values(y), "y": values(x), "orientation": "h"}
+        extra["yaxis"] = {"title": {"text": x_title}, "categoryorder": "total ascending"}
+        x_title, y_title = y_title, None
+    if errors is not None:
+        error_bars = {"type": "data", "array": values(errors), "symmetric": False, "arrayminus": [0] * len(errors)}
+        trace["error_x" if horizontal else "error_y"] = error_bars
+    if widths is not None:
+        trace["width"] = values(widths)
+        extra["bargap"] = 0
+    spec_layout = layout(title, x_title, y_title)
+    spec_layout.update(extra)
+    return {"data": [trace], "layout": spec_layout}
+
+
+def line_chart(x, y, title, x_title=None, y_title=None):
+    return {"data": [{"type": "scatter", "mode": "lines", "x": values(x), "y": values(y)}],
+            "layout": layout(title, x_title, y_title)}
+
+
+def pie_chart(names, counts, title):
+    return {"data": [{"type": "pie", "labels": values(names), "values": values(counts)}],
+            "layout": {"title": {"text": title}}}
+
+
+def histogram_chart(bin_start, bin_end, counts, title, x_title=None):
+    """Histogram from bin edges and counts (bars as wide as their bins)."""
+    bin_start, bin_end = np.asarray(bin_start, dtype=float), np.asarray(bin_end, dtype=float)
+    return bar_chart((bin_start + bin_end) / 2, counts, title, x_title, "count", widths=bin_end - bin_start)
+
+
+def scatter_chart(x, y, title, x_title=None, y_title=None, line=None, line_name=None):
+    """Points, plus an optional line given as ((x0, x1), (y0, y1))."""
+    data = [{"type": "scattergl", "mode": "markers", "x": values(x), "y": values(y), "showlegend": False}]
+    if line is not None:
+        data.append({"type": "scatter", "mode": "lines", "x": list(line[0]), "y": list(line[1]),
+                     "name": line_name})
+    return {"data": data, "layout": layout(title, x_title, y_title)}
+
+
 def create_bar_chart(data):
-    return "Bar chart created!"
\ No newline at end of file
+    """Bar chart spec of a list of values."""
+    return bar_chart(range(len(data)), data, "Bar chart")
+
+
+# ---------- Cache ----------
+def spec_size(spec):
+    return len(json.dumps(spec, separators=(",", ":")))
+
+
+def to_figure(spec):
+    # Validated once here; Streamlit then reuses the Figure without validating it again
+    import plotly.graph_objects as go
+    return go.Figure(spec)
+
+
+class ChartCache:
+    """Thread-safe LRU of built figures, bounded by their total JSON size."""
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES, make_figure=to_figure):
+        self.max_bytes = max_bytes
+        self.make_figure = make_figure
+        self.entries = OrderedDict()  # key -> (figure, size)
+        self.bytes = 0
+        self.hits = self.misses = 0
+        self.lock = threading.Lock()
+
+    def figure(self, key, build):
+        """
+        The figure cached under `key`, or make_figure(build()) stored under
+        it. build() may return None (nothing to chart): that is not cached.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        spec = build()  # outside the lock: other sessions keep using the cache
+        if spec is None:
+            return None
+        figure = self.make_figure(spec)
+        self.put(key, figure, spec_size(spec))
+        return figure
+
+    def put(self, key, figure, size):
+        with self.lock:
+            if key in self.entries:
+                self.bytes -= self.entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self.entries[key] = (figure, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.bytes -= evicted_size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self.entries)
@@ -1,3 +1,210 @@
 # analytics_tools/stats.py
+"""
+Single-pass, mergeable statistics.
+
+    stats = RunningStats()
+    for chunk in chunks:            # lists, generators, NumPy arrays...
+        stats.update(chunk)
+    stats.mean, stats.variance, stats.min, stats.max, stats.quantile(0.99)
+
+    total = RunningStats.merge_all(shard_stats)   # partial results of workers
+
+Nothing is kept per value: count, mean and the sum of squared deviations
+are updated with Welford's method (stable, no huge running sums), and two
+partial results combine with Chan's formula, giving the same mean and
+variance as one pass over all the data. Quantiles come from a t-digest:
+about a hundred weighted centroids, with ranks accurate to a fraction of a
+percent and most accurate near the tails (p1, p99). Digests merge too,
+but approximately: the merged centroids are compressed again.
+
+NaN values are skipped, like pandas does by default; RunningStats counts
+them in `missing`.
+"""
+
+import math
+import numbers
+from itertools import islice
+
+import numpy as np
+
+CHUNK_SIZE = 65_536        # values taken at a time from an iterator
+TDIGEST_COMPRESSION = 200  # more centroids: more accurate quantiles
+
+
+def as_chunks(data, chunk_size=CHUNK_SIZE):
+    """Yield float64 arrays from a NumPy array, a list, or any iterator of numbers."""
+    if isinstance(data, np.ndarray):
+        yield data.astype(np.float64, copy=False).ravel()
+        return
+    iterator = iter(data)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield np.asarray(chunk, dtype=np.float64)
+
+
+# ---------- Quantiles ----------
+class TDigest:
+    """Mergeable quantile sketch (merging t-digest, k1 scale function)."""
+
+    def __init__(self, compression=TDIGEST_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer = []
+
+    @property
+    def count(self):
+        self._flush()
+        return float(self.weights.sum())
+
+    def update(self, values):
+        """Add values (NaNs are skipped)."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+        self._buffer.append(values)
+        if sum(len(values) for values in self._buffer) >= 10 * self.compression:
+            self._flush()
+
+    def merge(self, other):
+        """Add another digest's centroids (the other digest is unchanged)."""
+        other._flush()
+        self._flush()
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _flush(self):
+        if self._buffer:
+            values = np.concatenate(self._buffer)
+            self._buffer = []
+            self._compress(np.concatenate([self.means, values]),
+                           np.concatenate([self.weights, np.ones(len(values))]))
+
+    def _compress(self, means, weights):
+        if len(means) == 0:
+            return
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        # k1 scale: centroids may span at most 1 unit of k, so they are small near q=0 and q=1
+        cumulative = np.cumsum(weights) / total
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * np.clip(cumulative, 0, 1) - 1)
+        groups = np.floor(k - k[0]).astype(np.int64)
+        # A new group starts wherever the k unit changes
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        group_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / group_weights
+        self.weights = group_weights
+
+    def quantile(self, q):
+        self._flush()
+        if len(self.means) == 0:
+            return math.nan
+        # Each centroid's mean sits at the middle of its weight; the ends are the exact min and max
+        centers = (np.cumsum(self.weights) - self.weights / 2) / self.weights.sum()
+        return float(np.interp(q, np.r_[0.0, centers, 1.0], np.r_[self.min, self.means, self.max]))
+
+
+# ---------- Moments ----------
+def chunk_mean(chunk, minimum, maximum):
+    """Mean of a NaN-free chunk; its sum may overflow (e.g. [1e308, 1e308]), so scale it then."""
+    with np.errstate(over="ignore"):
+        mean = float(chunk.mean())
+    if math.isinf(mean) and math.isfinite(minimum) and math.isfinite(maximum):
+        scale = max(abs(minimum), abs(maximum))
+        mean = float((chunk / scale).mean()) * scale
+    return mean
+
+
+class RunningStats:
+    """Count, mean, variance, min, max (exact) and quantiles (t-digest) in one pass."""
+
+    def __init__(self, quantiles=True):
+        self.count = 0
+        self.missing = 0  # NaN values skipped
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+        self.min = math.inf
+        self.max = -math.inf
+        self.digest = TDigest() if quantiles else None
+
+    def update(self, data):
+        """Add values: any iterable of numbers, a NumPy array or a single number. NaNs are counted in `missing`."""
+        if isinstance(data, numbers.Number) or (isinstance(data, np.ndarray) and data.ndim == 0):  # incl. np.int64
+            data = [data]
+        for chunk in as_chunks(data):
+            present = ~np.isnan(chunk)
+            self.missing += len(chunk) - int(present.sum())
+            chunk = chunk[present]
+            if len(chunk):
+                minimum, maximum = float(chunk.min()), float(chunk.max())
+                mean = chunk_mean(chunk, minimum, maximum)
+                self._merge_moments(len(chunk), mean, float(((chunk - mean) ** 2).sum()), minimum, maximum)
+                if self.digest is not None:
+                    self.digest.update(chunk)
+        return self
+
+    def merge(self, other):
+        """Combine with another partial result (Chan et al.), as if one pass had seen both."""
+        self._merge_moments(other.count, other.mean, other.m2, other.min, other.max)
+        self.missing += other.missing
+        if self.digest is not None and other.digest is not None:
+            self.digest.merge(other.digest)
+        elif other.count:
+            self.digest = None  # quantiles of only part of the data would be wrong
+        return self
+
+    @classmethod
+    def merge_all(cls, partials):
+        total = cls()
+        for partial in partials:
+            total.merge(partial)
+        return total
+
+    def _merge_moments(self, count, mean, m2, minimum, maximum):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean  # inf only if the spread itself overflows; then so does m2
+        # A weighted average rather than mean + delta * ...: no overflow near the float limits
+        self.mean = self.mean * (self.count / total) + mean * (count / total)
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+    @property
+    def variance(self):
+        """Sample variance (n - 1)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def quantile(self, q):
+        if self.digest is None:
+            raise ValueError("quantiles were not tracked (quantiles=False or merged with such stats)")
+        return self.digest.quantile(q)
+
+    def summary(self):
+        return {"count": self.count, "missing": self.missing, "mean": self.mean if self.count else math.nan, "std": self.std,
+                "min": self.min, "max": self.max,
+                "p50": self.quantile(0.5) if self.digest else math.nan,
+                "p99": self.quantile(0.99) if self.digest else math.nan}
+
+
+def running_stats(data, quantiles=True):
+    return RunningStats(quantiles).update(data)
+
+
 def calculate_mean(data):
-    return sum(data) / len(data)
+    """Mean of any iterable of numbers (list, generator, NumPy array), in one pass."""
+    stats = RunningStats(quantiles=False).update(data)
+    if stats.count == 0:
+        raise ZeroDivisionError("mean of no data")
+    return stats.mean
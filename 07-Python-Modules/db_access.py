@@ -0,0 +1,145 @@
+"""
+Pooled, streaming access to PostgreSQL (psycopg2).
+
+    db = Database(config_from_env())          # or Database({"host": ..., "dbname": ..., ...})
+    for schema, table in db.stream(TABLES_SQL):
+        print(schema, table)                  # rows arrive ITERSIZE at a time
+    counts = db.map_databases(count_tables, ["db1", "db2"])
+    db.close()
+
+- Connections come from a psycopg2 ThreadedConnectionPool and are reused,
+  instead of a new connect() (TCP + TLS + auth) per task.
+- stream() runs the query on a named (server-side) cursor: the server
+  keeps the result and sends ITERSIZE rows per round trip, so even a
+  catalog with millions of tables never sits whole in client memory.
+- map_databases() runs a function against several databases at once, one
+  small pool per database, on a thread pool.
+
+The connection settings are plain psycopg2.connect() keyword arguments, so
+tests can point the layer at a local or throwaway Postgres:
+
+    PGHOST=localhost PGDATABASE=test PGUSER=postgres python library_demo.py
+
+or replace the pool altogether: db_access_check.py drives the layer with a
+fake pool, without psycopg2 or a server.
+"""
+
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import psycopg2
+    from psycopg2 import pool
+    DB_ERROR = psycopg2.Error
+except ImportError:  # only a stand-in pool_class can be used (see db_access_check.py)
+    psycopg2 = pool = None
+    DB_ERROR = Exception
+
+ITERSIZE = 2000      # rows fetched per round trip by server-side cursors
+MAX_CONNECTIONS = 4
+ENV_SETTINGS = {"host": "PGHOST", "port": "PGPORT", "dbname": "PGDATABASE", "user": "PGUSER",
+                "password": "PGPASSWORD"}
+
+DATABASES_SQL = "SELECT datname FROM pg_database WHERE datistemplate = false ORDER BY datname"
+TABLES_SQL = """
+    SELECT table_schema, table_name
+    FROM information_schema.tables
+    WHERE table_type = 'BASE TABLE'
+    AND table_schema NOT IN ('pg_catalog', 'information_schema')
+"""
+
+_cursor_ids = itertools.count(1)
+
+
+def config_from_env(defaults=None):
+    """connect() settings from the standard PG* environment variables, over `defaults`."""
+    config = dict(defaults or {})
+    for key, variable in ENV_SETTINGS.items():
+        if os.environ.get(variable):
+            config[key] = os.environ[variable]
+    return config
+
+
+class Database:
+    """A connection pool for one database, with streaming queries."""
+
+    def __init__(self, config, min_connections=1, max_connections=MAX_CONNECTIONS, pool_class=None):
+        self.config = dict(config)
+        if pool_class is None:
+            if pool is None:
+                raise ImportError("Database needs psycopg2 (pip install psycopg2-binary) or a pool_class")
+            pool_class = pool.ThreadedConnectionPool
+        self.pool = pool_class(min_connections, max_connections, **self.config)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection; the transaction is committed, or rolled back on error."""
+        conn = self.pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:  # also a stream() abandoned half way
+            conn.rollback()
+            raise
+        finally:
+            self.pool.putconn(conn)
+
+    def stream(self, query, params=None, itersize=ITERSIZE):
+        """Yield the rows of `query` from a server-side cursor, `itersize` rows per round trip."""
+        with self.connection() as conn:
+            # A named cursor lives on the server (inside this transaction)
+            with conn.cursor(name=f"stream_{next(_cursor_ids)}") as cur:
+                cur.itersize = itersize
+                cur.execute(query, params)
+                yield from cur
+
+    def fetch_one(self, query, params=None):
+        with self.connection() as conn, conn.cursor() as cur:
+            cur.execute(query, params)
+            return cur.fetchone()
+
+    def list_databases(self):
+        return (name for (name,) in self.stream(DATABASES_SQL))
+
+    def list_tables(self):
+        return self.stream(TABLES_SQL)
+
+    def for_database(self, dbname, max_connections=1):
+        """A Database with the same settings, connected to `dbname`."""
+        return Database({**self.config, "dbname": dbname}, 1, max_connections, type(self.pool))
+
+    def map_databases(self, func, dbnames, workers=MAX_CONNECTIONS):
+        """
+        {dbname: func(Database)} for each database, run concurrently.
+        A database that fails (e.g. no CONNECT permission) maps to the error.
+        """
+        def run(dbname):
+            try:
+                db = self.for_database(dbname)
+            except DB_ERROR as error:
+                return error
+            try:
+                return func(db)
+            except DB_ERROR as error:
+                return error
+            finally:
+                db.close()
+
+        dbnames = list(dbnames)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(dbnames, executor.map(run, dbnames)))
+
+    def close(self):
+        self.pool.closeall()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def count_tables(db):
+    return db.fetch_one(f"SELECT count(*) FROM ({TABLES_SQL}) AS tables")[0]
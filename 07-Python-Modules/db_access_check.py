@@ -0,0 +1,128 @@
+"""
+Checks db_access.py without psycopg2 or a server, through its pool_class hook.
+
+    python db_access_check.py
+
+FakePool hands out FakeConnections whose cursors record how they were used
+(named or not, itersize, queries) and return canned rows per database.
+"""
+
+import threading
+
+import db_access
+
+ROWS = {"sales": [("public", "orders"), ("public", "customers"), ("audit", "log")],
+        "hr": [("public", "employees")]}
+
+
+class FakeCursor:
+    def __init__(self, connection, name):
+        self.connection = connection
+        self.name = name
+        self.itersize = None
+        self.rows = []
+
+    def execute(self, query, params=None):
+        self.connection.queries.append((self.name, query, params))
+        if self.connection.dbname == "broken":
+            raise db_access.DB_ERROR("permission denied for database broken")
+        self.rows = list(ROWS.get(self.connection.dbname, []))
+        if query.lstrip().startswith("SELECT count(*)"):
+            self.rows = [(len(self.rows),)]
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.connection.cursors.append(self)
+
+
+class FakeConnection:
+    def __init__(self, dbname):
+        self.dbname = dbname
+        self.queries, self.cursors = [], []
+        self.commits = self.rollbacks = 0
+
+    def cursor(self, name=None):
+        return FakeCursor(self, name)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakePool:
+    """Stands in for psycopg2.pool.ThreadedConnectionPool; every instance is kept for the checks."""
+
+    instances = []
+    lock = threading.Lock()
+
+    def __init__(self, min_connections, max_connections, **config):
+        self.config = config
+        self.max_connections = max_connections
+        self.connection = FakeConnection(config.get("dbname"))
+        self.borrowed = 0
+        self.closed = False
+        with self.lock:
+            self.instances.append(self)
+
+    def getconn(self):
+        assert not self.closed, "getconn() after closeall()"
+        self.borrowed += 1
+        return self.connection
+
+    def putconn(self, conn):
+        assert conn is self.connection
+        self.borrowed -= 1
+
+    def closeall(self):
+        self.closed = True
+
+
+def check_stream():
+    db = db_access.Database({"dbname": "sales"}, pool_class=FakePool)
+    rows = list(db.stream(db_access.TABLES_SQL, itersize=50))
+    assert rows == ROWS["sales"], rows
+    conn = db.pool.connection
+    (cursor,) = conn.cursors
+    assert cursor.name and cursor.name.startswith("stream_"), "stream() must use a named (server-side) cursor"
+    assert cursor.itersize == 50, cursor.itersize
+    assert conn.commits == 1 and db.pool.borrowed == 0
+
+    # A stream abandoned half way rolls back and returns its connection
+    stream = db.stream(db_access.TABLES_SQL)
+    next(stream)
+    stream.close()
+    assert conn.rollbacks == 1 and db.pool.borrowed == 0
+    assert len({cursor.name for cursor in conn.cursors}) == 2, "each stream needs its own cursor name"
+    db.close()
+    assert db.pool.closed
+
+
+def check_map_databases():
+    FakePool.instances.clear()
+    with db_access.Database({"host": "db.local", "dbname": "postgres"}, pool_class=FakePool) as db:
+        counts = db.map_databases(db_access.count_tables, ["sales", "hr", "broken"], workers=3)
+    assert counts["sales"] == 3 and counts["hr"] == 1, counts
+    assert isinstance(counts["broken"], db_access.DB_ERROR), counts["broken"]
+    per_database = {p.config["dbname"]: p for p in FakePool.instances}
+    assert set(per_database) == {"postgres", "sales", "hr", "broken"}
+    for dbname in ("sales", "hr", "broken"):
+        pool = per_database[dbname]
+        assert pool.config["host"] == "db.local" and pool.max_connections == 1
+        assert pool.closed, f"the pool of {dbname} was not closed"
+    assert per_database["postgres"].closed, "Database.__exit__ must close the pool"
+
+
+if __name__ == "__main__":
+    check_stream()
+    check_map_databases()
+    print("✅ db_access: stream, map_databases and close behave as expected")
@@ -1,7 +1,8 @@
 import psycopg2
-from psycopg2 import sql
 
-# Connection details
+from db_access import Database, config_from_env, count_tables
+
+# Connection details (PGHOST, PGDATABASE, ... environment variables override them)
 HOST = "hh-pgsql-public.ebi.ac.uk"
 PORT = 5432
 DBNAME = "pfmegrnargs"
@@ -10,54 +11,52 @@ PASSWORD = "NWDMCE5xdipIjRrp"
 
 def connect_db():
     try:
-        conn = psycopg2.connect(
-            host=HOST,
-            port=PORT,
-            dbname=DBNAME,
-            user=USER,
-            password=PASSWORD
-        )
+        # A pool of reusable connections instead of one psycopg2.connect per task
+        db = Database(config_from_env({
+            "host": HOST,
+            "port": PORT,
+            "dbname": DBNAME,
+            "user": USER,
+            "password": PASSWORD,
+        }))
         print("✅ Connection successful!")
-        return conn
-    except Exception as e:
+        return db
+    except psycopg2.Error as e:
         print("❌ Connection failed:", e)
         return None
 
-def list_databases(conn):
+def list_databases(db):
     print("\n--- Databases ---")
     try:
-        cur = conn.cursor()
-        cur.execute("SELECT datname FROM pg_database WHERE datistemplate = false;")
-        dbs = cur.fetchall()
-        for db in dbs:
-            print(db[0])
-        cur.close()
-    except Exception as e:
+        databases = list(db.list_databases())
+        for name in databases:
+            print(name)
+        return databases
+    except psycopg2.Error as e:
         print("Error listing databases:", e)
+        return []
 
-def list_tables(conn):
+def list_tables(db):
     print("\n--- Tables in current database ---")
     try:
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT table_schema, table_name
-            FROM information_schema.tables
-            WHERE table_type = 'BASE TABLE'
-            AND table_schema NOT IN ('pg_catalog', 'information_schema');
-        """)
-        tables = cur.fetchall()
-        for schema, table in tables:
+        # Streamed from a server-side cursor: rows arrive in batches, never all at once
+        for schema, table in db.list_tables():
             print(f"{schema}.{table}")
-        cur.close()
-    except Exception as e:
+    except psycopg2.Error as e:
         print("Error listing tables:", e)
 
+def count_tables_everywhere(db, databases):
+    print("\n--- Tables per database (queried concurrently) ---")
+    for name, count in db.map_databases(count_tables, databases).items():
+        print(f"{name}: {count}")
+
 def main():
-    conn = connect_db()
-    if conn:
-        list_databases(conn)
-        list_tables(conn)
-        conn.close()
+    db = connect_db()
+    if db:
+        with db:
+            databases = list_databases(db)
+            list_tables(db)
+            count_tables_everywhere(db, databases)
 
 if __name__ == "__main__":
     main()
@@ -6,7 +6,7 @@ import analytics_tools.stats     # Another way to use a module
 from analytics_tools.aws import aws_stats
 
 chart = plotting.create_bar_chart([1,2,3])
-print(chart) # Output: Bar chart created!
+print(chart) # Output: the Plotly figure spec (a dict)
 
 avg = analytics_tools.stats.calculate_mean([10, 20, 30])
 print(avg) # Output: 20.0
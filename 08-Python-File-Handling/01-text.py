@@ -1,28 +1,20 @@
-# 1: Open the file in read mode
-with open('example.txt', 'r') as my_data:
-    content = my_data.read()
+from text_transform import append_text, read_buffers, tail, transform_file
 
+# 1: Read the file a buffer at a time (works for files larger than RAM)
 print("Current File Content:")
-print(content)
-
-# 2: Open the file in Append mode
-with open('example.txt', 'a', encoding='utf-8') as data:
-    data.write('\nAppended line of text.\n')
+for buffer in read_buffers('example.txt'):
+    print(buffer, end='')
+print()
 
+# 2: Append a line; only the end of the file is read back to show it
+append_text('example.txt', '\nAppended line of text.\n')
 print('Line appended successfully.')
 
-with open('example.txt', 'r', encoding='utf-8') as data:
-    content = data.read()
-    print('\nFile content after appending:')
-    print(content)
-
-# 3: Modify and overwrite content
-with open('example.txt', 'r') as file:
-    old_content = file.read()
-
-new_content = old_content.lower()
+print('\nEnd of the file after appending:')
+print(tail('example.txt', max_bytes=200))
 
-with open('example.txt', 'w') as file:
-    file.write(new_content)
+# 3: Convert to lowercase: streamed buffer by buffer into a temporary file,
+#    which then atomically replaces the original (str.lower, so "É" -> "é" too)
+transform_file('example.txt', str.lower)
 
-print("Content converted to lowercase and saved.")
\ No newline at end of file
+print("Content converted to lowercase and saved.")
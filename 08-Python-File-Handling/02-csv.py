@@ -1,19 +1,11 @@
-import csv
-from pathlib import Path
+from csv_aggregate import Aggregation, aggregate
 
-csv_path = Path("employees.csv")
+# Stream employees.csv in typed chunks: only the salary column is parsed,
+# straight to float64, instead of a dict and a float() call per row
+result = aggregate("employees.csv", Aggregation(sums=["salary"]), dtypes={"salary": "float64"})
 
-total_salary = 0
-records      = 0
-
-with csv_path.open(newline="") as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        #print(row)
-        #print(row["salary"])
-        total_salary += float(row["salary"])
-        #print(total_salary)
-        records      += 1
-
-avg_salary = total_salary / records
-print(f"Average salary: ${avg_salary:,.2f}")
\ No newline at end of file
+avg_salary = result.mean("salary")  # None for a file without rows
+if avg_salary is None:
+    print("No salary records found.")
+else:
+    print(f"Average salary: ${avg_salary:,.2f}")
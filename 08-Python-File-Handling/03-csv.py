@@ -1,27 +1,39 @@
-import pandas as pd
-import numpy as np
+import sys
 
-# Read CSV file
-df = pd.read_csv('sales_basic.csv')
+from csv_aggregate import Aggregation, aggregate, read_chunks, filtered_rows
 
-# Basic exploration
-print("Dataset shape:", df.shape)
+# Explicit column types: no type inference
+DTYPES = {'product': 'category', 'price': 'float64', 'quantity': 'int64', 'date': 'object'}
+path = sys.argv[1] if len(sys.argv) > 1 else 'sales_data.csv'
+
+# One streaming pass: row count, and sums per chunk, merged (use workers=4 for multi-GB files)
+revenue = Aggregation(derive={'total_value': 'price * quantity'}, sums=['total_value'], group_by='product')
+result = aggregate(path, revenue, DTYPES, workers=1)
+
+# Basic exploration: the first chunk is enough
+first_chunk = next(read_chunks(path, DTYPES, chunk_rows=1000))
+print("Dataset shape:", (result.rows, first_chunk.shape[1]))
 print("\nFirst 3 rows:")
-print(df.head(3))
+print(first_chunk.head(3))
 
 print("\nData types:")
-print(df.dtypes)
+print(first_chunk.dtypes)
 
-# Simple operations
-df['total_value'] = df['price'] * df['quantity']
-print("\nDataset with calculated total value:")
-print(df)
+# Simple operations: computed chunk by chunk
+with_total = Aggregation(derive={'total_value': 'price * quantity'})
+print("\nDataset with calculated total value (first rows):")
+print(with_total.prepare(first_chunk.copy()).head(10))
 
-# Basic filtering
-expensive_products = df[df['price'] > 700]
+# Basic filtering: the matching rows are streamed, never the whole file
+expensive = Aggregation(where='price > 700')
 print("\nProducts with price > 700:")
-print(expensive_products)
+printed_header = False
+for chunk in filtered_rows(path, expensive, DTYPES):
+    if len(chunk):
+        print(chunk.to_string(header=not printed_header))
+        printed_header = True
 
-# Simple aggregation
-total_revenue = df['total_value'].sum()
-print(f"\nTotal revenue: ${total_revenue}")
\ No newline at end of file
+# Simple aggregation (computed in the pass above)
+print(f"\nTotal revenue: ${result.total('total_value'):,.2f}")
+print("\nRevenue by product:")
+print(result.groups)
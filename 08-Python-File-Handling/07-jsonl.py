@@ -0,0 +1,21 @@
+import os
+
+from employee_store import EmployeeStore, import_json, write_json_array
+
+# Convert data.json to JSON Lines once: one employee per line
+if not os.path.exists('employees.jsonl'):
+    import_json('data.json', 'employees.jsonl')
+
+store = EmployeeStore('employees.jsonl')
+
+# Add a new employee: appends one line instead of rewriting the whole file
+store.add({"id": 3, "name": "Charlie", "role": "ML Engineer"})
+
+# Stream the employees one line at a time
+print("Employee Names:")
+for emp in store:
+    print(emp['name'])
+
+# Filter only Data Engineers and save them, still one record at a time
+count = write_json_array(store.filter(role='Data Engineer'), 'data_engineers.json', 'data_engineers')
+print(f"{count} data engineers written to data_engineers.json.")
@@ -0,0 +1,115 @@
+"""
+JSON Lines (JSONL) employee store: one JSON object per line.
+
+    store = EmployeeStore("employees.jsonl")
+    store.add({"id": 3, "name": "Charlie", "role": "ML Engineer"})
+    for emp in store.filter(role="Data Engineer"):
+        print(emp["name"])
+
+Unlike data.json (one big object), nothing here loads the whole file:
+- add() appends one line, so its cost does not grow with the roster;
+- iterating and filtering read one line at a time, so memory stays flat;
+- filter() skips lines that cannot match before decoding them.
+
+orjson is used when installed (pip install orjson); it is several times
+faster than the json module. Both write the same compact lines.
+"""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # fall back to the json module
+    orjson = None
+
+
+# ---------- Codec ----------
+if orjson is not None:
+    def dumps(record):
+        return orjson.dumps(record)
+
+    loads = orjson.loads
+else:
+    def dumps(record):
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    loads = json.loads
+
+
+def raw_needle(value):
+    """
+    Bytes that every line holding `value` contains, or None if there is no
+    such safe marker (the value could be written in more than one way).
+    """
+    if isinstance(value, str) and value.isascii() and value.isprintable() and '"' not in value and "\\" not in value:
+        return b'"' + value.encode("ascii") + b'"'
+    return None
+
+
+# ---------- Store ----------
+class EmployeeStore:
+    """Employees in a JSONL file, appended to and read as a stream."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def add(self, employee):
+        """Append one employee (a dict)."""
+        self.add_many([employee])
+
+    def add_many(self, employees):
+        """Append employees with a single open and write."""
+        lines = b"".join(dumps(employee) + b"\n" for employee in employees)
+        with open(self.path, "ab") as file:
+            file.write(lines)
+
+    def __iter__(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as file:
+            for line in file:
+                if line.strip():
+                    yield loads(line)
+
+    def filter(self, predicate=None, **fields):
+        """
+        Yield the employees matching all `fields` (e.g. role="Data Engineer")
+        and `predicate(employee)` if given.
+        """
+        if not os.path.exists(self.path):
+            return
+        needles = [needle for needle in map(raw_needle, fields.values()) if needle is not None]
+        with open(self.path, "rb") as file:
+            for line in file:
+                # Cheap bytes check first: most lines are never decoded
+                if any(needle not in line for needle in needles) or not line.strip():
+                    continue
+                employee = loads(line)
+                if all(employee.get(key) == value for key, value in fields.items()) and (
+                        predicate is None or predicate(employee)):
+                    yield employee
+
+
+# ---------- Conversions ----------
+def import_json(json_path, jsonl_path, key="employees"):
+    """One-off conversion of a {"employees": [...]} file such as data.json to JSONL."""
+    with open(json_path, "r") as file:
+        employees = json.load(file)[key]
+    EmployeeStore(jsonl_path).add_many(employees)
+    return len(employees)
+
+
+def write_json_array(records, path, key, indent=2):
+    """
+    Write {key: [records...]} (the data_engineers.json layout) while
+    streaming `records`, so the list is never built in memory.
+    """
+    count = 0
+    with open(path, "w") as file:
+        file.write("{\n" + " " * indent + json.dumps(key) + ": [")
+        for record in records:
+            file.write(("," if count else "") + "\n" + " " * 2 * indent + json.dumps(record))
+            count += 1
+        file.write("\n" + " " * indent + "]\n}\n" if count else "]\n}\n")
+    return count
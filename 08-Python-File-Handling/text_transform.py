@@ -0,0 +1,111 @@
+"""
+Text file transformations that do not load the whole file.
+
+    transform_file("big.log", str.lower)   # any str -> str function, buffer by buffer
+    lower_ascii_in_place("big.log")        # mmap: ASCII letters only, changed where they are
+    append_text("big.log", "new line\\n")
+    print(tail("big.log"))
+
+Transforms stream fixed-size buffers into a temporary file next to the
+original, which then atomically replaces it: readers see either the old
+file or the new one, never a half-written one.
+
+ASCII case folding keeps every byte at the same length and position, so
+it can also be applied to the memory-mapped file directly: no copy of the
+file is made and only the pages being changed are in RAM. It is not
+str.lower(), though: non-ASCII letters ("É", "Ä") are left as they are,
+and an interrupted run leaves the file partly converted.
+"""
+
+import io
+import mmap
+import os
+import string
+import tempfile
+from contextlib import contextmanager
+
+BUFFER_SIZE = 1 << 20  # characters (streaming) or bytes (mmap) processed at a time
+
+ASCII_LOWER = bytes.maketrans(string.ascii_uppercase.encode(), string.ascii_lowercase.encode())
+ASCII_UPPER = bytes.maketrans(string.ascii_lowercase.encode(), string.ascii_uppercase.encode())
+
+
+# ---------- In place (same-length byte transforms) ----------
+def translate_in_place(path, table):
+    """
+    Apply a bytes.translate table to the file in place through mmap. Only
+    byte-for-byte tables keep the file valid, e.g. ASCII case folding (safe
+    for UTF-8 too: multi-byte characters never contain ASCII bytes).
+    """
+    if os.path.getsize(path) == 0:  # an empty file cannot be mapped
+        return
+    with open(path, "r+b") as f, mmap.mmap(f.fileno(), 0) as mm:
+        for start in range(0, len(mm), BUFFER_SIZE):
+            end = min(start + BUFFER_SIZE, len(mm))
+            mm[start:end] = mm[start:end].translate(table)
+        mm.flush()
+
+
+def lower_ascii_in_place(path):
+    """Lowercase A-Z in place (not atomic; other letters are unchanged: use transform_file for those)."""
+    translate_in_place(path, ASCII_LOWER)
+
+
+# ---------- Streaming (any transform) ----------
+@contextmanager
+def atomic_write(path, mode="w", encoding="utf-8"):
+    """
+    Open a temporary file next to `path` for writing; on success it replaces
+    `path` (keeping its permissions), on error it is removed.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        f = open(fd, mode if "b" in mode else mode + "b")  # owns fd from here on
+        if "b" not in mode:
+            try:
+                f = io.TextIOWrapper(f, encoding=encoding, newline="")
+            except BaseException:  # e.g. an unknown encoding: close the file, and fd with it
+                f.close()
+                raise
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def read_buffers(path, encoding="utf-8", size=BUFFER_SIZE):
+    """Yield the text of the file `size` characters at a time."""
+    with open(path, "r", encoding=encoding, newline="") as f:
+        while buffer := f.read(size):
+            yield buffer
+
+
+def transform_file(path, func, encoding="utf-8"):
+    """
+    Replace the file's text with func(text), one buffer at a time. `func`
+    must work per character or per line (e.g. str.lower, str.upper); a
+    pattern spanning two buffers is not seen whole.
+    """
+    with atomic_write(path, encoding=encoding) as out:
+        for buffer in read_buffers(path, encoding):
+            out.write(func(buffer))
+
+
+# ---------- Small helpers ----------
+def append_text(path, text, encoding="utf-8"):
+    with open(path, "a", encoding=encoding) as f:
+        f.write(text)
+
+
+def tail(path, max_bytes=1024, encoding="utf-8"):
+    """The last `max_bytes` of the file as text (read from the end, not the start)."""
+    with open(path, "rb") as f:
+        f.seek(max(0, os.path.getsize(path) - max_bytes))
+        return f.read().decode(encoding, errors="ignore")
@@ -0,0 +1,100 @@
+# columnar_output.py
+"""
+Write generator chunks as Parquet row groups or Arrow IPC record batches.
+
+Used by synthetic_data_1.py and synthetic_data_2.py for --format parquet/arrow.
+Needs pyarrow:  pip install pyarrow
+"""
+
+import os
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed for the columnar formats
+    pa = None
+    pq = None
+
+FORMATS = ["csv", "parquet", "arrow"]
+EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+
+def require_pyarrow(fmt):
+    if pa is None:
+        raise SystemExit(f"--format {fmt} needs pyarrow: pip install pyarrow")
+
+
+def with_extension(path, fmt):
+    """Swap the file extension to match the output format."""
+    return os.path.splitext(path)[0] + EXTENSIONS[fmt]
+
+
+def dictionary_column(indices, values):
+    """
+    Dictionary-encoded string column from integer codes (negative codes become
+    nulls). Using the same `values` for every chunk keeps the dictionary fixed,
+    which Arrow IPC files require across batches.
+    """
+    indices = np.asarray(indices)
+    indices = pa.array(indices, mask=indices < 0, type=pa.int32())
+    return pa.DictionaryArray.from_arrays(indices, pa.array(values, type=pa.string()))
+
+
+class ColumnarWriter:
+    """
+    Append tables chunk by chunk to a Parquet file, an Arrow IPC file, or a
+    Parquet dataset partitioned by `partition_by` (`path` is then a directory
+    and each chunk adds one file per partition, named `<basename>-<n>-<i>`).
+    """
+
+    def __init__(self, path, schema, fmt="parquet", partition_by=None,
+                 compression="zstd", basename="part"):
+        require_pyarrow(fmt)
+        if partition_by and fmt != "parquet":
+            raise SystemExit("Partitioned output is only supported for --format parquet")
+        self.path = path
+        self.schema = schema
+        self.fmt = fmt
+        self.partition_by = partition_by
+        self.compression = compression
+        self.basename = basename
+        self.chunks_written = 0
+        self._writer = None
+        self._sink = None
+
+        if partition_by:
+            os.makedirs(path, exist_ok=True)
+        elif fmt == "parquet":
+            self._writer = pq.ParquetWriter(path, schema, compression=compression)
+        else:
+            self._sink = pa.OSFile(path, "wb")
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            self._writer = pa.ipc.new_file(self._sink, schema, options=options)
+
+    def write(self, table):
+        """Write one chunk: a Parquet row group or an Arrow record batch."""
+        table = table.cast(self.schema)
+        if self.partition_by:
+            pq.write_to_dataset(
+                table, self.path,
+                partition_cols=[self.partition_by],
+                basename_template=f"{self.basename}-{self.chunks_written:05d}-{{i}}.parquet",
+                compression=self.compression,
+            )
+        else:
+            self._writer.write_table(table)
+        self.chunks_written += 1
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -2,37 +2,47 @@
 """
 Generate a synthetic ride-sharing CSV with 10 000 rows
 Columns: source, destination, fare_usd, distance_km, driver_gender, ride_type, customer_name
+
+    python synthetic_data_1.py                     # rides.csv
+    python synthetic_data_1.py --format parquet    # rides.parquet (needs pyarrow)
+    python synthetic_data_1.py --name-pool 50000 --rows 10000000   # pooled names, vectorized
 """
 
+import argparse
 import csv
+import os
 import random
+import numpy as np
 from faker import Faker
 
+import columnar_output
+
 fake = Faker()
-random.seed(42)
-Faker.seed(42)
 
 # ---------- Configurable parameters ----------
 NUM_ROWS        = 10_000
 OUTFILE         = "rides.csv"
+CHUNK_SIZE      = 100_000          # rows per Parquet row group / Arrow batch
+SEED            = 42
 CITIES          = ["New York", "Chicago", "San Francisco", "Boston",
                    "Los Angeles", "Seattle", "Austin", "Denver",
                    "Miami", "Atlanta", "Houston", "Phoenix"]
 GENDERS         = ["Male", "Female"]
 RIDE_TYPES      = ["shared", "individual"]
+COLUMNS         = ["source_city",
+                   "destination_city",
+                   "fare_usd",
+                   "distance_km",
+                   "driver_gender",
+                   "ride_type",
+                   "customer_name"]
+CATEGORIES      = {"source_city": CITIES, "destination_city": CITIES,
+                   "driver_gender": GENDERS, "ride_type": RIDE_TYPES}
 
-# ---------- CSV generation ----------
-with open(OUTFILE, mode="w", newline="", encoding="utf-8") as f:
-    writer = csv.writer(f)
-    writer.writerow(["source_city",
-                     "destination_city",
-                     "fare_usd",
-                     "distance_km",
-                     "driver_gender",
-                     "ride_type",
-                     "customer_name"])
-
-    for _ in range(NUM_ROWS):
+
+# ---------- Row generation ----------
+def generate_rows(num_rows):
+    for _ in range(num_rows):
         # Ensure source != destination
         source, destination = random.sample(CITIES, 2)
 
@@ -43,6 +53,201 @@ with open(OUTFILE, mode="w", newline="", encoding="utf-8") as f:
         ride_t   = random.choice(RIDE_TYPES)
         cust     = fake.name()
 
-        writer.writerow([source, destination, fare, distance, gender, ride_t, cust])
+        yield [source, destination, fare, distance, gender, ride_t, cust]
+
+
+# ---------- Pooled names (vectorized generation) ----------
+def build_name_pool(size, seed, cache_dir=None):
+    """
+    Return `size` unique Faker names for `seed`.
+
+    Faker is by far the slowest part of a row, so names are generated once and
+    rows just pick from the pool. With `cache_dir` the pool is saved as
+    name_pool_<seed>_<size>.txt and reused on the next run.
+    """
+    cache_file = None
+    if cache_dir:
+        cache_file = os.path.join(cache_dir, f"name_pool_{seed}_{size}.txt")
+        if os.path.exists(cache_file):
+            with open(cache_file, encoding="utf-8") as f:
+                return np.array(f.read().splitlines())
+
+    pool_faker = Faker()
+    pool_faker.seed_instance(seed)
+    names = [pool_faker.unique.name() for _ in range(size)]
+
+    if cache_file:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_file = cache_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(names))
+        os.replace(tmp_file, cache_file)
+    return np.array(names)
+
+
+def generate_chunks(num_rows, chunk_size, names, seed):
+    """
+    Yield dicts of NumPy columns; city/gender/ride-type/name columns hold
+    indices into CITIES, GENDERS, RIDE_TYPES and `names`.
+    """
+    rng = np.random.default_rng(seed)
+    n_cities = len(CITIES)
+    remaining = num_rows
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        source = rng.integers(0, n_cities, size=size)
+        # Shift by 1..n-1 positions: any other city, uniformly (like random.sample)
+        destination = (source + rng.integers(1, n_cities, size=size)) % n_cities
+        yield {
+            "source_city": source,
+            "destination_city": destination,
+            "fare_usd": rng.uniform(5, 120, size).round(2),        # $5.00–$120.00
+            "distance_km": rng.uniform(1, 60, size).round(2),      # 1–60 km
+            "driver_gender": rng.integers(0, len(GENDERS), size=size),
+            "ride_type": rng.integers(0, len(RIDE_TYPES), size=size),
+            "customer_name": rng.integers(0, len(names), size=size),
+        }
+        remaining -= size
+
+
+def needs_quoting(values):
+    return any(ch in value for value in values for ch in ',"\r\n')
+
+
+def write_pooled_csv(chunks, names, outfile):
+    # Cities, genders and ride types are plain words; if the pooled names are
+    # too, rows can be joined directly, which is much faster than csv.writer.
+    plain = not needs_quoting(names.tolist())
+    with open(outfile, mode="w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for chunk in chunks:
+            columns = []
+            for name in COLUMNS:
+                values = chunk[name]
+                if name in CATEGORIES:
+                    columns.append(np.array(CATEGORIES[name])[values].tolist())
+                elif name == "customer_name":
+                    columns.append(names[values].tolist())
+                else:
+                    # repr() gives the same float text as csv.writer
+                    columns.append(list(map(repr, values.tolist())))
+            if plain:
+                f.write("".join(",".join(row) + "\r\n" for row in zip(*columns)))
+            else:
+                writer.writerows(zip(*columns))
+
+
+def write_pooled_columnar(chunks, names, outfile, fmt):
+    pa = columnar_output.pa
+    schema = rides_schema()
+    name_array = pa.array(names, type=pa.string())
+    with columnar_output.ColumnarWriter(outfile, schema, fmt) as writer:
+        for chunk in chunks:
+            columns = []
+            for name in COLUMNS:
+                if name in CATEGORIES:
+                    columns.append(columnar_output.dictionary_column(chunk[name], CATEGORIES[name]))
+                elif name == "customer_name":
+                    columns.append(name_array.take(pa.array(chunk[name])))
+                else:
+                    columns.append(pa.array(chunk[name]))
+            writer.write(pa.Table.from_arrays(columns, schema=schema))
+
+
+# ---------- Columnar output ----------
+def rides_schema():
+    pa = columnar_output.pa
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("source_city", category),
+        ("destination_city", category),
+        ("fare_usd", pa.float64()),
+        ("distance_km", pa.float64()),
+        ("driver_gender", category),
+        ("ride_type", category),
+        ("customer_name", pa.string()),
+    ])
+
+
+def rows_to_table(rows, schema):
+    """Transpose a buffered chunk of rows into a typed Arrow table."""
+    pa = columnar_output.pa
+    columns = []
+    for name, values in zip(COLUMNS, zip(*rows)):
+        if name in CATEGORIES:
+            codes = {value: i for i, value in enumerate(CATEGORIES[name])}
+            columns.append(columnar_output.dictionary_column([codes[v] for v in values], CATEGORIES[name]))
+        else:
+            columns.append(pa.array(values))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def write_columnar(rows, outfile, fmt, chunk_size):
+    schema = rides_schema()
+    with columnar_output.ColumnarWriter(outfile, schema, fmt) as writer:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                writer.write(rows_to_table(chunk, schema))
+                chunk = []
+        if chunk:
+            writer.write(rows_to_table(chunk, schema))
+
+
+# ---------- CSV generation ----------
+def write_csv(rows, outfile):
+    with open(outfile, mode="w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows(rows)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a synthetic ride-sharing dataset.")
+    parser.add_argument("--rows", type=int, default=NUM_ROWS, help="number of rows to generate")
+    parser.add_argument("--format", choices=columnar_output.FORMATS, default="csv",
+                        help="CSV, Parquet row groups or Arrow IPC batches")
+    parser.add_argument("--output", default=None,
+                        help=f"output file (default {OUTFILE}, with the extension of --format)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="rows per chunk (Parquet row group / Arrow batch)")
+    parser.add_argument("--seed", type=int, default=SEED, help="random seed")
+    parser.add_argument("--name-pool", type=int, default=0,
+                        help="generate this many unique names once and sample rows from them "
+                             "with NumPy (0 = call Faker for every row)")
+    parser.add_argument("--name-cache", default=None,
+                        help="directory to cache the name pool in, per seed and pool size")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    outfile = args.output or columnar_output.with_extension(OUTFILE, args.format)
+    if args.chunk_size <= 0:
+        raise SystemExit("--chunk-size must be positive")
+    if args.format != "csv":
+        columnar_output.require_pyarrow(args.format)
+
+    if args.name_pool > 0:
+        names = build_name_pool(args.name_pool, args.seed, args.name_cache)
+        chunks = generate_chunks(args.rows, args.chunk_size, names, args.seed)
+        if args.format == "csv":
+            write_pooled_csv(chunks, names, outfile)
+        else:
+            write_pooled_columnar(chunks, names, outfile, args.format)
+    else:
+        random.seed(args.seed)
+        Faker.seed(args.seed)
+        rows = generate_rows(args.rows)
+        if args.format == "csv":
+            write_csv(rows, outfile)
+        else:
+            write_columnar(rows, outfile, args.format, args.chunk_size)
+
+    print(f"✅  Generated {args.rows} rows into {outfile}")
+
 
-print(f"✅  Generated {NUM_ROWS} rows into {OUTFILE}")
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,25 @@
+import argparse
 import datetime
+import json
+import os
 import random
 import numpy as np
 import uuid
 import csv
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import columnar_output
 
 # --- Configuration ---
 NUM_RECORDS = 10000
 START_DATE = datetime.datetime(2023, 1, 1)
 NUM_DAYS_RANGE = 90 # Generate data over a 3-month period
+OUTFILE = "nyc_ride_hailing_data.csv"
+PARTITION_COLUMN = "Request_Date"
+FIRST_RIDE_ID = 1001
+DEFAULT_CHUNK_SIZE = 500_000
+DEFAULT_SEED = 42
 
 # NYC Specific Locations
 nyc_downtown_zones = ["Financial District", "Midtown Manhattan", "SoHo", "Greenwich Village"]
@@ -20,113 +32,452 @@ nyc_suburb_zones = [
 ]
 all_zones = nyc_downtown_zones + nyc_airport_zones + nyc_suburb_zones
 
+# Ratings, statuses and who cancelled (index-aligned with the statuses)
+RATINGS = [1, 2, 3, 4, 5]
+RATING_PROBS = [0.02, 0.03, 0.15, 0.4, 0.4]
+RIDE_STATUS_OPTIONS = ["Completed", "Cancelled_by_Customer", "Cancelled_by_Driver", "No_Show_Customer"]
+RIDE_STATUS_PROBS = [0.88, 0.06, 0.04, 0.02]
+CANCELLED_BY = [None, "Customer", "Driver", "Customer"]
+
 # Driver and Customer Pools
 NUM_UNIQUE_DRIVERS = 500
 NUM_UNIQUE_CUSTOMERS = 3000
 
-driver_ids_pool = [f"DRV_{str(uuid.uuid4())[:6].upper()}" for _ in range(NUM_UNIQUE_DRIVERS)]
-customer_ids_pool = [f"CUST_{str(uuid.uuid4())[:7].upper()}" for _ in range(NUM_UNIQUE_CUSTOMERS)]
+columns = [
+    "Ride_ID", "Fare", "Distance_Miles",
+    "Ride_Request_Time", "Pickup_Time", "Dropoff_Time",
+    "Source_Zone", "Destination_Zone",
+    "Driver_Rating_by_Customer",
+    "Ride_Status", "Cancelled_By",
+    "Driver_ID", "Customer_ID"
+]
+
+
+# --- Data Generation (row by row) ---
+def generate_records_loop(num_records):
+    """Original row-by-row generator, kept as the reference implementation."""
+    driver_ids_pool = [f"DRV_{str(uuid.uuid4())[:6].upper()}" for _ in range(NUM_UNIQUE_DRIVERS)]
+    customer_ids_pool = [f"CUST_{str(uuid.uuid4())[:7].upper()}" for _ in range(NUM_UNIQUE_CUSTOMERS)]
+
+    data = []
+
+    for i in range(num_records):
+        # 1. Ride_ID
+        ride_id = i + FIRST_RIDE_ID
+
+        # 4. Ride_Request_Time
+        random_day_offset = random.randint(0, NUM_DAYS_RANGE - 1)
+        random_hour = random.randint(0, 23)
+        random_minute = random.randint(0, 59)
+        random_second = random.randint(0, 59)
+        ride_request_time = START_DATE + datetime.timedelta(
+            days=random_day_offset,
+            hours=random_hour,
+            minutes=random_minute,
+            seconds=random_second
+        )
+
+        # 5. Pickup_Time (1 to 15 minutes after request)
+        pickup_time = ride_request_time + datetime.timedelta(minutes=random.randint(1, 15))
+
+        # 3. Distance (in miles)
+        if random.random() < 0.1: # 10% chance of a longer ride
+            distance = round(np.random.uniform(10, 35), 2)
+        else:
+            distance = round(np.random.uniform(0.5, 12), 2)
+
+        # 6. Dropoff_Time (based on distance + traffic factor)
+        avg_speed_mph = np.random.uniform(8, 25)
+        ride_duration_minutes = int((distance / avg_speed_mph) * 60) + random.randint(0, 20)
+        ride_duration_minutes = max(5, ride_duration_minutes)
+        dropoff_time = pickup_time + datetime.timedelta(minutes=ride_duration_minutes)
+
+        # 2. Fare
+        base_fare_val = np.random.uniform(2.5, 5.0)
+        distance_rate = np.random.uniform(1.5, 3.0)
+        time_rate = np.random.uniform(0.2, 0.6)
+        surge_noise = np.random.uniform(-1.0, 10.0) if random.random() < 0.2 else 0
+        fare = round(base_fare_val + (distance_rate * distance) + (time_rate * (ride_duration_minutes / 60)) + surge_noise, 2)
+        fare = max(5.0, fare)
+
+        # 7. Source_Zone & 8. Destination_Zone
+        source_zone = random.choice(all_zones)
+        destination_zone = random.choice(all_zones)
+        while destination_zone == source_zone and random.random() < 0.95:
+             destination_zone = random.choice(all_zones)
 
-# --- Data Generation ---
-data = []
+        # 9. Driver_Rating_by_Customer
+        driver_rating = np.random.choice(RATINGS, p=RATING_PROBS)
 
-for i in range(NUM_RECORDS):
+        # 10. Ride_Status & 11. Cancelled_By
+        ride_status = np.random.choice(RIDE_STATUS_OPTIONS, p=RIDE_STATUS_PROBS)
+        cancelled_by = CANCELLED_BY[RIDE_STATUS_OPTIONS.index(ride_status)]
+
+        # 12. Driver_ID
+        driver_id = random.choice(driver_ids_pool)
+
+        # 13. Customer_ID
+        customer_id = random.choice(customer_ids_pool)
+
+        data.append([
+            ride_id,
+            fare,
+            distance,
+            ride_request_time,
+            pickup_time,
+            dropoff_time,
+            source_zone,
+            destination_zone,
+            driver_rating,
+            ride_status,
+            cancelled_by,
+            driver_id,
+            customer_id
+        ])
+
+    return data
+
+
+# --- Data Generation (vectorized, one chunk of columns at a time) ---
+# The source/destination redraw loop above keeps an equal pair with
+# probability 0.05 per attempt and redraws otherwise, so once a pair is equal
+# it stays equal with probability p = 0.05 + 0.95 * p / n_zones.
+SAME_ZONE_KEEP_PROB = 0.05 / (1 - 0.95 / len(all_zones))
+
+
+def chunk_seed(seed, chunk_index):
+    """Seed for one chunk; same as SeedSequence(seed).spawn(n)[chunk_index + 1]."""
+    return np.random.SeedSequence(seed, spawn_key=(chunk_index + 1,))
+
+
+@lru_cache(maxsize=4)
+def build_id_pools(seed):
+    """Driver/customer ID pools drawn from the master seed (stream 0)."""
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0,)))
+    drivers = rng.integers(0, 16 ** 6, size=NUM_UNIQUE_DRIVERS)
+    customers = rng.integers(0, 16 ** 7, size=NUM_UNIQUE_CUSTOMERS)
+    driver_ids = np.array([f"DRV_{d:06X}" for d in drivers])
+    customer_ids = np.array([f"CUST_{c:07X}" for c in customers])
+    return driver_ids, customer_ids
+
+
+def generate_chunk(rng, first_ride_id, size):
+    """
+    Draw `size` rides at once and return them as a dict of NumPy columns.
+
+    Times are seconds since START_DATE, zones/statuses/IDs are indices into
+    all_zones, RIDE_STATUS_OPTIONS and the ID pools. Writers turn these into
+    strings (CSV) or typed columns (Parquet/Arrow).
+    """
     # 1. Ride_ID
-    ride_id = i + 1001
-
-    # 4. Ride_Request_Time
-    random_day_offset = random.randint(0, NUM_DAYS_RANGE - 1)
-    random_hour = random.randint(0, 23)
-    random_minute = random.randint(0, 59)
-    random_second = random.randint(0, 59)
-    ride_request_time = START_DATE + datetime.timedelta(
-        days=random_day_offset,
-        hours=random_hour,
-        minutes=random_minute,
-        seconds=random_second
-    )
+    ride_id = np.arange(first_ride_id, first_ride_id + size, dtype=np.int64)
 
-    # 5. Pickup_Time (1 to 15 minutes after request)
-    pickup_time = ride_request_time + datetime.timedelta(minutes=random.randint(1, 15))
+    # 4. Ride_Request_Time & 5. Pickup_Time (1 to 15 minutes after request)
+    request_s = rng.integers(0, NUM_DAYS_RANGE * 86400, size=size)
+    pickup_s = request_s + rng.integers(1, 16, size=size) * 60
 
-    # 3. Distance (in miles)
-    if random.random() < 0.1: # 10% chance of a longer ride
-        distance = round(np.random.uniform(10, 35), 2)
-    else:
-        distance = round(np.random.uniform(0.5, 12), 2)
+    # 3. Distance (in miles), 10% chance of a longer ride
+    long_ride = rng.random(size) < 0.1
+    distance = np.where(long_ride, rng.uniform(10, 35, size), rng.uniform(0.5, 12, size)).round(2)
 
     # 6. Dropoff_Time (based on distance + traffic factor)
-    avg_speed_mph = np.random.uniform(8, 25)
-    ride_duration_minutes = int((distance / avg_speed_mph) * 60) + random.randint(0, 20)
-    ride_duration_minutes = max(5, ride_duration_minutes)
-    dropoff_time = pickup_time + datetime.timedelta(minutes=ride_duration_minutes)
+    avg_speed_mph = rng.uniform(8, 25, size)
+    duration_min = (distance / avg_speed_mph * 60).astype(np.int64) + rng.integers(0, 21, size=size)
+    duration_min = np.maximum(5, duration_min)
+    dropoff_s = pickup_s + duration_min * 60
 
     # 2. Fare
-    base_fare_val = np.random.uniform(2.5, 5.0)
-    distance_rate = np.random.uniform(1.5, 3.0)
-    time_rate = np.random.uniform(0.2, 0.6)
-    surge_noise = np.random.uniform(-1.0, 10.0) if random.random() < 0.2 else 0
-    fare = round(base_fare_val + (distance_rate * distance) + (time_rate * (ride_duration_minutes / 60)) + surge_noise, 2)
-    fare = max(5.0, fare)
+    base_fare_val = rng.uniform(2.5, 5.0, size)
+    distance_rate = rng.uniform(1.5, 3.0, size)
+    time_rate = rng.uniform(0.2, 0.6, size)
+    surge_noise = np.where(rng.random(size) < 0.2, rng.uniform(-1.0, 10.0, size), 0.0)
+    fare = (base_fare_val + distance_rate * distance + time_rate * (duration_min / 60) + surge_noise).round(2)
+    fare = np.maximum(5.0, fare)
 
     # 7. Source_Zone & 8. Destination_Zone
-    source_zone = random.choice(all_zones)
-    destination_zone = random.choice(all_zones)
-    while destination_zone == source_zone and random.random() < 0.95:
-         destination_zone = random.choice(all_zones)
+    n_zones = len(all_zones)
+    source = rng.integers(0, n_zones, size=size)
+    destination = rng.integers(0, n_zones, size=size)
+    redraw = (destination == source) & (rng.random(size) >= SAME_ZONE_KEEP_PROB)
+    # Any other zone, uniformly: shift by 1..n_zones-1 positions
+    destination = np.where(redraw, (source + rng.integers(1, n_zones, size=size)) % n_zones, destination)
 
     # 9. Driver_Rating_by_Customer
-    driver_rating = np.random.choice([1, 2, 3, 4, 5], p=[0.02, 0.03, 0.15, 0.4, 0.4])
-
-    # 10. Ride_Status & 11. Cancelled_By
-    ride_status_options = ["Completed", "Cancelled_by_Customer", "Cancelled_by_Driver", "No_Show_Customer"]
-    ride_status_probs = [0.88, 0.06, 0.04, 0.02]
-    ride_status = np.random.choice(ride_status_options, p=ride_status_probs)
-
-    cancelled_by = None
-    if ride_status == "Cancelled_by_Customer":
-        cancelled_by = "Customer"
-    elif ride_status == "Cancelled_by_Driver":
-        cancelled_by = "Driver"
-    elif ride_status == "No_Show_Customer":
-        cancelled_by = "Customer"
-
-    # 12. Driver_ID
-    driver_id = random.choice(driver_ids_pool)
-
-    # 13. Customer_ID
-    customer_id = random.choice(customer_ids_pool)
-
-    data.append([
-        ride_id,
-        fare,
-        distance,
-        ride_request_time,
-        pickup_time,
-        dropoff_time,
-        source_zone,
-        destination_zone,
-        driver_rating,
-        ride_status,
-        cancelled_by,
-        driver_id,
-        customer_id
-    ])
-
-# Save to CSV using built-in csv module
-columns = [
-    "Ride_ID", "Fare", "Distance_Miles",
-    "Ride_Request_Time", "Pickup_Time", "Dropoff_Time",
-    "Source_Zone", "Destination_Zone",
-    "Driver_Rating_by_Customer",
-    "Ride_Status", "Cancelled_By",
-    "Driver_ID", "Customer_ID"
-]
+    rating = rng.choice(np.array(RATINGS, dtype=np.int8), size=size, p=RATING_PROBS)
+
+    # 10. Ride_Status (11. Cancelled_By is looked up from it by the writers)
+    status = rng.choice(len(RIDE_STATUS_OPTIONS), size=size, p=RIDE_STATUS_PROBS)
+
+    # 12. Driver_ID & 13. Customer_ID
+    driver = rng.integers(0, NUM_UNIQUE_DRIVERS, size=size)
+    customer = rng.integers(0, NUM_UNIQUE_CUSTOMERS, size=size)
+
+    return {
+        "ride_id": ride_id,
+        "fare": fare,
+        "distance": distance,
+        "request_s": request_s,
+        "pickup_s": pickup_s,
+        "dropoff_s": dropoff_s,
+        "source": source,
+        "destination": destination,
+        "rating": rating,
+        "status": status,
+        "driver": driver,
+        "customer": customer,
+    }
+
+
+def iter_chunks(num_records, chunk_size, seed, first_chunk=0):
+    """Yield chunks starting at `first_chunk`; chunk k always gets the same seed and Ride_IDs."""
+    chunk_index = first_chunk
+    remaining = num_records
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        rng = np.random.default_rng(chunk_seed(seed, chunk_index))
+        yield generate_chunk(rng, FIRST_RIDE_ID + chunk_index * chunk_size, size)
+        remaining -= size
+        chunk_index += 1
+
+
+def format_times(seconds):
+    """Seconds since START_DATE -> 'YYYY-MM-DD HH:MM:SS' strings."""
+    stamps = np.datetime64(START_DATE, "s") + seconds.astype("timedelta64[s]")
+    return np.char.replace(np.datetime_as_string(stamps, unit="s"), "T", " ")
+
+
+def write_csv_chunk(csvfile, chunk, driver_ids, customer_ids):
+    """
+    Write one chunk as CSV lines.
+
+    None of the generated values contain commas, quotes or newlines, so the
+    lines are joined directly instead of going through csv.writer, which is
+    several times slower per row. repr() gives the same float text as csv.writer.
+    """
+    zones = np.array(all_zones)
+    statuses = np.array(RIDE_STATUS_OPTIONS)
+    cancelled_by = np.array(["" if c is None else c for c in CANCELLED_BY])
+    rows = zip(
+        map(str, chunk["ride_id"].tolist()),
+        map(repr, chunk["fare"].tolist()),
+        map(repr, chunk["distance"].tolist()),
+        format_times(chunk["request_s"]).tolist(),
+        format_times(chunk["pickup_s"]).tolist(),
+        format_times(chunk["dropoff_s"]).tolist(),
+        zones[chunk["source"]].tolist(),
+        zones[chunk["destination"]].tolist(),
+        map(str, chunk["rating"].tolist()),
+        statuses[chunk["status"]].tolist(),
+        cancelled_by[chunk["status"]].tolist(),
+        driver_ids[chunk["driver"]].tolist(),
+        customer_ids[chunk["customer"]].tolist(),
+    )
+    csvfile.write("\r\n".join(map(",".join, rows)))
+    csvfile.write("\r\n")
+
+
+def ride_schema(partition=False):
+    """Arrow schema for the columnar formats: native timestamps, dictionary-encoded strings."""
+    pa = columnar_output.pa
+    zone = pa.dictionary(pa.int32(), pa.string())
+    fields = [
+        ("Ride_ID", pa.int64()),
+        ("Fare", pa.float64()),
+        ("Distance_Miles", pa.float64()),
+        ("Ride_Request_Time", pa.timestamp("s")),
+        ("Pickup_Time", pa.timestamp("s")),
+        ("Dropoff_Time", pa.timestamp("s")),
+        ("Source_Zone", zone),
+        ("Destination_Zone", zone),
+        ("Driver_Rating_by_Customer", pa.int8()),
+        ("Ride_Status", zone),
+        ("Cancelled_By", zone),
+        ("Driver_ID", zone),
+        ("Customer_ID", zone),
+    ]
+    if partition:
+        fields.append((PARTITION_COLUMN, pa.date32()))
+    return pa.schema(fields)
+
+
+def chunk_table(chunk, driver_ids, customer_ids, partition=False):
+    """Turn a generated chunk into an Arrow table without going through strings."""
+    pa = columnar_output.pa
+    dictionary_column = columnar_output.dictionary_column
+    start = np.datetime64(START_DATE, "s")
+    cancelled_values = ["Customer", "Driver"]
+    cancelled_codes = np.array([-1 if c is None else cancelled_values.index(c) for c in CANCELLED_BY])
+
+    arrays = [
+        pa.array(chunk["ride_id"]),
+        pa.array(chunk["fare"]),
+        pa.array(chunk["distance"]),
+        pa.array(start + chunk["request_s"].astype("timedelta64[s]")),
+        pa.array(start + chunk["pickup_s"].astype("timedelta64[s]")),
+        pa.array(start + chunk["dropoff_s"].astype("timedelta64[s]")),
+        dictionary_column(chunk["source"], all_zones),
+        dictionary_column(chunk["destination"], all_zones),
+        pa.array(chunk["rating"]),
+        dictionary_column(chunk["status"], RIDE_STATUS_OPTIONS),
+        dictionary_column(cancelled_codes[chunk["status"]], cancelled_values),
+        dictionary_column(chunk["driver"], driver_ids),
+        dictionary_column(chunk["customer"], customer_ids),
+    ]
+    if partition:
+        arrays.append(pa.array(np.datetime64(START_DATE, "D") + (chunk["request_s"] // 86400).astype("timedelta64[D]")))
+    return pa.Table.from_arrays(arrays, schema=ride_schema(partition))
+
+
+def generate_vectorized(num_records, chunk_size, seed, outfile, first_chunk=0,
+                        fmt="csv", partition=False, basename="part"):
+    """Stream `num_records` rides to `outfile` in chunks; memory stays per-chunk."""
+    driver_ids, customer_ids = build_id_pools(seed)
+    chunks = iter_chunks(num_records, chunk_size, seed, first_chunk=first_chunk)
+
+    if fmt == "csv":
+        with open(outfile, "w", newline="", encoding="utf-8") as csvfile:
+            csv.writer(csvfile).writerow(columns)
+            for chunk in chunks:
+                write_csv_chunk(csvfile, chunk, driver_ids, customer_ids)
+        return
+
+    partition_by = PARTITION_COLUMN if partition else None
+    with columnar_output.ColumnarWriter(outfile, ride_schema(partition), fmt,
+                                        partition_by=partition_by, basename=basename) as writer:
+        for chunk in chunks:
+            writer.write(chunk_table(chunk, driver_ids, customer_ids, partition))
+
+
+# --- Sharded generation (one file per shard, spread over a process pool) ---
+def shard_path(outfile, shard_index):
+    stem, ext = os.path.splitext(outfile)
+    return f"{stem}-{shard_index:05d}{ext}"
+
+
+def write_shard(seed, shard_index, shard_rows, num_records, chunk_size, outfile,
+                fmt="csv", partition=False):
+    """
+    Generate one shard in a worker process and return its manifest entry.
+
+    A shard is a run of whole chunks, so its contents depend only on the seed
+    and the shard index, never on how many workers are running.
+    """
+    first_row = shard_index * shard_rows
+    rows = min(shard_rows, num_records - first_row)
+    first_chunk = first_row // chunk_size
+    if partition:
+        # All shards share one partitioned dataset directory
+        path = outfile
+        basename = f"shard-{shard_index:05d}"
+        file_name = f"{os.path.basename(outfile)}/{PARTITION_COLUMN}=*/{basename}-*.parquet"
+    else:
+        path = shard_path(outfile, shard_index)
+        basename = "part"
+        file_name = os.path.basename(path)
+    generate_vectorized(rows, chunk_size, seed, path, first_chunk=first_chunk,
+                        fmt=fmt, partition=partition, basename=basename)
+    return {
+        "shard": shard_index,
+        "file": file_name,
+        "rows": rows,
+        "first_ride_id": FIRST_RIDE_ID + first_row,
+        "last_ride_id": FIRST_RIDE_ID + first_row + rows - 1,
+        # Chunk k is seeded with SeedSequence(seed, spawn_key=(k + 1,))
+        "first_chunk": first_chunk,
+        "num_chunks": -(-rows // chunk_size),
+    }
+
+
+def generate_sharded(num_records, chunk_size, seed, outfile, shard_rows, workers,
+                     fmt="csv", partition=False):
+    """Split the rides into shards, generate them in parallel and write a manifest."""
+    num_shards = -(-num_records // shard_rows)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(write_shard, seed, i, shard_rows, num_records, chunk_size, outfile,
+                        fmt, partition)
+            for i in range(num_shards)
+        ]
+        shards = [f.result() for f in futures]
+
+    manifest = {
+        "seed": seed,
+        "format": fmt,
+        "rows": num_records,
+        "chunk_size": chunk_size,
+        "shard_rows": shard_rows,
+        "columns": columns,
+        "shards": shards,
+    }
+    manifest_path = os.path.splitext(outfile)[0] + ".manifest.json"
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest_path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate synthetic NYC ride-hailing data.")
+    parser.add_argument("--mode", choices=["loop", "vectorized"], default="loop",
+                        help="'loop' builds rows one at a time, 'vectorized' draws whole columns per chunk")
+    parser.add_argument("--rows", type=int, default=NUM_RECORDS, help="number of rides to generate")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="rows per chunk in vectorized mode")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="master seed for vectorized mode")
+    parser.add_argument("--output", default=None,
+                        help=f"output file (default {OUTFILE}, with the extension of --format)")
+    parser.add_argument("--format", choices=columnar_output.FORMATS, default="csv",
+                        help="vectorized mode: CSV, Parquet row groups or Arrow IPC batches")
+    parser.add_argument("--partition-by-date", action="store_true",
+                        help=f"parquet only: write a dataset directory partitioned by {PARTITION_COLUMN}")
+    parser.add_argument("--shard-rows", type=int, default=None,
+                        help="vectorized mode: write one file per this many rows, plus a manifest "
+                             "(must be a multiple of --chunk-size)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="processes used to generate shards")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.chunk_size <= 0:
+        raise SystemExit("--chunk-size must be positive")
+    if args.format != "csv" or args.partition_by_date:
+        if args.mode != "vectorized":
+            raise SystemExit("--format and --partition-by-date require --mode vectorized")
+        columnar_output.require_pyarrow(args.format)
+        if args.partition_by_date and args.format != "parquet":
+            raise SystemExit("--partition-by-date requires --format parquet")
+    if args.output is None:
+        args.output = columnar_output.with_extension(OUTFILE, args.format)
+        if args.partition_by_date:
+            args.output = os.path.splitext(args.output)[0]
+
+    if args.shard_rows is not None:
+        if args.mode != "vectorized":
+            raise SystemExit("--shard-rows requires --mode vectorized")
+        if args.shard_rows <= 0 or args.shard_rows % args.chunk_size:
+            raise SystemExit("--shard-rows must be a positive multiple of --chunk-size")
+        manifest_path = generate_sharded(args.rows, args.chunk_size, args.seed, args.output,
+                                         args.shard_rows, args.workers,
+                                         args.format, args.partition_by_date)
+        print(f"Generated {args.rows} synthetic records")
+        print(f"Shards listed in {manifest_path}")
+        return
+
+    if args.mode == "vectorized":
+        generate_vectorized(args.rows, args.chunk_size, args.seed, args.output,
+                            fmt=args.format, partition=args.partition_by_date)
+    else:
+        data = generate_records_loop(args.rows)
+        # Save to CSV using built-in csv module
+        with open(args.output, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(columns)  # Write header
+            writer.writerows(data)    # Write all data rows
+
+    print(f"Generated {args.rows} synthetic records")
+    print(f"Data saved to {args.output}")
 
-with open("nyc_ride_hailing_data.csv", "w", newline="", encoding="utf-8") as csvfile:
-    writer = csv.writer(csvfile)
-    writer.writerow(columns)  # Write header
-    writer.writerows(data)    # Write all data rows
 
-print(f"Generated {len(data)} synthetic records")
-print("Data saved to nyc_ride_hailing_data.csv")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Batch validation of many small JSON files on a process pool.
+
+    report = validate("drops/2024-06-01/", workers=8)     # a directory, a glob or one file
+    print(report.format())
+    report.counts        # Counter({'ok': 199_412, 'JSONDecodeError': 391, 'KeyError': 197})
+
+    python json_validator.py "drops/**/*.json" --workers 8 --report report.json
+
+Each file goes through the same checks as process_json_file() in
+try-except-2.py (it parses, has 'name', and its 'age' is a number) and the
+same errors are caught, but a failure is recorded as (path, error kind,
+detail) instead of printed. Files are opened with `with`, so they are
+closed whatever happens, and read in one call.
+
+With many small files the cost is per file, not per byte, so the paths are
+handed to the workers in chunks (one task and one result per chunk, not per
+file) and each worker returns only counts and failures. orjson is used for
+parsing when installed (pip install orjson).
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+
+try:
+    import orjson
+except ImportError:  # use the json module
+    orjson = None
+
+REQUIRED_KEYS = ("name", "age")
+CHUNK_SIZE = 500       # files per task
+MAX_FAILURES = 1000    # failures kept in the report (all are counted)
+
+loads = orjson.loads if orjson is not None else json.loads
+
+
+# ---------- One file ----------
+def check_record(data):
+    """Raise KeyError / TypeError like process_json_file() does for a bad record."""
+    if not isinstance(data, dict):
+        raise TypeError(f"expected a JSON object, got {type(data).__name__}")
+    for key in REQUIRED_KEYS:
+        if key not in data:
+            raise KeyError(key)
+    age = data["age"]
+    if isinstance(age, bool) or not isinstance(age, (int, float)):
+        raise TypeError(f"'age' must be a number, got {type(age).__name__} {age!r}")
+
+
+def validate_file(path):
+    """None if the file is valid, else (error kind, detail)."""
+    try:
+        with open(path, "rb") as f:
+            data = loads(f.read())
+        check_record(data)
+    except FileNotFoundError:
+        return "FileNotFoundError", "file not found"
+    except PermissionError:
+        return "PermissionError", "permission denied"
+    except ValueError as e:  # json and orjson decode errors, invalid UTF-8
+        return "JSONDecodeError", str(e)
+    except KeyError as e:
+        return "KeyError", f"missing key {e}"
+    except TypeError as e:
+        return "TypeError", str(e)
+    except OSError as e:  # e.g. a directory named *.json
+        return type(e).__name__, str(e)
+    except Exception as e:  # e.g. RecursionError from the json module on deeply nested input
+        return type(e).__name__, str(e)
+    return None
+
+
+def validate_chunk(paths, max_failures=MAX_FAILURES):
+    """(counts per kind, failures, seconds) for a list of paths; runs in a worker."""
+    start = time.perf_counter()
+    counts = Counter()
+    failures = []
+    for path in paths:
+        error = validate_file(path)
+        if error is None:
+            counts["ok"] += 1
+            continue
+        counts[error[0]] += 1
+        if len(failures) < max_failures:
+            failures.append((path, *error))
+    return counts, failures, time.perf_counter() - start
+
+
+# ---------- Many files ----------
+def find_files(target, pattern="*.json"):
+    """Paths of a file, of the `pattern` files under a directory (recursively), or of a glob."""
+    if os.path.isdir(target):
+        return sorted(glob.iglob(os.path.join(glob.escape(target), "**", pattern), recursive=True))
+    if glob.has_magic(target):
+        return sorted(glob.iglob(target, recursive=True))
+    return [target]
+
+
+def chunked(items, size):
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class Report:
+    """Counts per error kind, sample failures and timings of a validation run."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.failures = []
+        self.worker_seconds = 0.0  # time spent validating, summed over the workers
+        self.seconds = 0.0         # wall time, including the file listing
+
+    def add(self, counts, failures, seconds, max_failures=MAX_FAILURES):
+        self.counts.update(counts)
+        self.failures.extend(failures[:max_failures - len(self.failures)])
+        self.worker_seconds += seconds
+
+    @property
+    def files(self):
+        return sum(self.counts.values())
+
+    @property
+    def errors(self):
+        return self.files - self.counts["ok"]
+
+    def to_dict(self):
+        return {
+            "files": self.files,
+            "valid": self.counts["ok"],
+            "errors": {kind: count for kind, count in self.counts.most_common() if kind != "ok"},
+            "seconds": round(self.seconds, 3),
+            "worker_seconds": round(self.worker_seconds, 3),
+            "files_per_second": round(self.files / self.seconds) if self.seconds else None,
+            "failures": [{"path": path, "error": kind, "detail": detail} for path, kind, detail in self.failures],
+        }
+
+    def format(self, examples=5):
+        lines = [f"{self.files:,} files, {self.counts['ok']:,} valid, {self.errors:,} with errors "
+                 f"in {self.seconds:.2f} s ({self.files / self.seconds if self.seconds else 0:,.0f} files/s)"]
+        for kind, count in self.counts.most_common():
+            if kind == "ok":
+                continue
+            lines.append(f"  {kind}: {count:,}")
+            for path, _, detail in [f for f in self.failures if f[1] == kind][:examples]:
+                lines.append(f"    {path}: {detail}")
+        return "\n".join(lines)
+
+
+def validate(target, workers=None, chunk_size=CHUNK_SIZE, max_failures=MAX_FAILURES):
+    """Validate every JSON file of `target` (directory, glob or file) on `workers` processes."""
+    start = time.perf_counter()
+    report = Report()
+    chunks = chunked(find_files(target), chunk_size)
+    if workers == 1:
+        for chunk in chunks:  # no pool: fastest for a few files
+            report.add(*validate_chunk(chunk, max_failures), max_failures)
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            for result in pool.map(validate_chunk, chunks, repeat(max_failures)):
+                report.add(*result, max_failures)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate many JSON files in parallel.")
+    parser.add_argument("target", help="directory (searched recursively), glob pattern or file")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="files per task")
+    parser.add_argument("--report", help="also write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = validate(args.target, args.workers, args.chunk_size)
+    print(report.format())
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
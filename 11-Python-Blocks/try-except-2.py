@@ -1,4 +1,7 @@
 import json
+import sys
+
+import json_validator
 
 def process_json_file(filepath):
     """
@@ -58,9 +61,27 @@ def process_json_file(filepath):
         # This block ALWAYS executes, regardless of whether an exception occurred or not
         print("Finally block: Attempting to clean up resources...")
         # You could perform some tasks which are needed to perform at the end of code execution.
+        if file_handle is not None:
+            file_handle.close()
+            print("File closed.")
+
+def validate_json_files(target, workers=None):
+    """
+    Same checks as process_json_file() for every JSON file in a directory or glob,
+    run in parallel on `workers` processes. Prints a summary instead of every step.
+    """
+    report = json_validator.validate(target, workers)
+    print(report.format())
+    return report
 
 # --- Main execution ---
 if __name__ == "__main__":
+    # Batch mode: python try-except-2.py <directory or glob> [workers]
+    if len(sys.argv) > 1:
+        workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        report = validate_json_files(sys.argv[1], workers)
+        sys.exit(1 if report.errors else 0)
+
     # 1. Test with a valid JSON file
     process_json_file("valid_data.json")
 
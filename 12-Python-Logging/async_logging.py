@@ -0,0 +1,191 @@
+"""
+Non-blocking logging: the calling thread only puts records on a queue, and
+a background listener thread formats and writes them.
+
+    import async_logging
+    listener = async_logging.setup_queue_logging('logging.conf')  # or a dictConfig dict
+    logging.info("...")   # returns as soon as the record is queued
+    listener.stop()       # at exit (also registered with atexit); restores the handlers
+
+setup_queue_logging() applies the normal fileConfig/dictConfig first, then
+moves the handlers it created behind a QueueHandler, so code that logs
+with logging.info() etc. keeps working unchanged. Features:
+
+- Backpressure: the queue is bounded. With policy "drop" a full queue
+  drops the record (and later logs how many were lost); with "block" the
+  caller waits for room, so nothing is lost but logging can slow it down.
+- Batched flushes: the listener takes every record already waiting, writes
+  them, then flushes each file once per batch instead of once per record.
+  Use the Batch*FileHandler classes below in the config for that.
+- Rotation: BatchRotatingFileHandler (by size) and
+  BatchTimedRotatingFileHandler (by time) are the standard rotating
+  handlers with batched flushing.
+"""
+
+import atexit
+import logging
+import logging.config
+import logging.handlers
+import queue
+
+QUEUE_SIZE = 10_000
+BATCH_SIZE = 500           # records written before each flush, at most
+POLICIES = ("drop", "block")
+
+
+# ---------- Handlers ----------
+class BatchFlushMixin:
+    """Leaves flushing to the listener: one flush per batch, not one per record."""
+
+    deferred = False  # set by BatchQueueListener while it writes a batch
+
+    def flush(self):
+        if not self.deferred:
+            super().flush()
+
+
+class BatchFileHandler(BatchFlushMixin, logging.FileHandler):
+    pass
+
+
+class BatchRotatingFileHandler(BatchFlushMixin, logging.handlers.RotatingFileHandler):
+    pass
+
+
+class BatchTimedRotatingFileHandler(BatchFlushMixin, logging.handlers.TimedRotatingFileHandler):
+    pass
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for a bounded queue, with a drop or block policy when it is full."""
+
+    def __init__(self, log_queue, policy="drop"):
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, not {policy!r}")
+        super().__init__(log_queue)
+        self.policy = policy
+        self.dropped = 0   # records lost to a full queue
+        self.reported = 0  # of which a warning was already queued
+
+    def enqueue(self, record):
+        if self.policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.dropped > self.reported:
+            lost, self.reported = self.dropped - self.reported, self.dropped
+            warning = logging.makeLogRecord({
+                "name": "async_logging", "levelno": logging.WARNING, "levelname": "WARNING",
+                "msg": "%d log records dropped: the log queue was full", "args": (lost,)})
+            try:
+                self.queue.put_nowait(self.prepare(warning))
+            except queue.Full:
+                self.reported -= lost  # try again with the next record
+
+
+# ---------- Listener ----------
+class BatchQueueListener(logging.handlers.QueueListener):
+    """QueueListener that handles the records in batches and flushes the handlers once per batch."""
+
+    def __init__(self, log_queue, *handlers, respect_handler_level=True, batch_size=BATCH_SIZE):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.batch_size = batch_size
+
+    def _monitor(self):
+        q = self.queue
+        has_task_done = hasattr(q, "task_done")
+        stopping = False
+        while not stopping:
+            batch = [q.get()]  # wait for the first record, then take what is already there
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            for handler in self.handlers:
+                handler.deferred = True
+            try:
+                for record in batch:
+                    if record is self._sentinel:
+                        stopping = True
+                        continue
+                    self.handle(record)
+            finally:
+                for handler in self.handlers:
+                    handler.deferred = False
+                    handler.flush()
+            if has_task_done:
+                for _ in batch:
+                    q.task_done()
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)  # wait for room: the queue may be full
+
+
+# ---------- Configuration ----------
+def load_config(config):
+    """Apply a logging config: a fileConfig path (e.g. 'logging.conf') or a dictConfig dict."""
+    if isinstance(config, dict):
+        logging.config.dictConfig(config)
+    elif config is not None:
+        logging.config.fileConfig(config, disable_existing_loggers=False)
+
+
+class ListenerGroup:
+    """
+    The listeners started by setup_queue_logging(). stop() puts each
+    logger's original handlers back, then drains and stops the listeners,
+    so records logged after stop() (e.g. at exit) are written directly.
+    """
+
+    def __init__(self):
+        self.routes = []  # (logger, queue handler, original handlers, listener)
+
+    @property
+    def listeners(self):
+        return [listener for _, _, _, listener in self.routes]
+
+    def add(self, logger, queue_handler, handlers, listener):
+        self.routes.append((logger, queue_handler, handlers, listener))
+
+    def stop(self):
+        while self.routes:
+            logger, queue_handler, handlers, listener = self.routes.pop()
+            for handler in handlers:
+                logger.addHandler(handler)
+            logger.removeHandler(queue_handler)
+            listener.stop()
+
+
+def setup_queue_logging(config=None, queue_size=QUEUE_SIZE, policy="drop", batch_size=BATCH_SIZE):
+    """
+    Load `config`, then route each configured logger's handlers through a
+    bounded queue and a background listener thread. Returns a ListenerGroup:
+    its stop() writes what is still queued, stops the threads and gives the
+    loggers their own handlers back.
+    """
+    load_config(config)
+    loggers = [logging.getLogger()] + [logger for logger in logging.Logger.manager.loggerDict.values()
+                                       if isinstance(logger, logging.Logger)]
+    group = ListenerGroup()
+    for logger in loggers:
+        handlers = [handler for handler in logger.handlers
+                    if not isinstance(handler, logging.handlers.QueueHandler)]
+        if not handlers:
+            continue
+        log_queue = queue.Queue(queue_size)
+        for handler in handlers:
+            logger.removeHandler(handler)
+        queue_handler = BoundedQueueHandler(log_queue, policy)
+        logger.addHandler(queue_handler)
+        listener = BatchQueueListener(log_queue, *handlers, batch_size=batch_size)
+        listener.start()
+        group.add(logger, queue_handler, handlers, listener)
+
+    atexit.register(group.stop)
+    return group
+
@@ -0,0 +1,47 @@
+"""
+Micro-benchmark: cost per log call when the level is disabled or enabled.
+
+    python bench_logging.py            # 200,000 calls per case
+
+Disabled DEBUG calls should cost next to nothing. An f-string message is
+built before logging even checks the level; %-style arguments skip all
+formatting when the level is off. The structured logger's keyword fields
+are packed before its level check, so in hot loops guard it with
+log.debug_enabled.
+"""
+import io
+import logging
+import sys
+import timeit
+
+from structured_logging import get_logger
+
+CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+logger = logging.getLogger("bench")
+logger.propagate = False
+logger.addHandler(logging.StreamHandler(io.StringIO()))  # formats and writes, but not to the console
+log = get_logger("bench")
+length, width = 5, 10
+
+CASES = {
+    "f-string": lambda: logger.debug(f"Calculating area for length={length}, width={width}"),
+    "%-style args": lambda: logger.debug("Calculating area for length=%s, width=%s", length, width),
+    "isEnabledFor guard": lambda: logger.isEnabledFor(logging.DEBUG) and logger.debug(
+        "Calculating area for length=%s, width=%s", length, width),
+    "structured": lambda: log.debug("calculating area", length=length, width=width),
+    "structured, guarded": lambda: log.debug_enabled and log.debug("calculating area", length=length, width=width),
+}
+
+
+def bench(level):
+    logger.setLevel(level)
+    for name, call in CASES.items():
+        seconds = min(timeit.repeat(call, number=CALLS, repeat=3))
+        print(f"  {name:<20} {seconds / CALLS * 1e9:8.0f} ns/call")
+
+
+print(f"DEBUG disabled (level INFO), {CALLS:,} calls:")
+bench(logging.INFO)
+print(f"DEBUG enabled, {CALLS:,} calls:")
+bench(logging.DEBUG)
@@ -0,0 +1,134 @@
+"""
+A fast JSON log formatter with no third-party dependency.
+
+    handler.setFormatter(FastJsonFormatter(
+        "%(asctime)s %(levelname)s %(name)s %(message)s",
+        datefmt="%Y-%m-%dT%H:%M:%SZ", utc=True, extras=("user_id", "ip")))
+    logger.info("User logged in", extra={"user_id": 123, "ip": "192.168.1.1"})
+    -> {"asctime":"2024-01-15T10:30:00Z","levelname":"INFO","name":"my_json_app",
+        "message":"User logged in","user_id":123,"ip":"192.168.1.1"}
+
+Where pythonjsonlogger's JsonFormatter rebuilds a dict from every record and
+runs strftime and json.dumps each time, this formatter:
+- parses the format string once into a fixed list of (field, getter)
+  pairs with their JSON keys already encoded, and fills the record's
+  output dict from it without a generator;
+- formats the timestamp once per second (records within the same second
+  reuse the string; milliseconds are added only if asked for);
+- reads only the declared `extras` attributes instead of scanning the
+  record for unknown ones;
+- serializes with orjson when installed, else joins pre-encoded pieces
+  with the json module's C string encoder.
+
+Records from structured_logging carry their fields in record.fields;
+those are emitted as top-level keys, and "message" is the event name
+alone. Values orjson cannot encode (ints above 64 bits) are written by the
+json module path instead, and NaN and infinity become strings there, so
+every line stays valid JSON.
+"""
+
+import json
+import logging
+import operator
+import re
+import time
+from json.encoder import encode_basestring_ascii
+
+try:
+    import orjson
+except ImportError:  # use the json module's encoders
+    orjson = None
+
+FIELD_PATTERN = re.compile(r"%\((\w+)\)")
+DEFAULT_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None)))  # set on every record
+
+
+def encode_value(value):
+    """JSON text of a value; strings and ints skip json.dumps. NaN and infinity become strings."""
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    if type(value) is int:
+        return str(value)
+    try:
+        return json.dumps(value, default=str, separators=(",", ":"), allow_nan=False)
+    except (TypeError, ValueError):
+        return encode_basestring_ascii(str(value))
+
+
+def record_message(record):
+    """The record's message; for structured_logging records only the event (the fields are keys of their own)."""
+    if getattr(record, "fields", None) is not None and hasattr(record.msg, "event"):
+        return str(record.msg.event)
+    return record.getMessage()
+
+
+def encode_key(key):
+    return encode_basestring_ascii(key) + ":"
+
+
+class FastJsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object with the fields of `fmt` plus the declared extras."""
+
+    def __init__(self, fmt=DEFAULT_FORMAT, datefmt=None, extras=(), utc=False, msecs=False):
+        super().__init__(fmt, datefmt)
+        self.fields = FIELD_PATTERN.findall(fmt)
+        self.extras = tuple(extras)
+        self.msecs = msecs  # add ".123" to asctime
+        if utc:
+            self.converter = time.gmtime
+        self._keys = {key: encode_key(key) for key in self.fields + list(self.extras)}  # '"asctime":'
+        self._getters = [(field, self._getter(field)) for field in self.fields]
+        self._time_cache = (None, None, "")  # (whole second, date format, formatted)
+
+    def _getter(self, field):
+        if field == "message":
+            return record_message
+        if field == "asctime":
+            return self.formatTime
+        if field in RECORD_ATTRIBUTES:
+            return operator.attrgetter(field)
+        return lambda record: getattr(record, field, None)
+
+    def usesTime(self):
+        return "asctime" in self.fields
+
+    def formatTime(self, record, datefmt=None):
+        datefmt = datefmt or self.datefmt or self.default_time_format
+        second = int(record.created)
+        cached_second, cached_datefmt, text = self._time_cache
+        if second != cached_second or datefmt != cached_datefmt:
+            text = time.strftime(datefmt, self.converter(second))
+            self._time_cache = (second, datefmt, text)
+        if self.msecs:
+            return f"{text}.{int(record.msecs):03d}"
+        return text
+
+    def values(self, record):
+        """Dict of the record's output fields, in output order."""
+        values = {field: get(record) for field, get in self._getters}
+        for name in self.extras:
+            value = getattr(record, name, self)  # self: not set on this record
+            if value is not self:
+                values[name] = value
+        structured = getattr(record, "fields", None)
+        if structured:
+            values.update(structured)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            values["exc_info"] = record.exc_text
+        if record.stack_info:
+            values["stack_info"] = self.formatStack(record.stack_info)
+        return values
+
+    def format(self, record):
+        values = self.values(record)
+        if orjson is not None:
+            try:
+                return orjson.dumps(values, default=str).decode()
+            except TypeError:  # orjson.JSONEncodeError, e.g. an int above 64 bits: use the json module
+                pass
+        keys = self._keys
+        return "{" + ",".join((keys.get(key) or encode_key(key)) + encode_value(value)
+                              for key, value in values.items()) + "}"
@@ -7,13 +7,13 @@ logging.basicConfig(level=logging.DEBUG)
 logging.info("Program started.")
 
 
-logging.debug(f"This will only print when the log level is debug")
+logging.debug("This will only print when the log level is debug")
 
 name = "Alice"
 age = 30
-logging.info(f"User: {name}, Age: {age}")
+logging.info("User: %s, Age: %s", name, age)
 
 result = 10 + 5
-logging.info(f"The result of the addition is: {result}")
+logging.info("The result of the addition is: %s", result)
 
 logging.warning("Program finished.")
\ No newline at end of file
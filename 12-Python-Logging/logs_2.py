@@ -8,22 +8,24 @@ logging.basicConfig(
 
 def check_temperature(temperature):
     """Checks the temperature and logs a message based on its value."""
-    logging.debug(f"Checking temperature: {temperature}°C")
+    logging.debug("Checking temperature: %s°C", temperature)
     if temperature > 30:
-        logging.warning(f"Temperature is high: {temperature}°C. Consider taking precautions.")
+        logging.warning("Temperature is high: %s°C. Consider taking precautions.", temperature)
     elif temperature < 10:
-        logging.warning(f"Temperature is low: {temperature}°C. Dress warmly.")
+        logging.warning("Temperature is low: %s°C. Dress warmly.", temperature)
     else:
-        logging.info(f"Temperature is comfortable: {temperature}°C.")
+        logging.info("Temperature is comfortable: %s°C.", temperature)
 
 def calculate_area(length, width):
     """Calculates the area of a rectangle and logs the dimensions."""
-    logging.debug(f"Calculating area for length={length}, width={width}")
+    # Pass values as arguments, not in an f-string: the message is only
+    # built if a handler emits it, so disabled DEBUG calls stay cheap
+    logging.debug("Calculating area for length=%s, width=%s", length, width)
     if length < 0 or width < 0:
         logging.error("Invalid dimensions! Length and width must be non-negative.")
         return None
     area = length * width
-    logging.info(f"Area of rectangle: {area}")
+    logging.info("Area of rectangle: %s", area)
     return area
 
 def main():
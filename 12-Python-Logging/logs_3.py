@@ -6,36 +6,36 @@ logging.config.fileConfig('logging.conf')
 
 def check_temperature(temperature):
     """Checks the temperature and logs a message based on its value."""
-    logging.info(f"Checking temperature: {temperature}°C")
+    logging.info("Checking temperature: %s°C", temperature)
     if temperature > 30:
-        logging.warning(f"Temperature is high: {temperature}°C. Consider taking precautions.")
+        logging.warning("Temperature is high: %s°C. Consider taking precautions.", temperature)
     elif temperature < 10:
-        logging.warning(f"Temperature is low: {temperature}°C. Dress warmly.")
+        logging.warning("Temperature is low: %s°C. Dress warmly.", temperature)
     else:
-        logging.info(f"Temperature is comfortable: {temperature}°C.")
+        logging.info("Temperature is comfortable: %s°C.", temperature)
 
 def calculate_area(length, width):
     """Calculates the area of a rectangle and logs the dimensions."""
-    logging.debug(f"Calculating area for length={length}, width={width}")
+    logging.debug("Calculating area for length=%s, width=%s", length, width)
     if length < 0 or width < 0:
         logging.error("Invalid dimensions! Length and width must be non-negative.")
         return None
     area = length * width
-    logging.info(f"Area of rectangle: {area}")
+    logging.info("Area of rectangle: %s", area)
     return area
 
 def main():
     """Main function demonstrating temperature check and area calculation."""
-    logging.info(f"starting python logging code")
+    logging.info("starting python logging code")
     check_temperature(35)
     check_temperature(5)
     check_temperature(20)
 
     area1 = calculate_area(5, 10)
-    logging.info(f"Area 1: {area1}")
+    logging.info("Area 1: %s", area1)
 
     area2 = calculate_area(-2, 8)
-    logging.info(f"Area 2: {area2}")
+    logging.info("Area 2: %s", area2)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,50 @@
+"""
+Queue-based (non-blocking) logging with async_logging.py.
+
+The worker threads below only put records on a queue; a background thread
+writes them to a size-rotated file, flushing once per batch of records.
+The same setup_queue_logging() call also accepts 'logging.conf'.
+"""
+import logging
+import threading
+import time
+
+import async_logging
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "custom": {"format": "%(asctime)s - %(threadName)s - %(levelname)s - %(message)s"},
+    },
+    "handlers": {
+        "file": {
+            "class": "async_logging.BatchRotatingFileHandler",
+            "filename": "app_queue.log",
+            "maxBytes": 1_000_000,   # rotate at ~1 MB: app_queue.log.1, .2, .3
+            "backupCount": 3,
+            "formatter": "custom",
+        },
+    },
+    "root": {"level": "INFO", "handlers": ["file"]},
+}
+
+# policy="block": never lose a record; "drop": never wait for the disk
+listener = async_logging.setup_queue_logging(LOGGING, queue_size=10_000, policy="block")
+
+
+def process_rows(batch_id, rows):
+    for row in range(rows):
+        logging.info("batch %d: processed row %d", batch_id, row)
+
+
+start = time.perf_counter()
+threads = [threading.Thread(target=process_rows, args=(i, 20_000)) for i in range(4)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+print(f"Workers finished logging in {time.perf_counter() - start:.2f}s")
+
+listener.stop()  # write everything still in the queue
+print(f"All records written in {time.perf_counter() - start:.2f}s (see app_queue.log)")
@@ -0,0 +1,133 @@
+"""
+Structured, lazily formatted logging.
+
+    from structured_logging import get_logger, lazy
+    log = get_logger(__name__)
+    log.debug("calculating area", length=length, width=width)
+    log.info("rows loaded", rows=len(df), summary=lazy(df.describe))
+
+Nothing is formatted for a call whose level is disabled, but Python packs
+the keyword fields into a dict before the level can be checked, so a
+disabled log.debug(..., k=v) costs about as much as building an f-string
+(see bench_logging.py). It is meant for readable, machine-parsable
+events, not for hot loops; there, guard the call with a flag, which
+costs about as much as a disabled %-style call:
+
+    if log.debug_enabled:
+        log.debug("row parsed", row=i, fields=len(values))
+
+For enabled
+calls the fields are kept on the record (record.fields) and only turned
+into text when a handler formats the record, e.g.
+
+    calculating area length=5 width=10
+
+so JSON formatters can emit them as real fields instead of parsing text.
+lazy(func, *args) wraps an expensive value that is only computed then,
+once per record however many formatters read it.
+The same deferral works with the standard logger and %-style arguments:
+logging.debug("length=%s, width=%s", length, width) (not an f-string).
+"""
+
+import logging
+
+
+class lazy:
+    """A value computed only when a log record is first formatted: lazy(func, *args)."""
+
+    __slots__ = ("func", "args", "_text")
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            self._text = str(self.func(*self.args))
+        return self._text
+
+    __repr__ = __str__
+
+
+class StructuredMessage:
+    """Event name plus fields; rendered as "event key=value ..." when first needed."""
+
+    __slots__ = ("event", "fields", "_text")
+
+    def __init__(self, event, fields):
+        self.event = event
+        self.fields = fields
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            pairs = " ".join(f"{key}={value}" for key, value in self.fields.items())
+            self._text = f"{self.event} {pairs}" if pairs else str(self.event)
+        return self._text
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """
+    Logger adapter taking fields as keyword arguments. Context fields given
+    to the adapter (get_logger(name, job="daily")) are added to every record.
+    """
+
+    def __init__(self, logger, context=None):
+        super().__init__(logger, context or {})
+        self.is_enabled_for = logger.isEnabledFor  # the logger caches the answer per level
+
+    def _log_fields(self, level, event, fields):
+        exc_info = fields.pop("exc_info", None)
+        stack_info = fields.pop("stack_info", False)
+        if self.extra:
+            fields = {**self.extra, **fields}
+        # stacklevel=3: report the caller of debug()/info(), not this module
+        self.logger.log(level, StructuredMessage(event, fields), exc_info=exc_info,
+                        extra={"fields": fields}, stack_info=stack_info, stacklevel=3)
+
+    # Level flags for guarding hot-path calls (no keyword fields packed when off)
+    @property
+    def debug_enabled(self):
+        return self.is_enabled_for(logging.DEBUG)
+
+    @property
+    def info_enabled(self):
+        return self.is_enabled_for(logging.INFO)
+
+    def log(self, level, event, **fields):
+        if self.is_enabled_for(level):
+            self._log_fields(level, event, fields)
+
+    def debug(self, event, **fields):
+        if self.is_enabled_for(logging.DEBUG):
+            self._log_fields(logging.DEBUG, event, fields)
+
+    def info(self, event, **fields):
+        if self.is_enabled_for(logging.INFO):
+            self._log_fields(logging.INFO, event, fields)
+
+    def warning(self, event, **fields):
+        if self.is_enabled_for(logging.WARNING):
+            self._log_fields(logging.WARNING, event, fields)
+
+    def error(self, event, **fields):
+        if self.is_enabled_for(logging.ERROR):
+            self._log_fields(logging.ERROR, event, fields)
+
+    def exception(self, event, **fields):
+        if self.is_enabled_for(logging.ERROR):
+            fields.setdefault("exc_info", True)
+            self._log_fields(logging.ERROR, event, fields)
+
+    def critical(self, event, **fields):
+        if self.is_enabled_for(logging.CRITICAL):
+            self._log_fields(logging.CRITICAL, event, fields)
+
+    def bind(self, **context):
+        """A logger adding `context` fields to every record."""
+        return StructuredLogger(self.logger, {**self.extra, **context})
+
+
+def get_logger(name=None, **context):
+    return StructuredLogger(logging.getLogger(name), context)
@@ -0,0 +1,272 @@
+# ride_aggregates.py
+"""
+Pre-aggregated ride cube for streamlit_2.py.
+
+The rides are counted once at load into a
+(Date x Hour x Source_Zone x Destination_Zone x Ride_Status x Rating) cube,
+with Cancelled_By kept alongside the status for the cancellation chart.
+Each chart only needs a few of those dimensions, so the cube is stored as
+date-keyed roll-ups (one small table per group of charts). The date filter
+slices the roll-ups with a binary search on Date, and every chart is a
+group-by over at most (days x zones x zones) rows, whatever the ride count.
+
+The financial and duration charts get the same treatment: per-day counts in
+fixed-width histogram bins, and per-day sufficient statistics of the
+fare-vs-distance regression, so their payloads and fitting cost stay
+bounded too.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from ride_cache import DAYS_ORDER
+
+CUBE_DIMENSIONS = ['Date', 'Hour_of_Day', 'Source_Zone', 'Destination_Zone',
+                   'Ride_Status', 'Cancelled_By', 'Driver_Rating_by_Customer']
+
+# Roll-ups of the cube, each sorted by Date
+ROLLUPS = {
+    'status': ['Date', 'Ride_Status', 'Cancelled_By'],  # totals, daily volume, statuses, cancellations
+    'hour': ['Date', 'Hour_of_Day'],
+    'route': ['Date', 'Source_Zone', 'Destination_Zone'],
+    'rating': ['Date', 'Driver_Rating_by_Customer'],
+}
+MEASURES = ['Rides', 'Fare_Count', 'Fare_Sum', 'Duration_Sum']
+
+# Fixed-width bins anchored at 0: (bin width, completed rides only)
+HISTOGRAMS = {
+    'Fare': (1.0, True),
+    'Distance_Miles': (0.25, True),
+    'Ride_Duration_Minutes': (1.0, False),
+}
+FIT_X, FIT_Y = 'Distance_Miles', 'Fare'
+
+CUBE_VERSION = 2  # bump when the cached roll-ups change (v2: histograms and fit statistics)
+
+
+def build_cube(df):
+    """Count rides and sum fares/durations per cube cell (one pass over the rides)."""
+    return (
+        df.groupby(CUBE_DIMENSIONS, observed=True, dropna=False)
+        .agg(Rides=('Fare', 'size'),
+             Fare_Count=('Fare', 'count'),
+             Fare_Sum=('Fare', 'sum'),
+             Duration_Sum=('Ride_Duration_Minutes', 'sum'))
+        .reset_index()
+    )
+
+
+def rollup(table, dimensions):
+    """Sum the measures over every dimension not in `dimensions`."""
+    return (
+        table.groupby(dimensions, observed=True, dropna=False, sort=True)[MEASURES]
+        .sum()
+        .reset_index()
+    )
+
+
+def build_histograms(df):
+    """Per-day ride counts per (measure, bin) for the HISTOGRAMS columns."""
+    completed = df['Ride_Status'] == 'Completed'
+    tables = []
+    for measure, (width, completed_only) in HISTOGRAMS.items():
+        rides = df.loc[completed, ['Date', measure]] if completed_only else df[['Date', measure]]
+        rides = rides.dropna()
+        bins = np.floor(rides[measure].to_numpy() / width).astype('int64')
+        counts = rides.groupby(['Date', bins]).size().rename('Count').reset_index()
+        counts.columns = ['Date', 'Bin', 'Count']
+        counts.insert(1, 'Measure', measure)
+        tables.append(counts)
+    histograms = pd.concat(tables, ignore_index=True)
+    histograms['Measure'] = histograms['Measure'].astype('category')
+    return histograms.sort_values(['Date', 'Measure', 'Bin'], ignore_index=True)
+
+
+def build_fit_stats(df):
+    """Per-day sufficient statistics for a least-squares fit of FIT_Y on FIT_X (completed rides)."""
+    rides = df.loc[df['Ride_Status'] == 'Completed', ['Date', FIT_X, FIT_Y]].dropna()
+    x, y = rides[FIT_X], rides[FIT_Y]
+    rides = rides.assign(XX=x * x, XY=x * y)
+    return (
+        rides.groupby('Date')
+        .agg(N=(FIT_X, 'size'), Sum_X=(FIT_X, 'sum'), Sum_Y=(FIT_Y, 'sum'),
+             Sum_XX=('XX', 'sum'), Sum_XY=('XY', 'sum'),
+             Min_X=(FIT_X, 'min'), Max_X=(FIT_X, 'max'))
+        .reset_index()
+    )
+
+
+def concat_tables(a, b):
+    """pd.concat of two tables that keeps categorical columns categorical (union of the categories)."""
+    table = pd.concat([a, b], ignore_index=True)
+    for column in table.columns:
+        if isinstance(a[column].dtype, pd.CategoricalDtype) and table[column].dtype != a[column].dtype:
+            table[column] = table[column].astype('category')
+    return table
+
+
+def merge_rollups(a, b):
+    """
+    Roll-ups of the rides counted in `a` plus those counted in `b`.
+
+    Every measure is a count or a sum, so the merge is a group-by over the two
+    (small) tables: its cost depends on the roll-up sizes, not the ride count.
+    """
+    merged = {name: rollup(concat_tables(a[name], b[name]), dims) for name, dims in ROLLUPS.items()}
+    merged['histogram'] = (
+        concat_tables(a['histogram'], b['histogram'])
+        .groupby(['Date', 'Measure', 'Bin'], observed=True, sort=True)['Count'].sum()
+        .reset_index()
+    )
+    merged['fit'] = (
+        pd.concat([a['fit'], b['fit']], ignore_index=True)
+        .groupby('Date')
+        .agg(N=('N', 'sum'), Sum_X=('Sum_X', 'sum'), Sum_Y=('Sum_Y', 'sum'),
+             Sum_XX=('Sum_XX', 'sum'), Sum_XY=('Sum_XY', 'sum'),
+             Min_X=('Min_X', 'min'), Max_X=('Max_X', 'max'))
+        .reset_index()
+    )
+    return merged
+
+
+def sample_positions(positions, k, seed=0):
+    """Uniform random sample of k row positions (keeps the point density), in row order."""
+    if len(positions) <= k:
+        return positions
+    picked = np.random.default_rng(seed).choice(len(positions), size=k, replace=False)
+    picked.sort()
+    return positions[picked]
+
+
+def slice_dates(table, start, end):
+    """Rows of a Date-sorted table with start <= Date < end, as a view (binary search)."""
+    dates = table['Date'].to_numpy()
+    lo, hi = np.searchsorted(dates, [np.datetime64(start), np.datetime64(end)])
+    return table.iloc[lo:hi]
+
+
+class RideCube:
+    """Date-keyed roll-ups of the ride cube plus the chart queries over them."""
+
+    def __init__(self, rollups):
+        self.rollups = rollups
+
+    @classmethod
+    def from_rides(cls, df):
+        cube = build_cube(df)
+        rollups = {name: rollup(cube, dims) for name, dims in ROLLUPS.items()}
+        rollups['histogram'] = build_histograms(df)
+        rollups['fit'] = build_fit_stats(df)
+        return cls(rollups)
+
+    def merge(self, other):
+        """Cube of the rides in both cubes (e.g. the stored history plus a new delta)."""
+        return RideCube(merge_rollups(self.rollups, other.rollups))
+
+    def slice(self, start, end):
+        """Cube restricted to start <= Date < end."""
+        return RideCube({name: slice_dates(table, start, end) for name, table in self.rollups.items()})
+
+    def date_range(self):
+        dates = self.rollups['status']['Date']
+        return dates.min(), dates.max()
+
+    # --- Queries used by the dashboard tabs ---
+    def is_empty(self):
+        return self.rollups['status'].empty
+
+    def summary(self):
+        status = self.rollups['status']
+        completed = status[status['Ride_Status'] == 'Completed']
+        total_rides = int(status['Rides'].sum())
+        fare_count = completed['Fare_Count'].sum()
+        cancelled_rides = total_rides - int(completed['Rides'].sum())
+        return {
+            'total_rides': total_rides,
+            'total_revenue': completed['Fare_Sum'].sum(),
+            'average_fare': completed['Fare_Sum'].sum() / fare_count if fare_count else None,
+            'average_duration': status['Duration_Sum'].sum() / total_rides if total_rides else None,
+            'cancellation_rate': cancelled_rides / total_rides * 100 if total_rides else 0,
+        }
+
+    def daily_volume(self):
+        return self.rollups['status'].groupby('Date')['Rides'].sum().reset_index()
+
+    def rides_by_hour(self):
+        rides = self.rollups['hour'].groupby('Hour_of_Day')['Rides'].sum()
+        return rides.rename('Number of Rides').reset_index()
+
+    def rides_by_day_of_week(self):
+        status = self.rollups['status']
+        day_names = pd.Categorical.from_codes(status['Date'].dt.dayofweek.to_numpy(), categories=DAYS_ORDER, ordered=True)
+        rides = status['Rides'].groupby(day_names, observed=False).sum()
+        return rides.rename_axis('Day_of_Week').rename('Number of Rides').reset_index()
+
+    def top_zones(self, column, n):
+        rides = self.rollups['route'].groupby(column, observed=True)['Rides'].sum().nlargest(n)
+        return rides.rename_axis('Zone').rename('Number of Rides').reset_index()
+
+    def top_routes(self, n):
+        rides = (self.rollups['route']
+                 .groupby(['Source_Zone', 'Destination_Zone'], observed=True)['Rides'].sum()
+                 .nlargest(n))
+        routes = [f"{source} to {destination}" for source, destination in rides.index]
+        return pd.DataFrame({'Route': routes, 'Number of Rides': rides.to_numpy()})
+
+    def rating_distribution(self):
+        ratings = self.rollups['rating'].groupby('Driver_Rating_by_Customer')['Rides'].sum()
+        return ratings.rename_axis('Rating').rename('Count').reset_index()
+
+    def status_counts(self):
+        statuses = self.rollups['status'].groupby('Ride_Status', observed=True)['Rides'].sum()
+        return statuses.sort_values(ascending=False).rename('Count').reset_index()
+
+    def cancellation_reasons(self):
+        status = self.rollups['status']
+        cancelled = status[status['Ride_Status'] != 'Completed']
+        reasons = (cancelled.groupby('Cancelled_By', observed=True, dropna=False)['Rides'].sum()
+                   .sort_values(ascending=False).rename('Count').reset_index())
+        reasons['Cancelled_By'] = reasons['Cancelled_By'].astype(object).fillna('Unknown')
+        return reasons
+
+    def completed_rides(self):
+        status = self.rollups['status']
+        return int(status.loc[status['Ride_Status'] == 'Completed', 'Rides'].sum())
+
+    def histogram(self, measure, nbins):
+        histograms = self.rollups['histogram']
+        counts = histograms[histograms['Measure'] == measure].groupby('Bin')['Count'].sum()
+        return merge_bins(counts, HISTOGRAMS[measure][0], nbins)
+
+    def fare_distance_fit(self):
+        """Closed-form least-squares line FIT_Y = intercept + slope * FIT_X, or None."""
+        fit = self.rollups['fit']
+        return fit_from_sums(*(fit[c].sum() for c in ['N', 'Sum_X', 'Sum_Y', 'Sum_XX', 'Sum_XY']),
+                             fit['Min_X'].min(), fit['Max_X'].max())
+
+
+def merge_bins(counts, width, nbins):
+    """
+    Histogram table from counts per fixed-width bin number, merging adjacent
+    bins so that about `nbins` bars cover the observed range.
+    """
+    if counts.empty:
+        return pd.DataFrame(columns=['Bin_Start', 'Bin_End', 'Count'])
+    first, last = counts.index.min(), counts.index.max()
+    factor = max(1, math.ceil((last - first + 1) / nbins))
+    merged = counts.groupby((counts.index - first) // factor).sum()
+    bin_start = (first + merged.index.to_numpy() * factor) * width
+    return pd.DataFrame({'Bin_Start': bin_start, 'Bin_End': bin_start + factor * width, 'Count': merged.to_numpy()})
+
+
+def fit_from_sums(n, sx, sy, sxx, sxy, x_min, x_max):
+    """Least-squares line from its sufficient statistics, or None if it is undefined."""
+    denominator = n * sxx - sx * sx
+    if n < 2 or denominator == 0:
+        return None
+    slope = (n * sxy - sx * sy) / denominator
+    intercept = (sy - slope * sx) / n
+    return {'slope': float(slope), 'intercept': float(intercept), 'n': int(n),
+            'x_min': float(x_min), 'x_max': float(x_max)}
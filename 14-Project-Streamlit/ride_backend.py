@@ -0,0 +1,341 @@
+# ride_backend.py
+"""
+Query backends for the streamlit_2.py dashboard.
+
+Both backends answer the same chart queries for a date range:
+
+    rides = PandasRides(df, cube)         # default: cached frame in memory
+    rides = DuckDBRides("rides.parquet")  # out of core: queries on-disk files
+    view = rides.slice(start, end)
+    view.summary(), view.top_routes(10), view.histogram('Fare', 30), ...
+
+Distinct drivers/customers and the busiest drivers come from per-day
+sketches (see ride_sketches.py) merged over the range, for both backends.
+
+DuckDBRides never loads the rides into pandas. Every other metric is an SQL
+aggregate over Parquet files, with the date filter pushed down so that row
+groups outside the range are skipped. Only the small results reach pandas.
+That lets multi-GB ride histories be served from a host with little RAM.
+CSV sources are converted once to a Parquet file sorted by request time.
+
+DuckDB is optional:  pip install duckdb
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+import ride_aggregates
+import ride_cache
+import ride_sketches
+
+try:
+    import duckdb
+except ImportError:  # only needed for DuckDBRides
+    duckdb = None
+
+SAMPLE_SEED = 0
+SKETCH_BATCH_ROWS = 1_000_000  # rows per batch when DuckDBRides builds its sketches
+
+
+class SketchQueries:
+    """Chart queries answered by the range's merged sketches (set as self.sketches)."""
+
+    def unique_drivers(self):
+        return self.sketches.unique_drivers()
+
+    def unique_customers(self):
+        return self.sketches.unique_customers()
+
+    def top_drivers(self, n):
+        return self.sketches.top_drivers(n)
+
+
+# --- In-memory backend (pandas) ---
+class PandasRides:
+    """The cached ride frame, its request-time index, its cube and its sketches."""
+
+    def __init__(self, df, cube, sketches=None):
+        self.df = df
+        self.cube = cube
+        self.sketches = sketches if sketches is not None else ride_sketches.RideSketches.from_rides(df)
+        self.index = ride_cache.RideIndex(df)
+
+    def date_range(self):
+        return self.cube.date_range()
+
+    def slice(self, start, end):
+        return PandasRideView(self, start, end)
+
+
+class PandasRideView(SketchQueries, ride_aggregates.RideCube):
+    """Chart queries over the sliced cube (exact top zones and routes) and sketches; the scatter sample comes from the rides."""
+
+    def __init__(self, rides, start, end):
+        super().__init__(rides.cube.slice(start, end).rollups)
+        self.sketches = rides.sketches.slice(start, end)
+        self._df = rides.df
+        self._completed = rides.index.completed_in(rides.index.date_slice(start, end))
+
+    def fare_distance_sample(self, k):
+        positions = ride_aggregates.sample_positions(self._completed, k, SAMPLE_SEED)
+        return self._df[[ride_aggregates.FIT_X, ride_aggregates.FIT_Y]].take(positions)
+
+
+# --- Out-of-core backend (DuckDB) ---
+RIDES_VIEW = """
+CREATE OR REPLACE VIEW rides AS
+SELECT *,
+       CAST(Ride_Request_Time AS DATE) AS Date,
+       hour(Ride_Request_Time) AS Hour_of_Day,
+       coalesce(date_diff('second', Pickup_Time, Dropoff_Time) / 60.0, 0) AS Ride_Duration_Minutes
+FROM {source}
+"""
+
+
+def sql_string(value):
+    """`value` as an SQL string literal. Paths cannot be bound parameters in a view or COPY."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def parquet_source(path):
+    """read_parquet() call for a Parquet file, glob or (hive-partitioned) directory."""
+    path = str(path)
+    if os.path.isdir(path):
+        path = os.path.join(path, "**", "*.parquet")
+    return f"read_parquet({sql_string(path)}, hive_partitioning = true, union_by_name = true)"
+
+
+def csv_to_parquet(csv_path, parquet_path):
+    """One-off conversion of a ride CSV to Parquet sorted by request time (for range pruning)."""
+    parquet_path = Path(parquet_path)
+    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = parquet_path.with_suffix(".tmp")
+    con = duckdb.connect()
+    con.execute(f"""
+        COPY (SELECT * FROM read_csv({sql_string(csv_path)}, header = true, auto_detect = true)
+              ORDER BY Ride_Request_Time)
+        TO {sql_string(tmp_path)} (FORMAT parquet, COMPRESSION zstd)
+    """)
+    con.close()
+    os.replace(tmp_path, parquet_path)
+    return parquet_path
+
+
+def prepare_source(path, cache_dir=ride_cache.CACHE_DIR):
+    """
+    Parquet location to query for a server-side path. A CSV is converted once;
+    the converted file is keyed by the CSV's path, size and modification time.
+    """
+    if str(path).lower().endswith(".csv"):
+        stat = os.stat(path)
+        key = hashlib.blake2b(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode(),
+                              digest_size=16).hexdigest()
+        parquet_path = Path(cache_dir) / f"{key}.parquet"
+        if not parquet_path.exists():
+            csv_to_parquet(path, parquet_path)
+        return parquet_path
+    return path
+
+
+def source_version(path):
+    """
+    Hash of the name, size and modification time of every Parquet file of a
+    source: it changes when files are added, replaced or rewritten.
+    """
+    path = Path(path)
+    files = sorted(path.rglob("*.parquet")) if path.is_dir() else [path]
+    listing = [(str(file.relative_to(path)) if path.is_dir() else file.name, file.stat().st_size,
+                file.stat().st_mtime_ns) for file in files]
+    return hashlib.blake2b(repr(listing).encode(), digest_size=16).hexdigest()
+
+
+def prepare_upload(data, digest, cache_dir=ride_cache.CACHE_DIR):
+    """Parquet file for uploaded CSV bytes, keyed by their content hash."""
+    parquet_path = Path(cache_dir) / f"{digest}.parquet"
+    if not parquet_path.exists():
+        csv_path = Path(cache_dir) / f"{digest}.upload.csv"
+        csv_path.parent.mkdir(parents=True, exist_ok=True)
+        csv_path.write_bytes(data)
+        try:
+            csv_to_parquet(csv_path, parquet_path)
+        finally:
+            csv_path.unlink()
+    return parquet_path
+
+
+class DuckDBRides:
+    """
+    Rides stored in Parquet, queried lazily with DuckDB.
+
+    One connection per dataset; each query runs on its own cursor, so
+    Streamlit sessions on different threads can share it. The per-day
+    sketches are built on first use, in one streaming pass over the rides.
+    """
+
+    def __init__(self, parquet_path, memory_limit=None, threads=None):
+        if duckdb is None:
+            raise ImportError("DuckDBRides needs duckdb: pip install duckdb")
+        self.con = duckdb.connect()
+        if memory_limit:
+            self.con.execute(f"SET memory_limit = {sql_string(memory_limit)}")
+        if threads:
+            self.con.execute(f"SET threads = {int(threads)}")
+        self.con.execute(RIDES_VIEW.format(source=parquet_source(parquet_path)))
+        self._sketches = None
+        self._sketches_lock = threading.Lock()
+
+    def query(self, sql, params=()):
+        return self.con.cursor().execute(sql, list(params)).df()
+
+    def date_range(self):
+        row = self.query("SELECT min(Date) AS first, max(Date) AS last FROM rides").iloc[0]
+        return pd.Timestamp(row['first']), pd.Timestamp(row['last'])
+
+    def slice(self, start, end):
+        return DuckDBRideView(self, start, end)
+
+    def batches(self, columns, batch_rows=SKETCH_BATCH_ROWS):
+        """Yield the rows' `columns` as DataFrames of up to `batch_rows` rows (never the whole table)."""
+        reader = self.con.cursor().execute(f"SELECT {', '.join(columns)} FROM rides").fetch_record_batch(batch_rows)
+        for batch in reader:
+            yield batch.to_pandas()
+
+    def sketches(self):
+        with self._sketches_lock:
+            if self._sketches is None:
+                columns = ['Date'] + list(dict.fromkeys(ride_sketches.DISTINCT_COLUMNS + ride_sketches.TOP_KINDS))
+                frames = (df.assign(Date=pd.to_datetime(df['Date'])) for df in self.batches(columns))
+                self._sketches = ride_sketches.RideSketches.from_batches(frames)
+            return self._sketches
+
+
+class DuckDBRideView(SketchQueries):
+    """The chart queries for start <= Ride_Request_Time < end, as SQL aggregates or merged sketches."""
+
+    WHERE = "Ride_Request_Time >= ? AND Ride_Request_Time < ?"
+    COMPLETED = "Ride_Status = 'Completed'"
+
+    def __init__(self, rides, start, end):
+        self._rides = rides
+        self._params = (pd.Timestamp(start).to_pydatetime(), pd.Timestamp(end).to_pydatetime())
+        self._range = (start, end)
+
+    @property
+    def sketches(self):
+        # Built (once per dataset) only when a sketch query runs
+        return self._rides.sketches().slice(*self._range)
+
+    def _query(self, sql, params=()):
+        return self._rides.query(sql.format(where=self.WHERE, completed=self.COMPLETED), self._params + tuple(params))
+
+    def is_empty(self):
+        return self._query("SELECT count(*) AS n FROM rides WHERE {where}")['n'].iloc[0] == 0
+
+    def summary(self):
+        row = self._query("""
+            SELECT count(*) AS total_rides,
+                   coalesce(sum(Fare) FILTER (WHERE {completed}), 0) AS total_revenue,
+                   avg(Fare) FILTER (WHERE {completed}) AS average_fare,
+                   avg(Ride_Duration_Minutes) AS average_duration,
+                   count(*) FILTER (WHERE Ride_Status IS DISTINCT FROM 'Completed') AS cancelled_rides
+            FROM rides WHERE {where}
+        """).iloc[0]
+        total_rides = int(row['total_rides'])
+        return {
+            'total_rides': total_rides,
+            'total_revenue': float(row['total_revenue']),
+            'average_fare': None if pd.isna(row['average_fare']) else float(row['average_fare']),
+            'average_duration': None if pd.isna(row['average_duration']) else float(row['average_duration']),
+            'cancellation_rate': row['cancelled_rides'] / total_rides * 100 if total_rides else 0,
+        }
+
+    def daily_volume(self):
+        return self._query("SELECT Date, count(*) AS Rides FROM rides WHERE {where} GROUP BY Date ORDER BY Date")
+
+    def rides_by_hour(self):
+        return self._query("""
+            SELECT Hour_of_Day, count(*) AS "Number of Rides"
+            FROM rides WHERE {where} GROUP BY Hour_of_Day ORDER BY Hour_of_Day
+        """)
+
+    def rides_by_day_of_week(self):
+        rides = self._query("""
+            SELECT isodow(Ride_Request_Time) AS day, count(*) AS n
+            FROM rides WHERE {where} GROUP BY day
+        """).set_index('day')['n']
+        counts = [int(rides.get(day, 0)) for day in range(1, 8)]
+        return pd.DataFrame({'Day_of_Week': ride_cache.DAYS_ORDER, 'Number of Rides': counts})
+
+    def top_zones(self, column, n):
+        if column not in ('Source_Zone', 'Destination_Zone'):
+            raise ValueError(f"Unknown zone column: {column}")
+        return self._query(f"""
+            SELECT {column} AS Zone, count(*) AS "Number of Rides"
+            FROM rides WHERE {{where}} AND {column} IS NOT NULL
+            GROUP BY Zone ORDER BY "Number of Rides" DESC LIMIT ?
+        """, [n])
+
+    def top_routes(self, n):
+        return self._query("""
+            SELECT Source_Zone || ' to ' || Destination_Zone AS Route, count(*) AS "Number of Rides"
+            FROM rides WHERE {where} AND Source_Zone IS NOT NULL AND Destination_Zone IS NOT NULL
+            GROUP BY Route ORDER BY "Number of Rides" DESC LIMIT ?
+        """, [n])
+
+    def rating_distribution(self):
+        return self._query("""
+            SELECT Driver_Rating_by_Customer AS Rating, count(*) AS Count
+            FROM rides WHERE {where} AND Driver_Rating_by_Customer IS NOT NULL
+            GROUP BY Rating ORDER BY Rating
+        """)
+
+    def status_counts(self):
+        return self._query("""
+            SELECT Ride_Status, count(*) AS Count
+            FROM rides WHERE {where} AND Ride_Status IS NOT NULL
+            GROUP BY Ride_Status ORDER BY Count DESC
+        """)
+
+    def cancellation_reasons(self):
+        reasons = self._query("""
+            SELECT Cancelled_By, count(*) AS Count
+            FROM rides WHERE {where} AND Ride_Status IS DISTINCT FROM 'Completed'
+            GROUP BY Cancelled_By ORDER BY Count DESC
+        """)
+        reasons['Cancelled_By'] = reasons['Cancelled_By'].astype(object).fillna('Unknown')
+        return reasons
+
+    def completed_rides(self):
+        return int(self._query("SELECT count(*) AS n FROM rides WHERE {where} AND {completed}")['n'].iloc[0])
+
+    def histogram(self, measure, nbins):
+        width, completed_only = ride_aggregates.HISTOGRAMS[measure]
+        completed = "AND {completed}" if completed_only else ""
+        counts = self._query(f"""
+            SELECT CAST(floor({measure} / {float(width)}) AS BIGINT) AS Bin, count(*) AS Count
+            FROM rides WHERE {{where}} {completed} AND {measure} IS NOT NULL
+            GROUP BY Bin ORDER BY Bin
+        """)
+        return ride_aggregates.merge_bins(counts.set_index('Bin')['Count'], width, nbins)
+
+    def fare_distance_fit(self):
+        x, y = ride_aggregates.FIT_X, ride_aggregates.FIT_Y
+        row = self._query(f"""
+            SELECT count(*) AS n, sum({x}) AS sx, sum({y}) AS sy,
+                   sum({x} * {x}) AS sxx, sum({x} * {y}) AS sxy, min({x}) AS x_min, max({x}) AS x_max
+            FROM rides WHERE {{where}} AND {{completed}} AND {x} IS NOT NULL AND {y} IS NOT NULL
+        """).iloc[0]
+        return ride_aggregates.fit_from_sums(row['n'], row['sx'], row['sy'], row['sxx'], row['sxy'],
+                                             row['x_min'], row['x_max'])
+
+    def fare_distance_sample(self, k):
+        x, y = ride_aggregates.FIT_X, ride_aggregates.FIT_Y
+        return self._query(f"""
+            SELECT {x}, {y} FROM (
+                SELECT {x}, {y} FROM rides WHERE {{where}} AND {{completed}}
+            ) USING SAMPLE reservoir({int(k)} ROWS) REPEATABLE ({SAMPLE_SEED})
+        """)
@@ -0,0 +1,155 @@
+# ride_cache.py
+"""
+On-disk cache of the derived ride DataFrame used by streamlit_2.py.
+
+Parsing the CSV (three timestamp columns) and deriving Route / Hour_of_Day /
+Day_of_Week / Date / Ride_Duration_Minutes is the slow part of every upload.
+The derived frame is saved once as an uncompressed Arrow IPC (Feather v2)
+file named after the content hash of the upload, so opening the same file
+again memory-maps the columns instead of re-parsing the CSV.
+
+Needs pyarrow:  pip install pyarrow
+"""
+
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+CACHE_DIR = Path(os.environ.get("RIDE_CACHE_DIR", ".ride_cache"))
+# Server-side files the dashboard may read (watch folders, server paths); unset: none
+DATA_ROOT = Path(os.environ["RIDE_DATA_ROOT"]).resolve() if os.environ.get("RIDE_DATA_ROOT") else None
+CACHE_VERSION = 2  # bump when the cached layout changes (v2: sorted by request time)
+DATE_COLUMNS = ['Ride_Request_Time', 'Pickup_Time', 'Dropoff_Time']
+CATEGORY_COLUMNS = ['Source_Zone', 'Destination_Zone', 'Ride_Status', 'Cancelled_By', 'Driver_ID', 'Customer_ID']
+DAYS_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def file_digest(data):
+    """Content hash of an uploaded file (bytes), used as the cache key."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def derive_columns(df):
+    """Add the dashboard's derived columns, using compact dtypes."""
+    for column in CATEGORY_COLUMNS:
+        if column in df:
+            df[column] = df[column].astype('category')
+    df['Driver_Rating_by_Customer'] = pd.to_numeric(df['Driver_Rating_by_Customer'], downcast='integer')
+
+    # Route from the zone codes: no per-row string concatenation
+    source = df['Source_Zone'].cat
+    destination = df['Destination_Zone'].cat
+    n_destinations = len(destination.categories)
+    route_names = [f"{s} to {d}" for s in source.categories for d in destination.categories]
+    route_codes = source.codes.astype('int64') * n_destinations + destination.codes
+    route_codes = route_codes.where((source.codes >= 0) & (destination.codes >= 0), -1)
+    df['Route'] = pd.Categorical.from_codes(route_codes.to_numpy(), categories=route_names).remove_unused_categories()
+
+    request_time = df['Ride_Request_Time'].dt
+    df['Hour_of_Day'] = request_time.hour.astype('int8')
+    df['Day_of_Week'] = pd.Categorical.from_codes(request_time.dayofweek.to_numpy(), categories=DAYS_ORDER, ordered=True)
+    df['Date'] = request_time.normalize()  # For daily aggregation
+
+    # ✅ Add Ride Duration safely (only if Pickup & Dropoff are valid)
+    df['Ride_Duration_Minutes'] = (df['Dropoff_Time'] - df['Pickup_Time']).dt.total_seconds() / 60
+    df['Ride_Duration_Minutes'] = df['Ride_Duration_Minutes'].fillna(0)
+    return df
+
+
+def data_path(path, data_root=DATA_ROOT):
+    """
+    `path` (absolute, or relative to the data root) resolved inside the data
+    root. Raise ValueError if there is no data root or the path leaves it.
+    """
+    if data_root is None:
+        raise ValueError("server-side files are disabled (set RIDE_DATA_ROOT)")
+    resolved = (Path(data_root) / path).resolve()  # an absolute `path` replaces the root
+    if not resolved.is_relative_to(data_root):
+        raise ValueError(f"{path} is outside the data root {data_root}")
+    return resolved
+
+
+def parse_csv(data):
+    df = pd.read_csv(io.BytesIO(data), parse_dates=DATE_COLUMNS)
+    # Keep rides sorted by request time so date filters are binary searches
+    df = df.sort_values('Ride_Request_Time', kind='stable', ignore_index=True)
+    return derive_columns(df)
+
+
+def cache_path(digest, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / f"{digest}.v{CACHE_VERSION}.arrow"
+
+
+def load_rides(data, digest=None, cache_dir=CACHE_DIR):
+    """
+    Return the derived ride frame for the uploaded bytes `data`, sorted by
+    Ride_Request_Time.
+
+    A cache hit memory-maps the Arrow file; a miss parses the CSV and writes
+    the cache (to a temp file first, so a half-written file is never read).
+    """
+    digest = digest or file_digest(data)
+    path = cache_path(digest, cache_dir)
+    if path.exists():
+        table = feather.read_table(path, memory_map=True)
+        return table.to_pandas(split_blocks=True)
+
+    df = parse_csv(data)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    feather.write_feather(df, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    return df
+
+
+class RideIndex:
+    """
+    Positions into a ride frame sorted by Ride_Request_Time.
+
+    A date filter becomes a binary search that yields a row slice (a view,
+    no boolean mask or copy), and completed rides are a precomputed array of
+    row positions rather than a filtered copy of the frame.
+    """
+
+    def __init__(self, df):
+        self.request_times = df['Ride_Request_Time'].to_numpy()
+        self.completed = np.flatnonzero((df['Ride_Status'] == 'Completed').to_numpy())
+
+    def date_slice(self, start, end):
+        """Rows with start <= Ride_Request_Time < end."""
+        lo, hi = np.searchsorted(self.request_times, [np.datetime64(start), np.datetime64(end)])
+        return slice(int(lo), int(hi))
+
+    def completed_in(self, rows):
+        """Positions of the completed rides inside the row slice `rows`."""
+        lo, hi = np.searchsorted(self.completed, [rows.start, rows.stop])
+        return self.completed[lo:hi]
+
+
+def cached_tables(digest, name, build, cache_dir=CACHE_DIR):
+    """
+    Dict of DataFrames derived from an upload, cached next to it as
+    <digest>.<name>.<key>.arrow. `build()` is only called on a cache miss.
+    The key list is written last, so a partially written set is rebuilt.
+    """
+    index_path = Path(cache_dir) / f"{digest}.{name}.json"
+    if index_path.exists():
+        keys = json.loads(index_path.read_text())
+        return {
+            key: feather.read_table(Path(cache_dir) / f"{digest}.{name}.{key}.arrow", memory_map=True).to_pandas()
+            for key in keys
+        }
+
+    tables = build()
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    for key, table in tables.items():
+        feather.write_feather(table.reset_index(drop=True), Path(cache_dir) / f"{digest}.{name}.{key}.arrow",
+                              compression="uncompressed")
+    index_path.write_text(json.dumps(list(tables)))
+    return tables
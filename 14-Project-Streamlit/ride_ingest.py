@@ -0,0 +1,311 @@
+# ride_ingest.py
+"""
+Incremental ingestion of a growing ride log for streamlit_2.py.
+
+Instead of re-uploading the whole history, point the dashboard (or a cron
+job) at a folder of ride CSV files:
+
+    python ride_ingest.py rides/            # ingest what is new, e.g. hourly
+    python ride_ingest.py rides/ --rebuild  # start the store from scratch
+
+New files are parsed whole; files that grew since the last refresh (a log
+that is appended to) are parsed from the byte offset where the previous
+refresh stopped. Each delta is saved as one more Arrow part of the store,
+and its cube and per-day sketches are merged into the stored ones, so a
+refresh costs time in proportion to the new rows. Uploaded delta files can be appended as well.
+
+Store layout (under .ride_cache/ingest/<folder hash>/ by default):
+
+    manifest.json             sources with their offsets, parts, cube generation
+    part-000001.arrow ...     derived rides of each delta (memory-mapped on load)
+    cube-<gen>.<key>.arrow    merged cube roll-ups
+    sketch-<gen>.<key>.arrow  merged per-day sketches (ride_sketches.py)
+
+The manifest is written last, so an interrupted refresh leaves the previous
+state in place. Run one writer per store at a time.
+
+If a watched file is rewritten rather than appended to, the store is
+rebuilt from the folder. Deltas appended with append_bytes() are kept
+through the rebuild, and the generation number keeps increasing, so
+caches keyed by (folder, generation) never see an old number again. The
+rebuild is logged and described in RideStore.last_rebuild until the next
+refresh.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+import ride_aggregates
+import ride_cache
+import ride_sketches
+
+INGEST_DIR = ride_cache.CACHE_DIR / "ingest"
+TAIL_CHECK_BYTES = 4096  # bytes before the stored offset that must be unchanged for a resume
+UPLOAD_PREFIX = "upload:"  # source keys of append_bytes() deltas, e.g. "upload:<content hash>"
+
+logger = logging.getLogger(__name__)
+
+
+def store_dir_for(watch_dir, ingest_dir=INGEST_DIR):
+    key = hashlib.blake2b(os.path.abspath(watch_dir).encode(), digest_size=8).hexdigest()
+    return Path(ingest_dir) / key
+
+
+def file_tail_hash(path, offset):
+    """Hash of the bytes just before `offset`: they change if the file was rewritten rather than appended to."""
+    start = max(0, offset - TAIL_CHECK_BYTES)
+    with open(path, "rb") as f:
+        f.seek(start)
+        return hashlib.blake2b(f.read(offset - start), digest_size=16).hexdigest()
+
+
+def parse_delta(data):
+    df = ride_cache.parse_csv(data)
+    # A column that is empty in this delta gets no string categories; give it
+    # some, so Arrow can concatenate the parts' dictionaries
+    for column in df.select_dtypes('category'):
+        categories = df[column].cat.categories
+        if categories.dtype == float and len(categories) == 0:
+            df[column] = df[column].cat.set_categories(categories.astype(str))
+    return df
+
+
+def write_arrow(df, path):
+    tmp_path = path.with_suffix(".tmp")
+    feather.write_feather(df.reset_index(drop=True), tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+
+
+class RideStore:
+    """Derived rides, their cube and their sketches, appended to one delta at a time."""
+
+    def __init__(self, store_dir):
+        self.store_dir = Path(store_dir)
+        self.lock = threading.RLock()  # Streamlit sessions share one store object
+        self.manifest = self._read_manifest()
+        self.last_rebuild = None  # message about a rebuild by the last refresh, for the UI
+        self._table = None  # (generation, Arrow table of the parts, number of parts in it)
+        self._rides = None  # (generation, rides frame)
+
+    def _read_manifest(self):
+        path = self.store_dir / "manifest.json"
+        if path.exists():
+            return json.loads(path.read_text())
+        return {"generation": 0, "sources": {}, "parts": [], "part_sources": {}, "rows": 0,
+                "cube_keys": [], "sketch_keys": [], "sketch_version": ride_sketches.SKETCH_VERSION}
+
+    @property
+    def generation(self):
+        return self.manifest["generation"]
+
+    # --- Reading ---
+    def rides(self):
+        """
+        All stored rides as one frame sorted by Ride_Request_Time (None while the store is empty).
+        The frame is built once per generation and shared by the callers: do not modify it.
+        """
+        with self.lock:
+            if self._rides is None or self._rides[0] != self.generation:
+                table = self._rides_table()
+                df = None
+                if table is not None:
+                    df = table.to_pandas(split_blocks=True)
+                    if not df['Ride_Request_Time'].is_monotonic_increasing:  # deltas that overlap in time
+                        df = df.sort_values('Ride_Request_Time', kind='stable', ignore_index=True)
+                self._rides = self.generation, df
+            return self._rides[1]
+
+    def _rides_table(self):
+        """The parts as one Arrow table; only the parts appended since the previous call are read."""
+        parts = self.manifest["parts"]
+        generation, table, count = self._table or (None, None, 0)
+        if generation != self.generation:
+            table, count = None, 0
+        new = [feather.read_table(self.store_dir / part, memory_map=True) for part in parts[count:]]
+        if new:
+            # Arrow unifies the per-part categories into one categorical per column
+            table = pa.concat_tables(([table] if table is not None else []) + new, promote_options="permissive")
+        self._table = self.generation, table, len(parts)
+        return table
+
+    def cube(self):
+        keys = self.manifest["cube_keys"]
+        return ride_aggregates.RideCube({
+            key: feather.read_table(self._cube_path(self.generation, key), memory_map=True).to_pandas()
+            for key in keys
+        })
+
+    def _cube_path(self, generation, key):
+        return self.store_dir / f"cube-{generation}.{key}.arrow"
+
+    def sketches(self):
+        if self.manifest.get("sketch_version") != ride_sketches.SKETCH_VERSION:  # missing or older sketches
+            return ride_sketches.RideSketches.from_rides(self.rides())
+        return ride_sketches.RideSketches({
+            key: feather.read_table(self._sketch_path(self.generation, key)).to_pandas()
+            for key in self.manifest["sketch_keys"]
+        })
+
+    def _sketch_path(self, generation, key):
+        return self.store_dir / f"sketch-{generation}.{key}.arrow"
+
+    # --- Appending ---
+    def refresh(self, watch_dir):
+        """Ingest new files and new rows of grown files in `watch_dir`; return the number of new rows."""
+        with self.lock:
+            self.last_rebuild = None
+            deltas = []
+            for path in sorted(Path(watch_dir).glob("*.csv")):
+                delta = self._read_delta(path)
+                if delta is None:
+                    continue
+                if delta is False:  # rewritten, not appended to: start again
+                    kept = self._reset()
+                    new_rows = self.refresh(watch_dir)
+                    self.last_rebuild = (f"{path.name} was rewritten, so the store was rebuilt from the folder "
+                                         f"(kept {kept} uploaded delta(s))")
+                    logger.warning(self.last_rebuild)
+                    return new_rows
+                deltas.append(delta)
+            return self._ingest(deltas)
+
+    def append_bytes(self, data, source):
+        """Ingest one delta CSV given as bytes, once per `source` key; return the number of new rows."""
+        with self.lock:
+            if source in self.manifest["sources"]:
+                return 0
+            header = data[:data.find(b"\n") + 1]
+            state = {"offset": len(data), "header": header.decode("utf-8"), "tail": None}
+            return self._ingest([(source, state, data)])
+
+    def rebuild(self, watch_dir):
+        with self.lock:
+            self._reset()
+        return self.refresh(watch_dir)
+
+    def _reset(self):
+        """
+        Drop every part read from the folder, keeping the uploaded deltas.
+        The empty store gets a new generation; return the number of kept uploads.
+        """
+        old = self.manifest
+        part_sources = old.get("part_sources")
+        if part_sources is None and old["parts"]:  # store written before parts recorded their source
+            logger.warning("%s: uploaded deltas cannot be told apart and are dropped", self.store_dir)
+            part_sources = {}
+        uploads = [(source, old["sources"][source], feather.read_table(self.store_dir / part).to_pandas())
+                   for part, source in (part_sources or {}).items() if source.startswith(UPLOAD_PREFIX)]
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+        self.manifest = self._read_manifest()
+        self.manifest["generation"] = old["generation"] + 1
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self._write_manifest(self.manifest)
+        self._ingest(uploads)
+        return len(uploads)
+
+    def _write_manifest(self, manifest):
+        tmp_path = self.store_dir / "manifest.json.tmp"
+        tmp_path.write_text(json.dumps(manifest, indent=1))
+        os.replace(tmp_path, self.store_dir / "manifest.json")
+
+    def _read_delta(self, path):
+        """(source, new state, CSV bytes) for the unread rows of `path`, None if there are none, False if rewritten."""
+        source = str(path.resolve())
+        state = self.manifest["sources"].get(source)
+        offset = state["offset"] if state else 0
+        if path.stat().st_size < offset or (state and file_tail_hash(path, offset) != state["tail"]):
+            return False
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        if state:
+            header = state["header"].encode("utf-8")
+        else:
+            header = data[:data.find(b"\n") + 1]
+            if not header:  # header not written yet
+                return None
+            data = data[len(header):]
+        # Only whole lines: a row still being written is picked up next time
+        data = data[:data.rfind(b"\n") + 1]
+        if not data and state:
+            return None
+        offset += len(data) + (0 if state else len(header))
+        new_state = {"offset": offset, "header": header.decode("utf-8"), "tail": file_tail_hash(path, offset)}
+        return source, new_state, header + data
+
+    def _ingest(self, deltas):
+        """
+        Write a part per delta (CSV bytes, or an already parsed frame), merge
+        their cubes and sketches into the stored ones, then commit the manifest.
+        """
+        if not deltas:
+            return 0
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        manifest = json.loads(json.dumps(self.manifest))  # working copy
+        cube = self.cube() if manifest["parts"] else None
+        sketches = [self.sketches()] if manifest["parts"] else []
+        new_rows = 0
+        for source, state, data in deltas:
+            manifest["sources"][source] = state
+            if isinstance(data, bytes):
+                if not data.partition(b"\n")[2].strip():  # header only
+                    continue
+                df = parse_delta(data)
+            else:
+                df = data
+            part = f"part-{len(manifest['parts']) + 1:06d}.arrow"
+            write_arrow(df, self.store_dir / part)
+            manifest["parts"].append(part)
+            manifest.setdefault("part_sources", {})[part] = source
+            delta_cube = ride_aggregates.RideCube.from_rides(df)
+            cube = delta_cube if cube is None else cube.merge(delta_cube)
+            sketches.append(ride_sketches.RideSketches.from_rides(df))
+            new_rows += len(df)
+
+        old_generation = manifest["generation"]
+        manifest["generation"] = old_generation + 1
+        manifest["rows"] += new_rows
+        if cube is not None:
+            manifest["cube_keys"] = list(cube.rollups)
+            for key, table in cube.rollups.items():
+                write_arrow(table, self._cube_path(manifest["generation"], key))
+            merged = ride_sketches.RideSketches.merge_all(sketches)
+            manifest["sketch_keys"] = list(merged.tables)
+            manifest["sketch_version"] = ride_sketches.SKETCH_VERSION
+            for key, table in merged.tables.items():
+                write_arrow(table, self._sketch_path(manifest["generation"], key))
+
+        self._write_manifest(manifest)
+        self.manifest = manifest
+        if self._table is not None and self._table[0] == old_generation:  # parts were only appended
+            self._table = (manifest["generation"],) + self._table[1:]
+        for key in self.manifest["cube_keys"]:
+            self._cube_path(old_generation, key).unlink(missing_ok=True)
+        for key in self.manifest["sketch_keys"]:
+            self._sketch_path(old_generation, key).unlink(missing_ok=True)
+        return new_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append new ride CSV rows to the dashboard's store.")
+    parser.add_argument("watch_dir", help="folder of ride CSV files")
+    parser.add_argument("--store", default=None, help="store folder (default: under .ride_cache/ingest)")
+    parser.add_argument("--rebuild", action="store_true", help="drop the store and ingest everything again")
+    args = parser.parse_args()
+
+    store = RideStore(args.store or store_dir_for(args.watch_dir))
+    new_rows = store.rebuild(args.watch_dir) if args.rebuild else store.refresh(args.watch_dir)
+    print(f"✅  Ingested {new_rows} new rows ({store.manifest['rows']} in total) into {store.store_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+# ride_sketches.py
+"""
+Per-day probabilistic sketches of the rides for streamlit_2.py.
+
+    sketches = RideSketches.from_rides(df)          # or from_batches(frames)
+    view = sketches.slice(start, end)                # merges the per-day sketches
+    view.unique_drivers(), view.unique_customers(), view.top_drivers(10)
+
+Distinct drivers and customers are not additive (the same driver works many
+days), so the cube cannot answer them, and the busiest drivers would need a
+count per (day, driver), which grows with the fleet. Both are kept as small
+per-day sketches:
+
+- HyperLogLog (2**HLL_PRECISION one-byte registers per day and column) for
+  the number of distinct Driver_ID / Customer_ID values, with a standard
+  error of about 1.04 / sqrt(registers), i.e. 1.6%. Two sketches merge with
+  an element-wise max, so a date range is the max over its days.
+- Space-Saving summaries (at most TOP_CAPACITY items per day) for the
+  busiest drivers. Each kept item has a
+  counted lower bound (Count) and an upper bound on what it may have missed
+  (Error); Floor bounds the count of any item that was not kept. Summaries
+  of different days or of different parts of the same day merge by adding
+  counts and bounds, then keeping the TOP_CAPACITY largest again.
+
+Zones and routes are not sketched: there are few of them (the route
+roll-up of the cube has at most zones x zones rows per day), so their
+top-N lists are counted exactly from the cube.
+
+Both are stored as Date-sorted tables, like the cube's roll-ups, so they are
+cached with the cube, sliced with the same binary search, and merged into
+the incremental store delta by delta. A query over any date range costs
+(days x sketch size), whatever the number of rides.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from ride_aggregates import slice_dates
+
+HLL_PRECISION = 12  # 4096 registers (4 KB) per day and column
+HLL_REGISTERS = 1 << HLL_PRECISION
+DISTINCT_COLUMNS = ['Driver_ID', 'Customer_ID']
+TOP_CAPACITY = 200  # items kept per day and kind
+TOP_KINDS = ['Driver_ID']  # unbounded domains only; zones and routes are exact in the cube
+
+SKETCH_VERSION = 2  # bump when the cached sketch tables change (v2: drivers, not zones and routes)
+
+
+# --- HyperLogLog ---
+def hash_values(values):
+    """64-bit hashes of a column's values; categoricals hash each category once."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        hashes = pd.util.hash_array(values.cat.categories.to_numpy(dtype=object))
+        return hashes[codes[codes >= 0]]
+    values = values.dropna().to_numpy(dtype=object)
+    return pd.util.hash_array(values)
+
+
+def hll_registers(groups, hashes, n_groups):
+    """HLL registers (n_groups x HLL_REGISTERS, uint8) of the hashes of each group."""
+    index = (hashes >> np.uint64(64 - HLL_PRECISION)).astype(np.int64)
+    rest = hashes & np.uint64((1 << (64 - HLL_PRECISION)) - 1)
+    # Rank = position of the first 1 bit in the remaining bits; frexp gives the
+    # bit length exactly since the remaining bits fit in a double's mantissa
+    _, bit_length = np.frexp(rest.astype(np.float64))
+    ranks = (64 - HLL_PRECISION + 1 - bit_length).astype(np.uint8)
+    registers = np.zeros(n_groups * HLL_REGISTERS, dtype=np.uint8)
+    np.maximum.at(registers, groups * HLL_REGISTERS + index, ranks)
+    return registers.reshape(n_groups, HLL_REGISTERS)
+
+
+def hll_estimate(registers):
+    """
+    Estimated number of distinct values from one set of registers (Ertl's
+    improved estimator: no bias around the switch to linear counting, no
+    empirical tables).
+    """
+    m = len(registers)
+    q = 64 - HLL_PRECISION
+    histogram = np.bincount(registers, minlength=q + 2)
+    z = m * _tau(1 - histogram[q + 1] / m)
+    for k in range(q, 0, -1):
+        z = 0.5 * (z + histogram[k])
+    z += m * _sigma(histogram[0] / m)
+    return m * m / (2 * math.log(2) * z) if z != math.inf else 0.0
+
+
+def _sigma(x):
+    if x == 1:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        z_old, z = z, z + x * y
+        y += y
+        if z == z_old:
+            return z
+
+
+def _tau(x):
+    if x == 0 or x == 1:
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = math.sqrt(x)
+        y *= 0.5
+        z_old, z = z, z - (1 - x) ** 2 * y
+        if z == z_old:
+            return z / 3
+
+
+def as_registers(column):
+    """Stack a column of register bytes into an (n x HLL_REGISTERS) array."""
+    return np.frombuffer(b"".join(column), dtype=np.uint8).reshape(-1, HLL_REGISTERS)
+
+
+def build_distinct(df):
+    """Per-day HLL registers of each DISTINCT_COLUMNS column."""
+    dates, date_codes = np.unique(df['Date'].to_numpy(), return_inverse=True)
+    tables = []
+    for column in DISTINCT_COLUMNS:
+        values = df[column]
+        present = values.notna().to_numpy()
+        registers = hll_registers(date_codes[present], hash_values(values), len(dates))
+        tables.append(pd.DataFrame({'Date': dates, 'Column': column,
+                                    'Registers': [row.tobytes() for row in registers]}))
+    return sort_by_date(pd.concat(tables, ignore_index=True), ['Column'])
+
+
+def merge_distinct(table):
+    """One set of registers per (Date, Column): the element-wise max of the rows."""
+    table = table.sort_values(['Date', 'Column'], kind='stable', ignore_index=True)
+    keys = table[['Date', 'Column']]
+    starts = np.flatnonzero(~keys.duplicated().to_numpy())
+    merged = np.maximum.reduceat(as_registers(table['Registers']), starts, axis=0)
+    result = keys.iloc[starts].reset_index(drop=True)
+    result['Registers'] = [row.tobytes() for row in merged]
+    return result
+
+
+# --- Space-Saving ---
+def truncate_summaries(items, by, capacity):
+    """
+    Keep the `capacity` largest items of each `by` group. The upper bound of
+    the largest dropped item becomes part of the group's Floor.
+    """
+    items = items.sort_values(by + ['Count', 'Item'], ascending=[True] * len(by) + [False, True],
+                              kind='stable', ignore_index=True)
+    kept = items.groupby(by, observed=True, sort=False).cumcount().to_numpy() < capacity
+    dropped = items[~kept]
+    items = items[kept].reset_index(drop=True)
+    if not dropped.empty:
+        dropped_bound = (dropped['Count'] + dropped['Error']).groupby(
+            [dropped[key] for key in by], observed=True).max().rename('Dropped')
+        items = items.join(dropped_bound, on=by)
+        items['Floor'] = np.maximum(items['Floor'], items['Dropped'].fillna(0).astype('int64'))
+        items = items.drop(columns='Dropped')
+    return items
+
+
+def merge_summaries(items, parts, by, capacity=TOP_CAPACITY):
+    """
+    Merge the Space-Saving summaries in `items` (one summary per `parts`
+    group) into one summary per `by` group. An item missing from a summary
+    may have been counted up to that summary's Floor there, so those floors
+    are added to its Error.
+    """
+    floors = items.drop_duplicates(parts).groupby(by, observed=True)['Floor'].sum().rename('Total_Floor')
+    merged = (items.groupby(by + ['Item'], observed=True)
+              .agg(Count=('Count', 'sum'), Error=('Error', 'sum'), Covered=('Floor', 'sum'))
+              .reset_index()
+              .join(floors, on=by))
+    merged['Error'] += merged['Total_Floor'] - merged['Covered']
+    merged['Floor'] = merged['Total_Floor']
+    merged = merged.drop(columns=['Covered', 'Total_Floor'])
+    return truncate_summaries(merged, by, capacity) if capacity else merged
+
+
+def build_top(df, capacity=TOP_CAPACITY):
+    """Per-day Space-Saving summaries of the TOP_KINDS (exact counts, then truncated)."""
+    tables = []
+    for kind in TOP_KINDS:
+        counts = df[['Date', kind]].dropna().groupby(['Date', kind], observed=True).size()
+        names = counts.index.get_level_values(kind).astype(str)
+        tables.append(pd.DataFrame({'Date': counts.index.get_level_values('Date'), 'Kind': kind, 'Item': names,
+                                    'Count': counts.to_numpy(dtype='int64'), 'Error': 0, 'Floor': 0}))
+    top = pd.concat(tables, ignore_index=True)
+    top[['Error', 'Floor']] = top[['Error', 'Floor']].astype('int64')
+    return finish_top(truncate_summaries(top, ['Date', 'Kind'], capacity))
+
+
+def finish_top(top):
+    top['Kind'] = top['Kind'].astype(pd.CategoricalDtype(TOP_KINDS))
+    return sort_by_date(top, ['Kind'])
+
+
+def sort_by_date(table, keys):
+    return table.sort_values(['Date'] + keys, kind='stable', ignore_index=True)
+
+
+# --- Per-day sketches of a ride set ---
+class RideSketches:
+    """Date-keyed sketch tables ('distinct', 'top') plus the queries over a date range."""
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    @classmethod
+    def from_rides(cls, df):
+        return cls({'distinct': build_distinct(df), 'top': build_top(df)})
+
+    @classmethod
+    def empty(cls):
+        distinct = pd.DataFrame({'Date': pd.Series(dtype='datetime64[ns]'), 'Column': pd.Series(dtype=object),
+                                 'Registers': pd.Series(dtype=object)})
+        top = pd.DataFrame({'Date': pd.Series(dtype='datetime64[ns]'), 'Kind': pd.Series(dtype=object),
+                            'Item': pd.Series(dtype=object),
+                            **{name: pd.Series(dtype='int64') for name in ['Count', 'Error', 'Floor']}})
+        return cls({'distinct': distinct, 'top': finish_top(top)})
+
+    @classmethod
+    def from_batches(cls, frames):
+        """Sketches of rides that arrive as a stream of frames (one pass, bounded memory)."""
+        return cls.merge_all(cls.from_rides(df) for df in frames if len(df))
+
+    @classmethod
+    def merge_all(cls, sketches):
+        """Sketches of the union of several ride sets (e.g. the stored history and a new delta)."""
+        sketches = list(sketches)
+        if not sketches:
+            return cls.empty()
+        if len(sketches) == 1:
+            return sketches[0]
+        distinct = pd.concat([sketch.tables['distinct'] for sketch in sketches], ignore_index=True)
+        top = pd.concat([sketch.tables['top'].assign(Part=i) for i, sketch in enumerate(sketches)],
+                        ignore_index=True)
+        return cls({'distinct': merge_distinct(distinct),
+                    'top': finish_top(merge_summaries(top, ['Part', 'Date', 'Kind'], ['Date', 'Kind']))})
+
+    def merge(self, other):
+        return RideSketches.merge_all([self, other])
+
+    def slice(self, start, end):
+        """Sketches restricted to start <= Date < end."""
+        return RideSketches({name: slice_dates(table, start, end) for name, table in self.tables.items()})
+
+    # --- Queries used by the dashboard tabs ---
+    def unique_count(self, column):
+        distinct = self.tables['distinct']
+        registers = as_registers(distinct.loc[distinct['Column'] == column, 'Registers'])
+        if len(registers) == 0:
+            return 0
+        return round(hll_estimate(registers.max(axis=0)))
+
+    def unique_drivers(self):
+        return self.unique_count('Driver_ID')
+
+    def unique_customers(self):
+        return self.unique_count('Customer_ID')
+
+    def top_items(self, kind, n):
+        """The n items of `kind` with the most rides: Item, Count (counted) and Error (possibly missed)."""
+        top = self.tables['top']
+        top = top[top['Kind'] == kind]
+        if top.empty:
+            return pd.DataFrame(columns=['Item', 'Count', 'Error'])
+        merged = merge_summaries(top, ['Date'], ['Kind'], capacity=None)
+        return merged.nlargest(n, 'Count')[['Item', 'Count', 'Error']].reset_index(drop=True)
+
+    def top_drivers(self, n):
+        top = self.top_items('Driver_ID', n)
+        return pd.DataFrame({'Driver': top['Item'], 'Number of Rides': top['Count'], 'Error': top['Error']})
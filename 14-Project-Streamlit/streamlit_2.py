@@ -1,47 +1,158 @@
+import os
+import sys
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-
-# --- Caching Functions ---
-@st.cache_data
-def load_data(uploaded_file):
-    df = pd.read_csv(uploaded_file, parse_dates=['Ride_Request_Time', 'Pickup_Time', 'Dropoff_Time'])
-
-    # Pre-calculate necessary columns
-    df['Route'] = df['Source_Zone'] + " to " + df['Destination_Zone']
-    df['Hour_of_Day'] = df['Ride_Request_Time'].dt.hour
-    df['Day_of_Week'] = df['Ride_Request_Time'].dt.day_name()
-    df['Date'] = df['Ride_Request_Time'].dt.date  # For daily aggregation
 
-    # ✅ Add Ride Duration safely (only if Pickup & Dropoff are valid)
-    df['Ride_Duration_Minutes'] = (df['Dropoff_Time'] - df['Pickup_Time']).dt.total_seconds() / 60
-    df['Ride_Duration_Minutes'] = df['Ride_Duration_Minutes'].fillna(0)
+import ride_aggregates
+import ride_backend
+import ride_cache
+import ride_ingest
+import ride_sketches
 
-    return df
+# Chart specs and the figure cache come from the analytics_tools package
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "07-Python-Modules"))
+from analytics_tools import plotting
 
-@st.cache_data
-def get_completed_rides(df):
-    return df[df['Ride_Status'] == 'Completed'].copy()  # Use .copy() to avoid SettingWithCopyWarning
+# --- Caching Functions ---
+@st.cache_resource(max_entries=4)
+def load_data(digest, _uploaded_file):
+    # Parsed and derived once per file content, then reloaded from the
+    # memory-mapped columnar cache (see ride_cache.py). Keyed by the content
+    # hash only, so the upload itself is never hashed by Streamlit.
+    return ride_cache.load_rides(_uploaded_file.getvalue(), digest)
+
+@st.cache_resource(max_entries=4)
+def load_cube(digest, _df):
+    # Counted once per file (and cached on disk); charts slice this cube
+    rollups = ride_cache.cached_tables(digest, f"cube-v{ride_aggregates.CUBE_VERSION}",
+                                       lambda: ride_aggregates.RideCube.from_rides(_df).rollups)
+    return ride_aggregates.RideCube(rollups)
+
+@st.cache_resource(max_entries=4)
+def load_sketches(digest, _df):
+    # Per-day distinct-count and top-N sketches, cached on disk like the cube
+    tables = ride_cache.cached_tables(digest, f"sketches-v{ride_sketches.SKETCH_VERSION}",
+                                      lambda: ride_sketches.RideSketches.from_rides(_df).tables)
+    return ride_sketches.RideSketches(tables)
+
+@st.cache_resource
+def get_chart_cache():
+    # Built figures shared by all sessions, keyed by dataset version, date range and chart
+    return plotting.ChartCache()
+
+def histogram_spec(hist, x, title):
+    # Bars from server-side bin counts: the browser never gets the raw rides
+    return plotting.histogram_chart(hist['Bin_Start'], hist['Bin_End'], hist['Count'], title, x)
+
+def get_file_digest(uploaded_file):
+    # Hash each upload once per session instead of on every rerun
+    digests = st.session_state.setdefault('file_digests', {})
+    if uploaded_file.file_id not in digests:
+        digests[uploaded_file.file_id] = ride_cache.file_digest(uploaded_file.getvalue())
+    return digests[uploaded_file.file_id]
+
+@st.cache_resource(max_entries=4)
+def load_pandas_rides(digest, _uploaded_file):
+    # Whole file in memory: cached frame, its request-time index and cube
+    df = load_data(digest, _uploaded_file)  # Shared between sessions: never modified in place
+    return ride_backend.PandasRides(df, load_cube(digest, df), load_sketches(digest, df))
+
+@st.cache_resource(max_entries=4)
+def load_duckdb_rides(source, version=None):
+    # Out of core: queries run against the Parquet file(s), never loaded whole.
+    # A new version (files changed) gets a new object, so its sketches are rebuilt
+    return ride_backend.DuckDBRides(source)
+
+@st.cache_resource
+def get_store(watch_dir):
+    # One store object per folder, shared by all sessions (it serializes writers)
+    return ride_ingest.RideStore(ride_ingest.store_dir_for(watch_dir))
+
+@st.cache_data(ttl=60, show_spinner="Checking for new rides...")
+def refresh_store(watch_dir, _store):
+    # Scan the folder at most once a minute; only new files and new rows are parsed
+    return _store.refresh(watch_dir)
+
+@st.cache_resource(max_entries=2)
+def load_store_rides(watch_dir, generation, _store):
+    # Reloaded only when a refresh appended rows (new generation)
+    return ride_backend.PandasRides(_store.rides(), _store.cube(), _store.sketches())
 
 # --- Main App ---
 st.set_page_config(layout="wide")  # Use wide layout
 st.title("NYC Ride-Hailing Analytics Dashboard")
 
-# --- File Upload ---
-uploaded_file = st.sidebar.file_uploader("Upload your CSV data", type=["csv"])
-
-if uploaded_file is None:
+# --- Data Source ---
+ENGINES = ["pandas (in memory)", "DuckDB (out of core)"]
+engine = st.sidebar.radio("Query engine", ENGINES)
+server_path = watch_dir = ""
+if engine == ENGINES[1]:
+    # Large ride histories live on the server; uploads are limited by browser and RAM
+    if ride_cache.DATA_ROOT is not None:
+        server_path = st.sidebar.text_input("Server path under the data root (CSV, Parquet file or directory)").strip()
+else:
+    # A growing ride log: new CSV files (or rows appended to them) are ingested incrementally
+    if ride_cache.DATA_ROOT is not None:
+        watch_dir = st.sidebar.text_input("Watch folder under the data root (incremental, optional)").strip()
+
+uploaded_file = None
+if not (server_path or watch_dir):
+    uploaded_file = st.sidebar.file_uploader("Upload your CSV data", type=["csv"])
+
+if server_path:
+    try:
+        server_path = ride_cache.data_path(server_path)
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+    if not server_path.exists():
+        st.error(f"{server_path} does not exist.")
+        st.stop()
+    source = str(ride_backend.prepare_source(server_path))
+    version = ride_backend.source_version(source)
+    rides = load_duckdb_rides(source, version)
+    dataset_version = (source, version)
+elif watch_dir:
+    try:
+        watch_dir = str(ride_cache.data_path(watch_dir))
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+    if not os.path.isdir(watch_dir):
+        st.error(f"{watch_dir} is not a folder.")
+        st.stop()
+    store = get_store(watch_dir)
+    if st.sidebar.button("Check for new rides"):
+        refresh_store.clear()
+    refresh_store(watch_dir, store)
+    delta_file = st.sidebar.file_uploader("Append a delta CSV", type=["csv"])
+    if delta_file is not None:
+        store.append_bytes(delta_file.getvalue(), f"{ride_ingest.UPLOAD_PREFIX}{get_file_digest(delta_file)}")
+    if store.last_rebuild:
+        st.sidebar.warning(store.last_rebuild)
+    if store.manifest['rows'] == 0:
+        st.info("No rides in the watch folder yet.")
+        st.stop()
+    st.sidebar.caption(f"{store.manifest['rows']:,} rides from {len(store.manifest['sources'])} files")
+    rides = load_store_rides(watch_dir, store.generation, store)
+    dataset_version = (watch_dir, store.generation)
+elif uploaded_file is None:
     st.info("Please upload a CSV file to begin analysis.")
     st.stop()
+elif engine == ENGINES[1]:
+    digest = get_file_digest(uploaded_file)
+    rides = load_duckdb_rides(str(ride_backend.prepare_upload(uploaded_file.getvalue(), digest)))
+    dataset_version = digest
 else:
-    df_original = load_data(uploaded_file)
-    df = df_original.copy()  # Work with a copy for filtering
+    digest = get_file_digest(uploaded_file)
+    rides = load_pandas_rides(digest, uploaded_file)
+    dataset_version = digest
 
 # --- Sidebar Filters ---
 st.sidebar.header("Filters")
 # Date Range Filter
-min_date = df['Ride_Request_Time'].min().date()
-max_date = df['Ride_Request_Time'].max().date()
+min_date, max_date = (d.date() for d in rides.date_range())
 start_date = st.sidebar.date_input("Start Date", min_date, min_value=min_date, max_value=max_date)
 end_date = st.sidebar.date_input("End Date", max_date, min_value=start_date, max_value=max_date)
 
@@ -49,13 +160,22 @@ end_date = st.sidebar.date_input("End Date", max_date, min_value=start_date, max
 start_datetime = pd.to_datetime(start_date)
 end_datetime = pd.to_datetime(end_date) + pd.Timedelta(days=1)  # Include the whole end day
 
-# Apply date filter
-df_filtered = df[(df['Ride_Request_Time'] >= start_datetime) & (df['Ride_Request_Time'] < end_datetime)].copy()
+# Apply date filter: every chart below is a query over this date range
+cube_filtered = rides.slice(start_datetime, end_datetime)
 
-if df_filtered.empty:
+if cube_filtered.is_empty():
     st.warning("No data available for the selected filters.")
     st.stop()
 
+chart_cache = get_chart_cache()
+
+def show_chart(chart_id, build):
+    # Query + figure only on a cache miss; returns False if there was nothing to chart
+    fig = chart_cache.figure((dataset_version, (start_datetime, end_datetime), chart_id), build)
+    if fig is not None:
+        st.plotly_chart(fig, use_container_width=True)
+    return fig is not None
+
 # --- Dashboard Tabs/Sections ---
 tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
     "📊 Performance Snapshot", "🕒 Temporal Demand", "🗺️ Geospatial Insights",
@@ -64,94 +184,116 @@ tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
 
 with tab1:  # Performance Snapshot
     st.header("Overall Performance Snapshot")
-    df_completed = get_completed_rides(df_filtered)
+    summary = cube_filtered.summary()
 
     col1, col2, col3, col4, col5 = st.columns(5)
-    col1.metric("Total Rides", f"{df_filtered.shape[0]:,}")
-    col2.metric("Total Revenue", f"${df_completed['Fare'].sum():,.2f}")
-    col3.metric("Average Fare", f"${df_completed['Fare'].mean():.2f}" if not df_completed.empty else "$0.00")
-    col4.metric("Avg. Ride Duration", f"{df_filtered['Ride_Duration_Minutes'].mean():.1f} min" if not df_filtered.empty else "0 min")
-
-    total_rides = len(df_filtered)
-    cancelled_rides = len(df_filtered[df_filtered['Ride_Status'] != 'Completed'])
-    cancellation_rate = (cancelled_rides / total_rides * 100) if total_rides > 0 else 0
-    col5.metric("Cancellation Rate", f"{cancellation_rate:.1f}%")
+    col1.metric("Total Rides", f"{summary['total_rides']:,}")
+    col2.metric("Total Revenue", f"${summary['total_revenue']:,.2f}")
+    col3.metric("Average Fare", f"${summary['average_fare']:.2f}" if summary['average_fare'] is not None else "$0.00")
+    col4.metric("Avg. Ride Duration", f"{summary['average_duration']:.1f} min" if summary['average_duration'] is not None else "0 min")
+    col5.metric("Cancellation Rate", f"{summary['cancellation_rate']:.1f}%")
 
     st.subheader("Ride Volume Over Time")
-    rides_over_time = df_filtered.groupby(df_filtered['Date'])['Ride_ID'].count().reset_index()
-    fig_rides_trend = px.line(rides_over_time, x='Date', y='Ride_ID', title="Daily Ride Volume")
-    fig_rides_trend.update_layout(yaxis_title="Number of Rides")
-    st.plotly_chart(fig_rides_trend, use_container_width=True)
+    def rides_trend():
+        rides_over_time = cube_filtered.daily_volume()
+        return plotting.line_chart(rides_over_time['Date'], rides_over_time['Rides'], "Daily Ride Volume",
+                                   'Date', "Number of Rides")
+    show_chart('daily_volume', rides_trend)
 
 
 with tab2:  # Temporal Demand Patterns
     st.header("Temporal Demand Patterns")
 
     st.subheader("Rides by Hour of Day")
-    rides_by_hour = df_filtered['Hour_of_Day'].value_counts().sort_index().reset_index()
-    rides_by_hour.columns = ['Hour_of_Day', 'Number of Rides']
-    fig_hourly = px.bar(rides_by_hour, x='Hour_of_Day', y='Number of Rides', title="Rides per Hour")
-    st.plotly_chart(fig_hourly, use_container_width=True)
+    def hourly():
+        rides_by_hour = cube_filtered.rides_by_hour()
+        return plotting.bar_chart(rides_by_hour['Hour_of_Day'], rides_by_hour['Number of Rides'], "Rides per Hour",
+                                  'Hour_of_Day', 'Number of Rides')
+    show_chart('rides_by_hour', hourly)
 
     st.subheader("Rides by Day of Week")
-    days_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    rides_by_day = df_filtered['Day_of_Week'].value_counts().reindex(days_order).reset_index()
-    rides_by_day.columns = ['Day_of_Week', 'Number of Rides']
-    fig_daily = px.bar(rides_by_day, x='Day_of_Week', y='Number of Rides', title="Rides per Day of Week")
-    st.plotly_chart(fig_daily, use_container_width=True)
+    def daily():
+        rides_by_day = cube_filtered.rides_by_day_of_week()
+        return plotting.bar_chart(rides_by_day['Day_of_Week'], rides_by_day['Number of Rides'],
+                                  "Rides per Day of Week", 'Day_of_Week', 'Number of Rides')
+    show_chart('rides_by_day_of_week', daily)
 
 
 with tab3:  # Geospatial Insights
     st.header("Geospatial Hotspots & Routes")
     TOP_N = 10
 
+    # Distinct counts and the busiest drivers merge the per-day sketches of the range;
+    # zones and routes are few, so their top-N lists are exact counts from the cube
+    col1, col2 = st.columns(2)
+    col1.metric("Unique Drivers (approx.)", f"{cube_filtered.unique_drivers():,}")
+    col2.metric("Unique Customers (approx.)", f"{cube_filtered.unique_customers():,}")
+
     col1, col2 = st.columns(2)
     with col1:
         st.subheader(f"Top {TOP_N} Pickup Zones")
-        popular_pickup = df_filtered['Source_Zone'].value_counts().nlargest(TOP_N).reset_index()
-        popular_pickup.columns = ['Zone', 'Number of Rides']
-        fig_pickup = px.bar(popular_pickup, y='Zone', x='Number of Rides', orientation='h', title="Top Pickup Zones")
-        fig_pickup.update_layout(yaxis={'categoryorder': 'total ascending'})
-        st.plotly_chart(fig_pickup, use_container_width=True)
+        def pickup():
+            popular_pickup = cube_filtered.top_zones('Source_Zone', TOP_N)
+            return plotting.bar_chart(popular_pickup['Zone'], popular_pickup['Number of Rides'], "Top Pickup Zones",
+                                      'Zone', 'Number of Rides', horizontal=True)
+        show_chart(('top_zones', 'Source_Zone', TOP_N), pickup)
 
     with col2:
         st.subheader(f"Top {TOP_N} Drop-off Zones")
-        popular_dropoff = df_filtered['Destination_Zone'].value_counts().nlargest(TOP_N).reset_index()
-        popular_dropoff.columns = ['Zone', 'Number of Rides']
-        fig_dropoff = px.bar(popular_dropoff, y='Zone', x='Number of Rides', orientation='h', title="Top Dropoff Zones")
-        fig_dropoff.update_layout(yaxis={'categoryorder': 'total ascending'})
-        st.plotly_chart(fig_dropoff, use_container_width=True)
+        def dropoff():
+            popular_dropoff = cube_filtered.top_zones('Destination_Zone', TOP_N)
+            return plotting.bar_chart(popular_dropoff['Zone'], popular_dropoff['Number of Rides'],
+                                      "Top Dropoff Zones", 'Zone', 'Number of Rides', horizontal=True)
+        show_chart(('top_zones', 'Destination_Zone', TOP_N), dropoff)
 
     st.subheader(f"Top {TOP_N} Routes")
-    popular_routes = df_filtered['Route'].value_counts().nlargest(TOP_N).reset_index()
-    popular_routes.columns = ['Route', 'Number of Rides']
-    fig_routes = px.bar(popular_routes, y='Route', x='Number of Rides', orientation='h', title="Top Routes")
-    fig_routes.update_layout(yaxis={'categoryorder': 'total ascending'})
-    st.plotly_chart(fig_routes, use_container_width=True)
+    def routes():
+        popular_routes = cube_filtered.top_routes(TOP_N)
+        return plotting.bar_chart(popular_routes['Route'], popular_routes['Number of Rides'], "Top Routes",
+                                  'Route', 'Number of Rides', horizontal=True)
+    show_chart(('top_routes', TOP_N), routes)
+
+    st.subheader(f"Top {TOP_N} Drivers (approx.)")
+    def drivers():
+        busiest = cube_filtered.top_drivers(TOP_N)
+        return plotting.bar_chart(busiest['Driver'], busiest['Number of Rides'], "Busiest Drivers (bars: counted, "
+                                  "whiskers: possibly missed)", 'Driver', 'Number of Rides', horizontal=True,
+                                  errors=busiest['Error'])
+    show_chart(('top_drivers', TOP_N), drivers)
 
 
 with tab4:  # Financial Deep Dive
     st.header("Financial Insights")
-    df_completed = get_completed_rides(df_filtered)
+    SCATTER_SAMPLE = 5000
 
-    if not df_completed.empty:
+    completed_rides = cube_filtered.completed_rides()
+    if completed_rides > 0:
         col1, col2 = st.columns(2)
         with col1:
             st.subheader("Fare Distribution (Completed Rides)")
-            fig_fare_dist = px.histogram(df_completed, x="Fare", nbins=30, title="Distribution of Fares")
-            st.plotly_chart(fig_fare_dist, use_container_width=True)
+            show_chart(('histogram', 'Fare', 30), lambda: histogram_spec(
+                cube_filtered.histogram('Fare', 30), "Fare", "Distribution of Fares"))
         with col2:
             st.subheader("Distance Distribution (Completed Rides)")
-            fig_dist_dist = px.histogram(df_completed, x="Distance_Miles", nbins=30, title="Distribution of Distances")
-            st.plotly_chart(fig_dist_dist, use_container_width=True)
+            show_chart(('histogram', 'Distance_Miles', 30), lambda: histogram_spec(
+                cube_filtered.histogram('Distance_Miles', 30), "Distance_Miles", "Distribution of Distances"))
 
         st.subheader("Fare vs. Distance (Completed Rides)")
-        fig_fare_vs_dist = px.scatter(
-            df_completed, x="Distance_Miles", y="Fare",
-            trendline="ols",
-            title="Fare vs. Distance with Trendline"
-        )
-        st.plotly_chart(fig_fare_vs_dist, use_container_width=True)
+        # Random sample of the rides for the points; the line is fitted on all of them
+        def fare_vs_dist():
+            df_sample = cube_filtered.fare_distance_sample(SCATTER_SAMPLE)
+            fit = cube_filtered.fare_distance_fit()
+            line = line_name = None
+            if fit is not None:
+                fit_x = [fit['x_min'], fit['x_max']]
+                line = (fit_x, [fit['intercept'] + fit['slope'] * x for x in fit_x])
+                line_name = f"OLS: Fare = {fit['intercept']:.2f} + {fit['slope']:.2f} × Distance"
+            return plotting.scatter_chart(df_sample["Distance_Miles"], df_sample["Fare"],
+                                          "Fare vs. Distance with Trendline", "Distance_Miles", "Fare",
+                                          line, line_name)
+        if completed_rides > SCATTER_SAMPLE:
+            st.caption(f"Showing a random sample of {SCATTER_SAMPLE:,} of {completed_rides:,} completed rides.")
+        show_chart(('fare_vs_distance', SCATTER_SAMPLE), fare_vs_dist)
     else:
         st.info("No completed rides in the selected period for financial analysis.")
 
@@ -160,10 +302,11 @@ with tab5:  # Service Quality
     st.header("Service Quality & Ratings")
 
     st.subheader("Distribution of Driver Ratings")
-    rating_dist = df_filtered['Driver_Rating_by_Customer'].value_counts().sort_index().reset_index()
-    rating_dist.columns = ['Rating', 'Count']
-    fig_rating_dist = px.bar(rating_dist, x='Rating', y='Count', title="Driver Ratings Distribution")
-    st.plotly_chart(fig_rating_dist, use_container_width=True)
+    def ratings():
+        rating_dist = cube_filtered.rating_distribution()
+        return plotting.bar_chart(rating_dist['Rating'], rating_dist['Count'], "Driver Ratings Distribution",
+                                  'Rating', 'Count')
+    show_chart('rating_distribution', ratings)
 
 
 with tab6:  # Operational Efficiency
@@ -172,26 +315,27 @@ with tab6:  # Operational Efficiency
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Ride Status Breakdown")
-        status_counts = df_filtered['Ride_Status'].value_counts().reset_index()
-        status_counts.columns = ['Ride_Status', 'Count']
-        fig_status_pie = px.pie(status_counts, names='Ride_Status', values='Count', title="Ride Statuses")
-        st.plotly_chart(fig_status_pie, use_container_width=True)
+        def statuses():
+            status_counts = cube_filtered.status_counts()
+            return plotting.pie_chart(status_counts['Ride_Status'], status_counts['Count'], "Ride Statuses")
+        show_chart('status_counts', statuses)
 
     with col2:
         st.subheader("Cancellation Reasons")
-        cancelled_df = df_filtered[df_filtered['Ride_Status'] != 'Completed'].copy()
-        if not cancelled_df.empty:
-            cancel_reasons = cancelled_df['Cancelled_By'].value_counts(dropna=False).reset_index()
-            cancel_reasons.columns = ['Cancelled_By', 'Count']
-            cancel_reasons['Cancelled_By'] = cancel_reasons['Cancelled_By'].fillna('Unknown')
-            fig_cancel_reasons = px.bar(cancel_reasons, x='Cancelled_By', y='Count', title="Reasons for Cancellation")
-            st.plotly_chart(fig_cancel_reasons, use_container_width=True)
-        else:
+        def cancellations():
+            cancel_reasons = cube_filtered.cancellation_reasons()
+            if cancel_reasons.empty:
+                return None
+            return plotting.bar_chart(cancel_reasons['Cancelled_By'], cancel_reasons['Count'],
+                                      "Reasons for Cancellation", 'Cancelled_By', 'Count')
+        if not show_chart('cancellation_reasons', cancellations):
             st.info("No cancelled rides in the selected period.")
 
     st.subheader("Ride Duration Distribution")
-    if not df_filtered.empty:
-        fig_duration = px.histogram(df_filtered, x="Ride_Duration_Minutes", nbins=40, title="Distribution of Ride Durations (Minutes)")
-        st.plotly_chart(fig_duration, use_container_width=True)
-    else:
+    def durations():
+        duration_hist = cube_filtered.histogram('Ride_Duration_Minutes', 40)
+        if duration_hist.empty:
+            return None
+        return histogram_spec(duration_hist, "Ride_Duration_Minutes", "Distribution of Ride Durations (Minutes)")
+    if not show_chart(('histogram', 'Ride_Duration_Minutes', 40), durations):
         st.info("No ride duration data available.")
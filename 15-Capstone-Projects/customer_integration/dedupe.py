@@ -0,0 +1,250 @@
+"""
+Duplicate detection for the customer master with blocking (no O(N²) pairs).
+
+Each batch of records is reduced to a few integers per record as it streams
+past (batch_features, which the normalization workers can run): hashes of its
+email, phone and name, a phonetic (Soundex) code, and 64-bit character-bigram
+signatures of the name and email user name for fuzzy comparison. Then:
+
+1. Blocking: records are sorted by each blocking key (normalized phone,
+   email local part, name phonetic code) and only records within WINDOW
+   positions of each other in the same block become candidate pairs
+   (sorted neighbourhood). Exact duplicates sort next to each other, so
+   chains of neighbours still link every record of a large block.
+2. Scoring: all candidate pairs are compared at once with NumPy. A pair is
+   a duplicate if it has the same email or phone, or a similar name (bigram
+   Jaccard) together with a similar email user name.
+3. Clustering: each batch of matching pairs is merged at once with a
+   vectorized union-find (hook to the smaller root, then pointer jumping).
+
+Memory is about 80 bytes per record; time is linear in the record count.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+MISSING = "N/A"
+WINDOW = 8                 # neighbours compared within a block
+NAME_SIMILARITY = 0.75     # bigram Jaccard for a fuzzy name match...
+EMAIL_SIMILARITY = 0.9     # ...which also needs similar email user names
+PAIR_CHUNK = 4_000_000     # sorted positions scored at a time (bounds memory)
+
+SOURCES = {"CRM": 1, "ECOM": 2}                     # bit per source system
+MATCH_KEYS = {"email": 1, "phone": 2, "name": 4}    # bit per duplicate reason
+
+SOUNDEX_CODES = {letter: digit for digit, letters in
+                 (("1", "bfpv"), ("2", "cgjkqsxz"), ("3", "dt"), ("4", "l"), ("5", "mn"), ("6", "r"))
+                 for letter in letters}
+
+
+# ---------- Record features (vectorized over a batch) ----------
+def key_hashes(values):
+    """Stable 64-bit hashes of a column of keys (0 for missing or empty keys)."""
+    values = np.asarray(values, dtype=object)
+    hashes = pd.util.hash_array(values).view(np.int64)
+    return np.where((values == "") | (values == MISSING), 0, hashes)
+
+
+@lru_cache(maxsize=1 << 16)
+def soundex(word):
+    letters = [c for c in word.lower() if "a" <= c <= "z"]
+    if not letters:
+        return ""
+    code, last = letters[0].upper(), SOUNDEX_CODES.get(letters[0], "")
+    for letter in letters[1:]:
+        digit = SOUNDEX_CODES.get(letter, "")
+        if digit and digit != last:
+            code += digit
+        if letter not in "hw":
+            last = digit
+    return (code + "000")[:4]
+
+
+def name_codes(names):
+    """Phonetic blocking keys: Soundex of the last name plus the first initial ("S530j")."""
+    # Last names repeat a lot, so soundex() is cached
+    return [soundex(name.rpartition(" ")[2]) + name[:1] if name else "" for name in names]
+
+
+def bigram_signatures(texts, width=32):
+    """
+    64-bit set of the character bigrams of each text (each bigram sets one
+    bit), from the first `width` characters.
+    """
+    padded = np.array([f" {text} " if text else "" for text in texts], dtype=f"U{width + 2}")
+    codes = padded.view(np.uint32).reshape(len(padded), width + 2).astype(np.uint64)
+    bits = (codes[:, :-1] * np.uint64(31) + codes[:, 1:]) & np.uint64(63)
+    in_text = np.arange(width + 1) < (np.char.str_len(padded) - 1)[:, None]
+    return np.bitwise_or.reduce(np.where(in_text, np.uint64(1) << bits, np.uint64(0)), axis=1)
+
+
+def email_local_parts(emails):
+    """User name of each address, without dots or a +tag: j.smith+shop@x → jsmith."""
+    return [email.partition("@")[0].partition("+")[0].replace(".", "") if email != MISSING else ""
+            for email in emails]
+
+
+def sort_prefixes(texts):
+    """The first 8 characters of each text packed into an integer, so sorting the integers sorts the texts."""
+    codes = np.array(texts, dtype="U8").view(np.uint32).reshape(len(texts), 8)
+    codes = np.minimum(codes, 255).astype(np.uint64)
+    return (codes << (np.uint64(8) * np.arange(7, -1, -1, dtype=np.uint64))).sum(axis=1, dtype=np.uint64)
+
+
+def popcount(values):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    counts = np.unpackbits(values.view(np.uint8)).reshape(-1, 64)
+    return counts.sum(axis=1)
+
+
+def jaccard(a, b):
+    union = popcount(a | b)
+    return np.where(union > 0, popcount(a & b) / np.maximum(union, 1), 0.0)
+
+
+# ---------- Clustering ----------
+def union(parent, a, b):
+    """
+    Merge the clusters of each edge a[i]–b[i] in the forest `parent` (in place).
+    Roots are always the smallest index of their cluster.
+    """
+    while True:
+        pa, pb = parent[a], parent[b]
+        linked = pa != pb
+        if not linked.any():
+            return
+        a, b = a[linked], b[linked]  # pairs already in one cluster are done
+        pa, pb = pa[linked], pb[linked]
+        # Hook the larger root under the smaller one, then flatten the trees
+        np.minimum.at(parent, np.maximum(pa, pb), np.minimum(pa, pb))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent[:] = grandparent
+
+
+class Clusters:
+    """Result of Deduplicator.clusters(); every array has one entry per record."""
+
+    def __init__(self, roots, kept, reasons, cluster_sources, cluster_reasons):
+        self.roots = roots                      # smallest record index of the cluster
+        self.kept = kept                        # True for the record kept from its cluster
+        self.reasons = reasons                  # MATCH_KEYS bits of its matches with earlier records
+        self.cluster_sources = cluster_sources  # SOURCES bits of the cluster, at the root index
+        self.cluster_reasons = cluster_reasons  # MATCH_KEYS bits of the cluster, at the root index
+
+    @property
+    def unique(self):
+        return int(self.kept.sum())
+
+
+FEATURE_TYPES = {
+    "email": np.int64, "phone": np.int64, "name": np.int64, "local": np.int64, "name_code": np.int64,
+    "name_sig": np.uint64, "local_sig": np.uint64, "name_prefix": np.uint64,
+    "score": np.int8, "source": np.int8,
+}
+
+
+def batch_features(frame):
+    """
+    Dedupe features of a batch of normalized records (DataFrame with
+    full_name, email, phone, source_system + other fields), as NumPy arrays.
+    Only depends on the batch, so it can run in the normalization workers.
+    """
+    names = [name.lower() if name != MISSING else "" for name in frame["full_name"]]
+    local_parts = email_local_parts(frame["email"])
+    features = {
+        "email": key_hashes(frame["email"]),
+        "phone": key_hashes(frame["phone"]),
+        "name": key_hashes(names),
+        "local": key_hashes(local_parts),
+        "name_code": key_hashes(name_codes(names)),
+        "name_sig": bigram_signatures(names),
+        "local_sig": bigram_signatures(local_parts),
+        "name_prefix": sort_prefixes(names),
+        "score": (frame.to_numpy() != MISSING).sum(axis=1),
+        "source": frame["source_system"].map(SOURCES).to_numpy(),
+    }
+    return {name: np.asarray(values, dtype=FEATURE_TYPES[name]) for name, values in features.items()}
+
+
+class Deduplicator:
+    """Collects record features with add_batch(); clusters() finds the duplicates."""
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self.arrays = None  # the concatenated features, set by clusters()
+        self.batches = {name: [] for name in FEATURE_TYPES}
+
+    def __len__(self):
+        return sum(len(batch) for batch in self.batches["score"])
+
+    def add_batch(self, features):
+        """Add the batch_features() of a batch of records."""
+        for name, values in features.items():
+            self.batches[name].append(values)
+
+    def add_frame(self, frame):
+        self.add_batch(batch_features(frame))
+
+    def candidate_pairs(self, key, *order_by):
+        """Yield (a, b) index arrays of records within `window` of each other in the same block."""
+        valid = np.flatnonzero(key != 0)
+        order = valid[np.lexsort(tuple(column[valid] for column in reversed(order_by)) + (key[valid],))]
+        for start in range(0, len(order), PAIR_CHUNK):
+            stop = min(start + PAIR_CHUNK, len(order))
+            for offset in range(1, self.window + 1):
+                right = order[start + offset:stop + offset]
+                left = order[start:start + len(right)]
+                same = key[left] == key[right]
+                yield left[same], right[same]
+
+    def score_pairs(self, a, b):
+        """
+        MATCH_KEYS bits of the fields each candidate pair agrees on, or 0 if
+        the pair is not a duplicate. The same email or phone is enough; a
+        similar name is not (there are many John Smiths), it also needs a
+        similar email user name.
+        """
+        c = self.arrays
+        email = (c["email"][a] == c["email"][b]) & (c["email"][a] != 0)
+        phone = (c["phone"][a] == c["phone"][b]) & (c["phone"][a] != 0)
+        name = ((c["name"][a] == c["name"][b]) & (c["name"][a] != 0)) | (
+            jaccard(c["name_sig"][a], c["name_sig"][b]) >= NAME_SIMILARITY)
+        similar_user = jaccard(c["local_sig"][a], c["local_sig"][b]) >= EMAIL_SIMILARITY
+        match = email | phone | (name & similar_user)
+        reasons = email * MATCH_KEYS["email"] + phone * MATCH_KEYS["phone"] + name * MATCH_KEYS["name"]
+        return np.where(match, reasons, 0).astype(np.int8)
+
+    def clusters(self):
+        self.arrays = c = {name: np.concatenate(batches) if batches else np.empty(0, FEATURE_TYPES[name])
+                           for name, batches in self.batches.items()}
+        n = len(self)
+        blocks = [("phone", ("name_prefix",)), ("local", ("email", "name_prefix")),
+                  ("name_code", ("name_prefix", "name"))]
+        roots = np.arange(n, dtype=np.int64)
+        reasons = np.zeros(n, dtype=np.int8)
+        for key, order_by in blocks:
+            for a, b in self.candidate_pairs(c[key], *(c[column] for column in order_by)):
+                pair_reasons = self.score_pairs(a, b)
+                match = pair_reasons != 0
+                a, b = a[match], b[match]
+                np.bitwise_or.at(reasons, np.maximum(a, b), pair_reasons[match])
+                union(roots, a, b)
+
+        cluster_sources = np.zeros(n, dtype=np.int8)
+        np.bitwise_or.at(cluster_sources, roots, c["source"])
+        cluster_reasons = np.zeros(n, dtype=np.int8)
+        np.bitwise_or.at(cluster_reasons, roots, reasons)
+
+        # Keep the record with the most information, then the earliest one
+        order = np.lexsort((np.arange(n), -c["score"].astype(np.int16), roots))
+        first = np.ones(n, dtype=bool)
+        first[1:] = roots[order[1:]] != roots[order[:-1]]
+        kept = np.zeros(n, dtype=bool)
+        kept[order[first]] = True
+        return Clusters(roots, kept, reasons, cluster_sources, cluster_reasons)
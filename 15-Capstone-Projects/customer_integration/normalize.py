@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Normalization stage of the customer integration pipeline.
+
+Records are cleaned a column batch at a time with pandas string methods
+instead of one row at a time:
+
+    full_name    " john  SMITH "            -> "John Smith"
+    email        "JANE.DOE@EMAIL.COM"       -> "jane.doe@email.com"
+    phone        "+1-555-0101", "555.0102"  -> "5550101" / "5550102"
+                 "(212) 555-0101"           -> "+12125550101" with --phone-format e164
+    signup_date  "2023-01-15T10:30:00Z"     -> "2023-01-15"
+
+Phones, email domains and dates repeat heavily, so each distinct value of
+a batch is normalized once (factorize, normalize the uniques, take back),
+and domains additionally go through an lru_cache shared by all batches of a
+worker. Batches are spread over a process pool, in order, with a bounded
+number in flight:
+
+    python normalize.py --workers 8 --output normalized.csv
+"""
+
+import argparse
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+
+import pandas as pd
+
+MISSING = "N/A"
+COLUMNS = ["source_id", "full_name", "email", "phone", "signup_date", "source_system", "status"]
+PHONE_FORMATS = ["digits", "e164"]
+COUNTRY_CODE = "1"   # numbers are North American unless they say otherwise
+
+
+# ---------- Column functions (Series -> Series) ----------
+def text(values):
+    return values.fillna("").astype(str).str.strip()
+
+
+def or_missing(values):
+    return values.mask(values == "", MISSING)
+
+
+def by_unique(values, normalize):
+    """Apply a column function to the distinct values only, then map back."""
+    codes, uniques = pd.factorize(values)
+    normalized = normalize(pd.Series(uniques, dtype=object)).to_numpy()
+    return pd.Series(normalized[codes], index=values.index)
+
+
+def names(values):
+    return or_missing(text(values).str.split().str.join(" ").str.title())
+
+
+@lru_cache(maxsize=1 << 16)
+def canonical_domain(domain):
+    """Lower-case domain without a trailing dot; internationalized domains in their ASCII (IDNA) form."""
+    domain = domain.lower().rstrip(".")
+    if not domain.isascii():
+        try:
+            domain = domain.encode("idna").decode("ascii")
+        except UnicodeError:
+            pass
+    return domain
+
+
+def emails(values):
+    values = text(values)
+    parts = values.str.rpartition("@")
+    domain = by_unique(parts[2], lambda uniques: uniques.map(canonical_domain))
+    return or_missing((parts[0].str.lower() + parts[1] + domain).mask(values == MISSING, ""))
+
+
+def phones(values, phone_format="digits"):
+    def normalize(uniques):
+        digits = uniques.fillna("").astype(str).str.replace(r"\D", "", regex=True)
+        # "+1-555-0101" and "5550101" are the same number: drop the country code
+        has_country = digits.str.startswith(COUNTRY_CODE) & digits.str.len().isin([8, 11])
+        digits = digits.where(~has_country, digits.str[1:])
+        if phone_format == "e164":
+            # Only full national numbers (area code + number) have an E.164 form
+            digits = digits.where(digits.str.len() != 10, "+" + COUNTRY_CODE + digits)
+        return or_missing(digits)
+    return by_unique(text(values), normalize)
+
+
+def dates(values):
+    def normalize(uniques):
+        # The calendar date of ISO dates and timestamps ("2023-01-15T10:30:00Z")
+        parsed = pd.to_datetime(uniques.str[:10], format="%Y-%m-%d", errors="coerce")
+        return parsed.dt.strftime("%Y-%m-%d").fillna(MISSING)
+    return by_unique(text(values), normalize)
+
+
+# ---------- Record batches ----------
+def crm_frame(batch, phone_format):
+    """Raw CRM rows (DataFrame of strings) -> common schema."""
+    status = text(batch.get("status", pd.Series("", index=batch.index))).str.lower()
+    return pd.DataFrame({
+        "source_id": or_missing(text(batch["customer_id"])),
+        "full_name": names(batch["full_name"]),
+        "email": emails(batch["email"]),
+        "phone": phones(batch["phone"], phone_format),
+        "signup_date": dates(batch["signup_date"]),
+        "source_system": "CRM",
+        "status": status.mask(status == "", "active"),
+    })
+
+
+def ecom_frame(customers, phone_format):
+    """Raw e-commerce customers (list of nested dicts) -> common schema."""
+    full_names = [customer.get("name") or {} for customer in customers]
+    contacts = [customer.get("contact") or {} for customer in customers]
+    first = pd.Series([name.get("first") for name in full_names], dtype=object)
+    last = pd.Series([name.get("last") for name in full_names], dtype=object)
+    return pd.DataFrame({
+        "source_id": or_missing(text(pd.Series([customer.get("id") for customer in customers], dtype=object))),
+        "full_name": names(text(first) + " " + text(last)),
+        "email": emails(pd.Series([contact.get("email") for contact in contacts], dtype=object)),
+        "phone": phones(pd.Series([contact.get("phone") for contact in contacts], dtype=object), phone_format),
+        "signup_date": dates(pd.Series([customer.get("registered") for customer in customers], dtype=object)),
+        "source_system": "ECOM",
+        "status": "active",  # the e-commerce export has no status
+    })
+
+
+FRAMES = {"CRM": crm_frame, "ECOM": ecom_frame}
+
+
+def normalize_batch(job, phone_format="digits"):
+    source, batch = job
+    return FRAMES[source](batch, phone_format)
+
+
+def parallel_map(func, items, workers=1):
+    """
+    Yield func(item) for each item, in order, on a pool of `workers`
+    processes. Unlike pool.map, at most 2 * workers items are read ahead,
+    so memory stays bounded for endless inputs.
+    """
+    if workers <= 1:
+        yield from map(func, items)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def normalize_batches(jobs, workers=1, phone_format="digits"):
+    """Yield the normalized frame of each (source, raw batch) job, in order."""
+    return parallel_map(partial(normalize_batch, phone_format=phone_format), jobs, workers)
+
+
+def main():
+    # Run the stage on its own: raw sources in, one normalized CSV out
+    import pipeline
+
+    parser = argparse.ArgumentParser(description="Normalize CRM and e-commerce customers to the common schema.")
+    parser.add_argument("--crm", default=pipeline.CRM_FILE, help="CRM customers CSV")
+    parser.add_argument("--ecom", default=pipeline.ECOM_FILE, help="e-commerce customers JSON")
+    parser.add_argument("--output", default="normalized_customers.csv", help="normalized CSV")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--phone-format", choices=PHONE_FORMATS, default="digits")
+    args = parser.parse_args()
+
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        f.write(",".join(COLUMNS) + "\n")
+        for frame in pipeline.normalized_frames(args.crm, args.ecom, args.workers, args.phone_format):
+            frame.to_csv(f, header=False, index=False)
+    print(f"✅  Normalized customers written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
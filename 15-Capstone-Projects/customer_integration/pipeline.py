@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Customer Data Integration Pipeline (Capstone Project 01), streaming version.
+
+    python pipeline.py                                   # sample files in this folder
+    python pipeline.py --crm crm.csv --ecom ecom.json --output-dir out/ --workers 8
+
+Memory stays bounded however large the inputs are:
+- the CRM CSV is read in batches of rows;
+- the e-commerce JSON `customers` array is parsed one customer at a time
+  (with `ijson` if installed, else with an incremental json decoder), never
+  with json.load;
+- the batches are normalized on a pool of processes (see normalize.py);
+- normalized records are spilled to a temporary CSV as they are read, and
+  only compact per-record dedupe features stay in memory (see dedupe.py);
+- a second pass over the spill file writes the master and the report.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+from functools import partial
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+try:
+    import ijson
+except ImportError:  # fall back to the incremental decoder below
+    ijson = None
+
+import normalize
+from dedupe import Deduplicator, MATCH_KEYS, SOURCES, batch_features
+
+# ---------- Configurable parameters ----------
+CRM_FILE = "crm_customers.csv"
+ECOM_FILE = "ecommerce_customers.json"
+OUTPUT_DIR = "."
+BATCH_SIZE = 50_000            # records normalized per batch
+READ_SIZE = 1 << 20            # characters per JSON read
+MASTER_FIELDS = ["unified_id", "full_name", "email", "phone", "signup_date", "source_system", "status"]
+SPILL_FIELDS = normalize.COLUMNS
+
+logger = logging.getLogger("integration")
+
+
+# ---------- Extract ----------
+def extract_csv(filepath):
+    """Yield DataFrames of up to BATCH_SIZE CRM rows (all values as strings)."""
+    with pd.read_csv(filepath, dtype=str, keep_default_na=False, chunksize=BATCH_SIZE) as reader:
+        yield from reader
+
+
+def iter_json_array(f, key):
+    """
+    Yield the items of the array under top-level `key` of a JSON object,
+    decoding one item at a time from fixed-size reads. A file that ends
+    before the closing `]` or `}` raises ValueError, as ijson does.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = f.read(READ_SIZE)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    def skip(chars):
+        # Skip whitespace and any of `chars`; return the next character ("" at EOF)
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] in chars):
+                pos += 1
+            if pos < len(buffer) or eof:
+                return buffer[pos:pos + 1]
+            fill()
+
+    def decode():
+        # Decode the next value; a value that ends at the end of the buffer
+        # might be cut short (e.g. a number), so read more first
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                if end < len(buffer) or eof:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+
+    if skip("") != "{":
+        raise ValueError("expected a JSON object")
+    pos += 1
+    while skip(",") not in ("}", ""):
+        name = decode()
+        skip(":")
+        if name != key:
+            decode()  # small sibling values such as export metadata
+            continue
+        if skip("") != "[":
+            raise ValueError(f"expected an array under '{key}'")
+        pos += 1
+        while skip(",") not in ("]", ""):
+            yield decode()
+        if skip("") == "":  # a partial export must not pass for the whole input
+            raise ValueError(f"the '{key}' array is truncated (end of file before ']')")
+        pos += 1
+    if skip("") == "":
+        raise ValueError("the JSON object is truncated (end of file before '}')")
+
+
+def extract_json(filepath):
+    """Yield the e-commerce customers one by one."""
+    if ijson is not None:
+        with open(filepath, "rb") as f:
+            yield from ijson.items(f, "customers.item")
+    else:
+        with open(filepath, encoding="utf-8") as f:
+            yield from iter_json_array(f, "customers")
+
+
+# ---------- Transform (see normalize.py) ----------
+def extract_batches(crm_file, ecom_file):
+    """Yield (source, raw batch) jobs for the normalization stage, logging the counts."""
+    try:
+        count = 0
+        for batch in extract_csv(crm_file):
+            yield "CRM", batch
+            count += len(batch)
+        logger.info(f"Loaded {count} records from {os.path.basename(crm_file)}")
+    except FileNotFoundError:
+        logger.error(f"File not found: {crm_file}")
+
+    try:
+        count = 0
+        customers = extract_json(ecom_file)
+        while batch := list(islice(customers, BATCH_SIZE)):
+            yield "ECOM", batch
+            count += len(batch)
+        logger.info(f"Loaded {count} records from {os.path.basename(ecom_file)}")
+    except FileNotFoundError:
+        logger.error(f"File not found: {ecom_file}")
+
+
+def normalized_frames(crm_file, ecom_file, workers=1, phone_format="digits"):
+    """Normalized DataFrames (common schema plus source_id) of both sources, in order."""
+    return normalize.normalize_batches(extract_batches(crm_file, ecom_file), workers, phone_format)
+
+
+def prepare_batch(job, phone_format="digits"):
+    # Runs in a worker: normalize a raw batch and compute its dedupe features
+    frame = normalize.normalize_batch(job, phone_format)
+    return frame, batch_features(frame)
+
+
+# ---------- Deduplicate (see dedupe.py) ----------
+def describe(bits, names):
+    return "+".join(name for name, bit in names.items() if bits & bit)
+
+
+# ---------- Load ----------
+def run_pipeline(crm_file, ecom_file, output_dir, workers=1, phone_format="digits"):
+    os.makedirs(output_dir, exist_ok=True)
+    spill_file = os.path.join(output_dir, ".normalized.tmp.csv")
+    master_file = os.path.join(output_dir, "customer_master.csv")
+    report_file = os.path.join(output_dir, "duplicate_report.csv")
+    logger.info("Pipeline started")
+
+    # Pass 1: normalize, spill, index the dedupe keys
+    dedupe = Deduplicator()
+    with open(spill_file, "w", newline="", encoding="utf-8") as f:
+        jobs = extract_batches(crm_file, ecom_file)
+        for frame, features in normalize.parallel_map(partial(prepare_batch, phone_format=phone_format), jobs, workers):
+            frame.to_csv(f, header=False, index=False)
+            dedupe.add_batch(features)
+    total = len(dedupe)
+    logger.info(f"Total raw records: {total}")
+
+    clusters = dedupe.clusters()
+    logger.info(f"Duplicates found: {total - clusters.unique}")
+
+    # Pass 2: write the kept records; collect what was merged into them. Ids
+    # are only remembered for clusters with duplicates (needed by the report)
+    merged_roots = set(np.unique(clusters.roots[~clusters.kept]).tolist())
+    unified_ids, kept_source_ids, removed = {}, {}, {}
+    unified = 0
+    with open(spill_file, newline="", encoding="utf-8") as f, \
+            open(master_file, "w", newline="", encoding="utf-8") as out:
+        writer = csv.DictWriter(out, fieldnames=MASTER_FIELDS)
+        writer.writeheader()
+        reader = csv.DictReader(f, fieldnames=SPILL_FIELDS)
+        for i, record in enumerate(reader):
+            root = int(clusters.roots[i])
+            if not clusters.kept[i]:
+                removed.setdefault(root, []).append((i, record["source_id"], record["source_system"]))
+                continue
+            unified += 1
+            record["unified_id"] = f"CUST{unified:03d}"
+            if root in merged_roots:
+                unified_ids[root] = record["unified_id"]
+                kept_source_ids[root] = record["source_id"]
+            record["source_system"] = describe(clusters.cluster_sources[root], SOURCES)
+            del record["source_id"]
+            writer.writerow(record)
+    os.remove(spill_file)
+
+    with open(report_file, "w", newline="", encoding="utf-8") as out:
+        writer = csv.writer(out)
+        writer.writerow(["kept_id", "removed_ids", "match_reason", "removed_sources"])
+        for root in sorted(removed, key=unified_ids.get):
+            members = removed[root]
+            removed_sources = 0
+            for i, source_id, source in members:
+                removed_sources |= SOURCES[source]
+                reason = describe(clusters.reasons[i] or clusters.cluster_reasons[root], MATCH_KEYS)
+                logger.warning(f"Record {source_id} merged with {kept_source_ids[root]} (duplicate {reason})")
+            writer.writerow([unified_ids[root], ",".join(source_id for _, source_id, _ in members),
+                             describe(clusters.cluster_reasons[root], MATCH_KEYS), describe(removed_sources, SOURCES)])
+
+    logger.info(f"Final unique customers: {clusters.unique}")
+    logger.info("Pipeline completed successfully")
+
+
+def setup_logging(output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    file_handler = logging.FileHandler(os.path.join(output_dir, "integration_log.txt"), mode="w", encoding="utf-8")
+    console_handler = logging.StreamHandler()
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Integrate CRM and e-commerce customers into a master file.")
+    parser.add_argument("--crm", default=CRM_FILE, help="CRM customers CSV")
+    parser.add_argument("--ecom", default=ECOM_FILE, help="e-commerce customers JSON")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="folder for the output files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes for the normalization stage")
+    parser.add_argument("--phone-format", choices=normalize.PHONE_FORMATS, default="digits",
+                        help="phones as digits only (5550101) or E.164 where possible (+12125550101)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    setup_logging(args.output_dir)
+    run_pipeline(args.crm, args.ecom, args.output_dir, args.workers, args.phone_format)
+
+
+if __name__ == "__main__":
+    main()
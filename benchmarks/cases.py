@@ -0,0 +1,335 @@
+"""
+The benchmark cases.
+
+    @case("files.csv_aggregate", "files")
+    def csv_aggregate(rows, workdir):
+        path = fixtures.sales_csv(rows)               # setup: not timed
+        return lambda: aggregate(path, ...), rows      # (timed body, items it handles)
+
+A case gets the fixture size (`rows`) and a scratch directory, does its
+setup, and returns the body to time plus the number of items (rows,
+records, log calls) one run of it processes. Repo modules are imported
+inside the cases, so listing the cases needs none of their dependencies.
+Raise Skip when an optional dependency is missing.
+"""
+
+import io
+import itertools
+import logging
+import queue
+
+import fixtures
+
+CASES = {}
+RIDE_RANGE = ("2023-01-01", "2023-04-01")  # synthetic_data_2 rides span 90 days from 2023-01-01
+
+
+class Skip(Exception):
+    """The case cannot run here (e.g. an optional package is missing)."""
+
+
+class Case:
+    def __init__(self, name, group, setup, max_rows=None):
+        self.name = name
+        self.group = group
+        self.setup = setup
+        self.max_rows = max_rows  # larger sizes are skipped (e.g. per-row Python loops)
+
+
+def case(name, group, max_rows=None):
+    def register(setup):
+        CASES[name] = Case(name, group, setup, max_rows)
+        return setup
+    return register
+
+
+def counter_dirs(workdir, prefix):
+    """A new, unused directory under workdir for every call (e.g. a cold cache per run)."""
+    numbers = itertools.count()
+    return lambda: workdir / f"{prefix}-{next(numbers)}"
+
+
+# ---------- Data generators (10-Python-Random) ----------
+@case("generators.synthetic_data_1.faker", "generators", max_rows=1_000_000)
+def synthetic_data_1_faker(rows, workdir):
+    import random
+    import synthetic_data_1
+
+    def run():
+        random.seed(fixtures.SEED)
+        synthetic_data_1.Faker.seed(fixtures.SEED)
+        synthetic_data_1.write_csv(synthetic_data_1.generate_rows(rows), workdir / "rides.csv")
+    return run, rows
+
+
+@case("generators.synthetic_data_1.pooled", "generators")
+def synthetic_data_1_pooled(rows, workdir):
+    import synthetic_data_1
+
+    names = synthetic_data_1.build_name_pool(10_000, fixtures.SEED, fixtures.FIXTURE_DIR)
+
+    def run():
+        chunks = synthetic_data_1.generate_chunks(rows, synthetic_data_1.CHUNK_SIZE, names, fixtures.SEED)
+        synthetic_data_1.write_pooled_csv(chunks, names, workdir / "rides.csv")
+    return run, rows
+
+
+@case("generators.synthetic_data_2.loop", "generators", max_rows=1_000_000)
+def synthetic_data_2_loop(rows, workdir):
+    import csv
+    import synthetic_data_2
+
+    def run():
+        with open(workdir / "rides.csv", "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(synthetic_data_2.columns)
+            writer.writerows(synthetic_data_2.generate_records_loop(rows))
+    return run, rows
+
+
+@case("generators.synthetic_data_2.vectorized", "generators")
+def synthetic_data_2_vectorized(rows, workdir):
+    import synthetic_data_2
+
+    chunk_size = min(rows, synthetic_data_2.DEFAULT_CHUNK_SIZE)
+    return lambda: synthetic_data_2.generate_vectorized(rows, chunk_size, fixtures.SEED, workdir / "rides.csv"), rows
+
+
+# ---------- Dashboard (14-Project-Streamlit, headless) ----------
+def load_rides(rows, workdir):
+    import ride_cache
+
+    data = fixtures.rides_csv(rows).read_bytes()
+    return ride_cache.load_rides(data, ride_cache.file_digest(data), workdir / "cache")
+
+
+@case("dashboard.load_data.cold", "dashboard")
+def load_data_cold(rows, workdir):
+    import ride_cache
+
+    data = fixtures.rides_csv(rows).read_bytes()
+    digest = ride_cache.file_digest(data)
+    cache_dirs = counter_dirs(workdir, "cache")
+    return lambda: ride_cache.load_rides(data, digest, cache_dirs()), rows  # parse, derive, write the cache
+
+
+@case("dashboard.load_data.warm", "dashboard")
+def load_data_warm(rows, workdir):
+    import ride_cache
+
+    data = fixtures.rides_csv(rows).read_bytes()
+    digest = ride_cache.file_digest(data)
+    ride_cache.load_rides(data, digest, workdir / "cache")
+    return lambda: ride_cache.load_rides(data, digest, workdir / "cache"), rows  # memory-mapped reload
+
+
+@case("dashboard.build_cube", "dashboard")
+def build_cube(rows, workdir):
+    import ride_aggregates
+
+    df = load_rides(rows, workdir)
+    return lambda: ride_aggregates.RideCube.from_rides(df), rows
+
+
+@case("dashboard.build_sketches", "dashboard")
+def build_sketches(rows, workdir):
+    import ride_sketches
+
+    df = load_rides(rows, workdir)
+    return lambda: ride_sketches.RideSketches.from_rides(df), rows
+
+
+# The queries each streamlit_2.py tab runs for a date range
+TABS = {
+    "tab1": lambda view: (view.summary(), view.daily_volume()),
+    "tab2": lambda view: (view.rides_by_hour(), view.rides_by_day_of_week()),
+    "tab3": lambda view: (view.unique_drivers(), view.unique_customers(), view.top_zones('Source_Zone', 10),
+                          view.top_zones('Destination_Zone', 10), view.top_routes(10),
+                          view.top_drivers(10)),
+    "tab4": lambda view: (view.completed_rides(), view.histogram('Fare', 30), view.histogram('Distance_Miles', 30),
+                          view.fare_distance_sample(5000), view.fare_distance_fit()),
+    "tab5": lambda view: view.rating_distribution(),
+    "tab6": lambda view: (view.status_counts(), view.cancellation_reasons(),
+                          view.histogram('Ride_Duration_Minutes', 40)),
+}
+
+
+def pandas_rides(rows, workdir):
+    import ride_aggregates
+    import ride_backend
+    import ride_sketches
+
+    df = load_rides(rows, workdir)
+    return ride_backend.PandasRides(df, ride_aggregates.RideCube.from_rides(df),
+                                    ride_sketches.RideSketches.from_rides(df))
+
+
+def duckdb_rides(rows, workdir):
+    import ride_backend
+
+    if ride_backend.duckdb is None:
+        raise Skip("duckdb is not installed")
+    source = ride_backend.prepare_source(fixtures.rides_csv(rows), cache_dir=workdir)
+    rides = ride_backend.DuckDBRides(source)
+    rides.sketches()  # built once per dataset, before the first interaction
+    return rides
+
+
+def tab_case(backend, tab, load):
+    @case(f"dashboard.{backend}.{tab}", "dashboard")
+    def tab_queries(rows, workdir):
+        import pandas as pd
+
+        rides = load(rows, workdir)
+        start, end = (pd.Timestamp(day) for day in RIDE_RANGE)
+        # Slicing is part of every interaction: the app slices on each rerun
+        return lambda: TABS[tab](rides.slice(start, end)), rows
+
+
+for tab_name in TABS:
+    tab_case("pandas", tab_name, pandas_rides)
+    tab_case("duckdb", tab_name, duckdb_rides)
+
+
+# ---------- File handling (08-Python-File-Handling) ----------
+@case("files.csv_aggregate", "files")
+def csv_aggregate(rows, workdir):
+    from csv_aggregate import Aggregation, aggregate
+
+    path = fixtures.sales_csv(rows)
+    dtypes = {'product': 'category', 'price': 'float64', 'quantity': 'int64'}
+    revenue = Aggregation(derive={'total_value': 'price * quantity'}, sums=['total_value'], group_by='product')
+    return lambda: aggregate(path, revenue, dtypes), rows
+
+
+@case("files.jsonl_store.add_many", "files")
+def jsonl_add_many(rows, workdir):
+    from employee_store import EmployeeStore
+
+    records = fixtures.employees(rows)
+    paths = counter_dirs(workdir, "employees")
+    return lambda: EmployeeStore(paths().with_suffix(".jsonl")).add_many(records), rows
+
+
+@case("files.jsonl_store.filter", "files")
+def jsonl_filter(rows, workdir):
+    from employee_store import EmployeeStore, write_json_array
+
+    store = EmployeeStore(workdir / "employees.jsonl")
+    store.add_many(fixtures.employees(rows))
+    return lambda: write_json_array(store.filter(role='Data Engineer'), workdir / "out.json", 'data_engineers'), rows
+
+
+@case("files.text_transform", "files")
+def text_transform(rows, workdir):
+    import shutil
+    from text_transform import transform_file
+
+    path = workdir / "text.txt"
+    shutil.copyfile(fixtures.text_file(rows), path)
+    return lambda: transform_file(path, str.upper), rows
+
+
+@case("files.lower_ascii_in_place", "files")
+def lower_in_place(rows, workdir):
+    import shutil
+    from text_transform import lower_ascii_in_place
+
+    path = workdir / "text.txt"
+    shutil.copyfile(fixtures.text_file(rows), path)
+    return lambda: lower_ascii_in_place(path), rows
+
+
+@case("files.validate_json", "files", max_rows=1_000_000)
+def validate_json(rows, workdir):
+    import json
+    import json_validator
+
+    directory = workdir / "json"
+    directory.mkdir()
+    for record in fixtures.employees(rows):
+        (directory / f"{record['id']}.json").write_text(json.dumps({**record, "age": 30}))
+    return lambda: json_validator.validate(str(directory)), rows
+
+
+# ---------- Logging (12-Python-Logging): cost per record ----------
+def bench_logger(name, formatter=None):
+    """A logger that formats every record into a StringIO (no console or disk noise)."""
+    logger = logging.getLogger(f"bench.{name}")
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler(io.StringIO())
+    if formatter is not None:
+        handler.setFormatter(formatter)
+    logger.addHandler(handler)
+    return logger
+
+
+def log_calls(log, rows, level=logging.INFO):
+    def run():
+        for i in range(rows):
+            log(level, "User %s logged in from %s", i, "192.168.1.1")
+    return run, rows
+
+
+@case("logging.debug_disabled", "logging")
+def debug_disabled(rows, workdir):
+    return log_calls(bench_logger("disabled").log, rows, logging.DEBUG)
+
+
+@case("logging.text", "logging")
+def text_formatter(rows, workdir):
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    return log_calls(bench_logger("text", formatter).log, rows)
+
+
+@case("logging.python_json", "logging")
+def python_json(rows, workdir):
+    try:
+        from pythonjsonlogger import jsonlogger
+    except ImportError:
+        raise Skip("python-json-logger is not installed")
+    formatter = jsonlogger.JsonFormatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+    return log_calls(bench_logger("python_json", formatter).log, rows)
+
+
+@case("logging.fast_json", "logging")
+def fast_json(rows, workdir):
+    from fast_json_formatter import FastJsonFormatter
+
+    return log_calls(bench_logger("fast_json", FastJsonFormatter()).log, rows)
+
+
+@case("logging.structured", "logging")
+def structured(rows, workdir):
+    from fast_json_formatter import FastJsonFormatter
+    from structured_logging import StructuredLogger
+
+    log = StructuredLogger(bench_logger("structured", FastJsonFormatter()), {"service": "bench"})
+
+    def run():
+        for i in range(rows):
+            log.info("user logged in", user_id=i, ip="192.168.1.1")
+    return run, rows
+
+
+@case("logging.queue", "logging")
+def queue_logging(rows, workdir):
+    from async_logging import BatchFileHandler, BatchQueueListener, BoundedQueueHandler
+
+    log_queue = queue.Queue(maxsize=10_000)
+    file_handler = BatchFileHandler(workdir / "app.log")
+    file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    logger = bench_logger("queue")
+    logger.handlers.clear()
+    logger.addHandler(BoundedQueueHandler(log_queue, policy="block"))  # nothing dropped: every record is written
+    listener = BatchQueueListener(log_queue, file_handler)
+    listener.start()
+    calls, _ = log_calls(logger.log, rows)
+
+    def run():
+        calls()
+        listener.stop()  # the time includes writing out the queue
+        listener.start()
+    return run, rows
@@ -0,0 +1,76 @@
+"""
+Input files for the benchmarks, generated once per size and kept in
+benchmarks/.fixtures/ (or $BENCH_FIXTURE_DIR).
+
+The ride files come from synthetic_data_2.py's vectorized generator with a
+fixed seed, so every commit is measured on the same data.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+MODULE_DIRS = ["07-Python-Modules", "08-Python-File-Handling", "10-Python-Random",
+               "11-Python-Blocks", "12-Python-Logging", "14-Project-Streamlit"]
+FIXTURE_DIR = Path(os.environ.get("BENCH_FIXTURE_DIR", Path(__file__).resolve().parent / ".fixtures"))
+SEED = 42
+
+for module_dir in MODULE_DIRS:
+    if str(REPO_DIR / module_dir) not in sys.path:
+        sys.path.append(str(REPO_DIR / module_dir))
+
+
+def fixture(name, write):
+    """Path of a fixture file, written by write(tmp_path) the first time."""
+    path = FIXTURE_DIR / name
+    if not path.exists():
+        FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    return path
+
+
+def rides_csv(rows):
+    """NYC ride CSV with `rows` rides (the dashboard's input)."""
+    import synthetic_data_2
+
+    def write(path):
+        chunk_size = min(rows, synthetic_data_2.DEFAULT_CHUNK_SIZE)
+        synthetic_data_2.generate_vectorized(rows, chunk_size, SEED, path)
+    return fixture(f"rides-{rows}.csv", write)
+
+
+def sales_csv(rows):
+    """sales_data.csv-like file: product, price, quantity, date."""
+    def write(path):
+        products = np.array(["Laptop", "Phone", "Tablet", "Monitor", "Keyboard", "Mouse"])
+        prices = np.array([1200, 800, 450, 300, 80, 25])
+        rng = np.random.default_rng(SEED)
+        with open(path, "w") as f:
+            f.write("product,price,quantity,date\n")
+            for start in range(0, rows, 100_000):
+                n = min(100_000, rows - start)
+                picks = rng.integers(0, len(products), n)
+                quantities = rng.integers(1, 20, n)
+                days = rng.integers(0, 365, n)
+                dates = (np.datetime64("2024-01-01") + days).astype(str)
+                f.writelines(f"{p},{c},{q},{d}\n" for p, c, q, d in zip(products[picks], prices[picks], quantities, dates))
+    return fixture(f"sales-{rows}.csv", write)
+
+
+def text_file(rows):
+    """Plain text with `rows` lines of mixed-case ASCII."""
+    def write(path):
+        with open(path, "w") as f:
+            f.writelines(f"Line {i}: The Quick Brown Fox Jumps Over The Lazy Dog\n" for i in range(rows))
+    return fixture(f"text-{rows}.txt", write)
+
+
+def employees(count):
+    """Employee records like data.json's."""
+    roles = ["Data Engineer", "Data Scientist", "ML Engineer", "Analyst"]
+    return [{"id": i, "name": f"Employee {i}", "role": roles[i % len(roles)]} for i in range(count)]
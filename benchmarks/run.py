@@ -0,0 +1,278 @@
+"""
+Benchmark runner: wall time and peak memory of the repo's data paths.
+
+    python benchmarks/run.py list
+    python benchmarks/run.py run                             # every case at 10k rows
+    python benchmarks/run.py run --sizes 10k,1m,10m -k dashboard
+    python benchmarks/run.py compare results/abc1234.json results/def5678.json
+
+Each case (see cases.py) runs in a fresh Python process, so one case's
+imports, caches and memory never affect another's. Its setup (fixtures,
+loading) is not timed. Its body is run once to warm up, then --repeat
+times; each run records the wall time and the peak RSS reached during it.
+Bodies that take less than MIN_RUN_SECONDS are looped (like timeit) and
+the time of one call is reported. On Linux the peak is reset before every
+run (/proc/self/clear_refs), so it is the peak while the body runs; on
+other systems it is the process peak, setup included. Worker processes
+(process pools) are recorded separately as the peak of the largest child
+over the whole case, warm-up included, since it cannot be reset.
+
+Results are written as JSON to benchmarks/results/<commit>.json (the
+commit it was run on, with "-dirty" for uncommitted changes). compare
+prints the time and memory ratio of every case two result files share and
+exits with status 1 if any case got slower or bigger than the thresholds
+(in its own process or in its largest child).
+"""
+
+import argparse
+import datetime
+import fnmatch
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCH_DIR / "results"
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+DEFAULT_SIZES = "10k"
+REPEAT = 3
+MIN_RUN_SECONDS = 0.2  # short bodies are looped until a timed run lasts this long
+TIME_THRESHOLD = 0.20  # compare: slower by more than 20% is a regression (separate runs vary ~10%)
+RSS_THRESHOLD = 0.20
+
+
+# ---------- Memory ----------
+def reset_peak_rss():
+    """Reset the process's peak RSS (Linux); False if it cannot be reset here."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss():
+    """Peak resident memory of this process, in bytes."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024  # bytes on macOS, KB elsewhere
+
+
+def children_peak_rss():
+    """Peak resident memory of the largest finished child process (pool workers), in bytes; 0 if none."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    maxrss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+# ---------- One case (child process) ----------
+def run_case(name, rows, repeat, workdir):
+    """Set up a case, time its body `repeat` times; the result as a dict."""
+    import cases
+
+    case = cases.CASES[name]
+    try:
+        body, items = case.setup(rows, Path(workdir))
+    except cases.Skip as skip:
+        return {"skipped": str(skip)}
+    start = time.perf_counter()
+    body()  # warm-up, also sets the number of loops per run
+    loops = max(1, math.ceil(MIN_RUN_SECONDS / max(time.perf_counter() - start, 1e-9)))
+    runs, peaks = [], []
+    exact = True
+    for _ in range(repeat):
+        exact = reset_peak_rss() and exact
+        start = time.perf_counter()
+        for _ in range(loops):
+            body()
+        runs.append((time.perf_counter() - start) / loops)
+        peaks.append(peak_rss())
+    best = min(runs)
+    return {
+        "group": case.group, "rows": rows, "items": items, "repeat": repeat, "loops": loops,
+        "seconds": statistics.median(runs), "min_seconds": best, "runs": runs,
+        "items_per_second": items / best if best else None,
+        "ns_per_item": best / items * 1e9 if items else None,
+        "peak_rss_mb": max(peaks) / 2**20, "rss_includes_setup": not exact,
+        "children_peak_rss_mb": children_peak_rss() / 2**20,
+    }
+
+
+def child_main(name, rows, repeat, workdir):
+    result = run_case(name, int(rows), int(repeat), workdir)
+    print(json.dumps(result))  # the last line of stdout is read by the parent
+
+
+# ---------- Many cases ----------
+def git_commit():
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=BENCH_DIR, capture_output=True, text=True).stdout.strip()
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    dirty = bool(git("status", "--porcelain", "--untracked-files=no"))
+    return commit, dirty
+
+
+def select_cases(patterns):
+    import cases
+
+    if not patterns:
+        return list(cases.CASES.values())
+    return [case for name, case in cases.CASES.items()
+            if any(pattern in name or fnmatch.fnmatch(name, pattern) for pattern in patterns)]
+
+
+def parse_sizes(text):
+    sizes = []
+    for size in text.split(","):
+        size = size.strip().lower()
+        sizes.append(SIZES[size] if size in SIZES else int(size.replace("_", "")))
+    return sizes
+
+
+def result_key(name, rows):
+    return f"{name}@{rows}"
+
+
+def run_all(selected, sizes, repeat, timeout):
+    results, errors = {}, {}
+    for rows in sizes:
+        for case in selected:
+            key = result_key(case.name, rows)
+            if case.max_rows and rows > case.max_rows:
+                print(f"{key:<50} skipped (max {case.max_rows:,} rows)")
+                continue
+            with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+                try:
+                    process = subprocess.run(
+                        [sys.executable, __file__, "_child", case.name, str(rows), str(repeat), workdir],
+                        capture_output=True, text=True, timeout=timeout, cwd=BENCH_DIR)
+                except subprocess.TimeoutExpired:
+                    errors[key] = f"timed out after {timeout} s"
+                    print(f"{key:<50} {errors[key]}")
+                    continue
+            lines = process.stdout.strip().splitlines()
+            if process.returncode != 0 or not lines:
+                errors[key] = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "no result"
+                print(f"{key:<50} ERROR {errors[key]}")
+                continue
+            result = json.loads(lines[-1])
+            if "skipped" in result:
+                print(f"{key:<50} skipped ({result['skipped']})")
+                continue
+            results[key] = {"case": case.name, **result}
+            children = f"  (workers {result['children_peak_rss_mb']:.1f} MB)" if result["children_peak_rss_mb"] else ""
+            print(f"{key:<50} {result['min_seconds']:9.4f} s  {result['items_per_second']:14,.0f} items/s"
+                  f"  {result['peak_rss_mb']:8.1f} MB{children}")
+    return results, errors
+
+
+def command_run(args):
+    selected = select_cases(args.k)
+    if not selected:
+        raise SystemExit("no case matches")
+    commit, dirty = git_commit()
+    started = datetime.datetime.now(datetime.timezone.utc)
+    results, errors = run_all(selected, parse_sizes(args.sizes), args.repeat, args.timeout)
+    report = {
+        "meta": {"commit": commit, "dirty": dirty, "date": started.isoformat(timespec="seconds"),
+                 "python": platform.python_version(), "platform": platform.platform(),
+                 "cpus": os.cpu_count(), "repeat": args.repeat},
+        "results": results,
+        "errors": errors,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}{'-dirty' if dirty else ''}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=1))
+    print(f"\n{len(results)} results, {len(errors)} errors written to {output}")
+    return 1 if errors else 0
+
+
+def command_list(args):
+    for case in select_cases(args.k):
+        limit = f"  (up to {case.max_rows:,} rows)" if case.max_rows else ""
+        print(f"{case.group:<12} {case.name}{limit}")
+    return 0
+
+
+def command_compare(args):
+    old, new = (json.loads(Path(path).read_text()) for path in (args.old, args.new))
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']}")
+    print(f"{'case':<50} {'old s':>9} {'new s':>9} {'time':>7} {'old MB':>8} {'new MB':>8} {'memory':>7}")
+    regressions = 0
+    for key in sorted(old["results"].keys() & new["results"].keys()):
+        a, b = old["results"][key], new["results"][key]
+        time_ratio = b["min_seconds"] / a["min_seconds"] if a["min_seconds"] else 1.0
+        rss_ratio = b["peak_rss_mb"] / a["peak_rss_mb"] if a["peak_rss_mb"] else 1.0
+        # Results written before worker memory was recorded have no children_peak_rss_mb
+        old_children, new_children = a.get("children_peak_rss_mb", 0), b.get("children_peak_rss_mb", 0)
+        children_ratio = new_children / old_children if old_children else 1.0
+        flags = []
+        if time_ratio > 1 + args.threshold:
+            flags.append("SLOWER")
+        if rss_ratio > 1 + args.rss_threshold:
+            flags.append("MORE MEMORY")
+        if children_ratio > 1 + args.rss_threshold:
+            flags.append("MORE WORKER MEMORY")
+        regressions += bool(flags)
+        notes = [f"workers {old_children:.1f} -> {new_children:.1f} MB"] if old_children or new_children else []
+        print(f"{key:<50} {a['min_seconds']:9.4f} {b['min_seconds']:9.4f} {time_ratio:6.2f}x"
+              f" {a['peak_rss_mb']:8.1f} {b['peak_rss_mb']:8.1f} {rss_ratio:6.2f}x  {'  '.join(notes + flags)}")
+    for label, keys in (("only in old", old["results"].keys() - new["results"].keys()),
+                        ("only in new", new["results"].keys() - old["results"].keys())):
+        if keys:
+            print(f"{label}: {', '.join(sorted(keys))}")
+    print(f"\n{regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run and compare the repo's benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run benchmarks and save the results as JSON")
+    run.add_argument("-k", action="append", help="only cases whose name contains this (or matches the glob)")
+    run.add_argument("--sizes", default=DEFAULT_SIZES,
+                     help=f"comma-separated fixture sizes: {', '.join(SIZES)} or a number (default {DEFAULT_SIZES})")
+    run.add_argument("--repeat", type=int, default=REPEAT, help="timed runs per case")
+    run.add_argument("--timeout", type=float, default=3600, help="seconds before a case is abandoned")
+    run.add_argument("--output", help="result file (default: results/<commit>.json)")
+    run.set_defaults(func=command_run)
+
+    list_cases = commands.add_parser("list", help="list the cases")
+    list_cases.add_argument("-k", action="append", help="only cases whose name contains this")
+    list_cases.set_defaults(func=command_list)
+
+    compare = commands.add_parser("compare", help="compare two result files")
+    compare.add_argument("old")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=TIME_THRESHOLD, help="allowed slowdown (0.2 = 20%%)")
+    compare.add_argument("--rss-threshold", type=float, default=RSS_THRESHOLD, help="allowed peak RSS growth")
+    compare.set_defaults(func=command_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "_child":
+        child_main(*sys.argv[2:])
+    else:
+        sys.exit(main())